@@ -0,0 +1,148 @@
+# benchmarks/corpus.py
+"""
+Deterministic synthetic resume corpus for benchmarks.
+
+Every generator takes a seed, so the same arguments always produce the
+same resumes and timings stay comparable between commits. Texts can be
+rendered as PDF (PyMuPDF), DOCX (python-docx) or PNG (Pillow) files.
+"""
+import io
+import random
+from typing import List, Tuple
+
+FIRST_NAMES = ["Aarav", "Maya", "John", "Priya", "Carlos", "Mei", "Olivia", "Noah",
+               "Fatima", "Liam", "Sofia", "Arjun", "Emma", "Yuki", "Omar", "Hannah"]
+LAST_NAMES = ["Sharma", "Smith", "Garcia", "Chen", "Patel", "Johnson", "Kim", "Nguyen",
+              "Müller", "Rossi", "Okafor", "Silva", "Haddad", "Tanaka", "Brown", "Singh"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Vandelay Imports", "Soylent", "Cyberdyne"]
+TITLES = ["Software Engineer", "Senior Developer", "Data Analyst", "Backend Engineer",
+          "DevOps Engineer", "Product Manager", "QA Engineer", "ML Engineer"]
+SKILL_POOL = ["Python", "Java", "JavaScript", "TypeScript", "Django", "Flask", "React",
+              "Node.js", "SQL", "PostgreSQL", "MongoDB", "Docker", "Kubernetes", "AWS",
+              "Azure", "Git", "Linux", "Machine Learning", "Pandas", "NumPy", "Spark",
+              "Kafka", "Redis", "GraphQL", "Terraform", "Jenkins", "Agile", "Scrum",
+              "Tableau", "Excel", "C++", "Go", "Rust", "Figma", "Selenium", "Airflow"]
+VERBS = ["Built", "Designed", "Led", "Maintained", "Optimized", "Migrated", "Automated",
+         "Implemented", "Scaled", "Refactored"]
+OBJECTS = ["a payments API", "the data pipeline", "CI/CD workflows", "a React dashboard",
+           "search infrastructure", "internal tooling", "the reporting service",
+           "microservices on Kubernetes", "ETL jobs in Spark", "the mobile backend"]
+DEGREES = ["B.Tech in Computer Science", "B.Sc Mathematics", "M.Sc Data Science",
+           "MBA", "Bachelor of Engineering", "Master of Computer Applications"]
+SCHOOLS = ["IIT Delhi", "Stanford University", "University of Toronto", "NUS",
+           "Anna University", "TU Munich", "University of Lagos"]
+
+
+def make_resume_text(rng: random.Random, jobs: int = 3, bullets: int = 4) -> str:
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = name.lower().replace(" ", ".").replace("ü", "u") + f"{rng.randint(1, 99)}@example.com"
+    phone = f"+1 {rng.randint(200, 999)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+    skills = rng.sample(SKILL_POOL, rng.randint(4, 12))
+
+    lines = [
+        name,
+        f"{email} | {phone}",
+        "",
+        "PROFESSIONAL SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience in "
+        f"{', '.join(rng.sample(SKILL_POOL, 3))}.",
+        "",
+        "TECHNICAL SKILLS",
+        ", ".join(skills),
+        "",
+        "WORK EXPERIENCE",
+    ]
+    year = 2024
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} {start} - {year}")
+        for _ in range(bullets):
+            lines.append(f"• {rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                         f"{rng.choice(SKILL_POOL)} and {rng.choice(SKILL_POOL)}.")
+        year = start
+    lines += [
+        "",
+        "EDUCATION",
+        f"{rng.choice(DEGREES)}, {rng.choice(SCHOOLS)}, {year - 4}-{year}",
+    ]
+    return "\n".join(lines)
+
+
+def make_corpus(count: int, seed: int = 0, min_jobs: int = 1, max_jobs: int = 8) -> List[str]:
+    """`count` resume texts of varying length."""
+    rng = random.Random(seed)
+    return [
+        make_resume_text(rng, jobs=rng.randint(min_jobs, max_jobs), bullets=rng.randint(2, 6))
+        for _ in range(count)
+    ]
+
+
+# ---- files ----------------------------------------------------------------
+
+FORMATS = ("pdf", "docx", "png")
+
+# Letter-size page at 72 pt per inch
+PAGE_WIDTH, PAGE_HEIGHT, MARGIN, LINE_HEIGHT = 612, 792, 54, 14
+
+
+def make_pdf_bytes(text: str) -> bytes:
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        import fitz  # PyMuPDF < 1.24
+
+    doc = fitz.open()
+    lines = text.splitlines()
+    per_page = int((PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT)
+    for start in range(0, max(len(lines), 1), per_page):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        for i, line in enumerate(lines[start:start + per_page]):
+            # Base-14 fonts only cover Latin-1
+            line = line.encode("latin-1", "replace").decode("latin-1")
+            page.insert_text((MARGIN, MARGIN + (i + 1) * LINE_HEIGHT), line, fontsize=10)
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def make_docx_bytes(text: str) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def make_png_bytes(text: str, dpi: int = 150) -> bytes:
+    """A scan-like page image: black text on white, recorded at `dpi`."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    scale = dpi / 72
+    lines = text.splitlines()
+    height = int(max(PAGE_HEIGHT, 2 * MARGIN + (len(lines) + 1) * LINE_HEIGHT) * scale)
+    img = Image.new("L", (int(PAGE_WIDTH * scale), height), 255)
+    draw = ImageDraw.Draw(img)
+    try:
+        font = ImageFont.load_default(size=int(10 * scale))
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+    for i, line in enumerate(lines):
+        draw.text((MARGIN * scale, (MARGIN + i * LINE_HEIGHT) * scale), line, fill=0, font=font)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", dpi=(dpi, dpi))
+    return buf.getvalue()
+
+
+RENDERERS = {"pdf": make_pdf_bytes, "docx": make_docx_bytes, "png": make_png_bytes}
+
+
+def make_files(count: int, fmt: str, seed: int = 0, min_jobs: int = 1,
+               max_jobs: int = 8) -> List[Tuple[str, bytes]]:
+    """`count` (filename, file bytes) resumes in one format, of varying length."""
+    render = RENDERERS[fmt]
+    corpus = make_corpus(count, seed=seed, min_jobs=min_jobs, max_jobs=max_jobs)
+    return [(f"resume-{seed}-{i}.{fmt}", render(text)) for i, text in enumerate(corpus)]
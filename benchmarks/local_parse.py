@@ -0,0 +1,130 @@
+# benchmarks/local_parse.py
+"""
+Local (no-LLM) parsing: the single-pass extractor vs the previous
+multi-scan functions.
+
+    python -m benchmarks.local_parse --count 2000
+"""
+import argparse
+import re
+import time
+
+from benchmarks.corpus import make_corpus
+from resumes.utils.llm_parser import quick_local_parse
+from resumes.utils.local_extractor import SKILLS
+
+# ---- baseline: the implementations replaced by local_extractor ----------
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"(\+?\d[\d\-\s]{6,}\d)")
+_LEGACY_SKILLS = [
+    'python', 'java', 'javascript', 'c++', 'sql', 'react',
+    'django', 'flask', 'nodejs', 'aws', 'docker', 'kubernetes',
+    'machine learning', 'data analysis', 'project management'
+]
+
+
+def legacy_quick_local_parse(resume_text):
+    # (the original crashed on the timeline append; initialized here)
+    data = {"email": "", "mobile": "", "skills": [], "experience_timeline": []}
+    e = _EMAIL_RE.search(resume_text)
+    if e:
+        data["email"] = e.group(0)
+    p = _PHONE_RE.search(resume_text)
+    if p:
+        data["mobile"] = re.sub(r"\s+", " ", p.group(0))
+    lower = resume_text.lower()
+    if "skills" in lower:
+        idx = lower.find("skills")
+        words = re.findall(r"[A-Za-z+#\.\-]{3,}", resume_text[idx:idx + 350])
+        data["skills"] = list(dict.fromkeys(words))[:20]
+    ranges = re.findall(r"(\b(?:19|20)\d{2}\b)[^\d]{0,5}(\b(?:19|20)\d{2}\b)", resume_text)
+    for s, e in ranges:
+        data["experience_timeline"].append({"start": s, "end": e})
+    return data
+
+
+def legacy_extract_skills(text, skills=_LEGACY_SKILLS):
+    text_lower = text.lower()
+    return [s for s in skills if s in text_lower]
+
+
+def legacy_extract_education(text):
+    keywords = ['education', 'academic', 'university', 'college', 'degree']
+    lines, out, capture = text.split('\n'), [], False
+    for line in lines:
+        if any(k in line.lower() for k in keywords):
+            capture = True
+        if capture:
+            out.append(line)
+            if len(out) > 10:
+                break
+    return "\n".join(out[:10])
+
+
+def legacy_all(text):
+    data = legacy_quick_local_parse(text)
+    data["dictionary_skills"] = legacy_extract_skills(text)
+    data["education"] = legacy_extract_education(text)
+    return data
+
+
+def legacy_all_full_dictionary(text):
+    # The old substring approach with the dictionary the new extractor uses
+    data = legacy_quick_local_parse(text)
+    data["dictionary_skills"] = legacy_extract_skills(text, SKILLS)
+    data["education"] = legacy_extract_education(text)
+    return data
+
+
+def current_all(text):
+    # One call covers all three legacy functions (skills include dictionary hits)
+    return quick_local_parse(text)
+
+
+# -------------------------------------------------------------------------
+
+def time_it(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count=1000, seed=0, repeat=3):
+    corpus = make_corpus(count, seed=seed)
+    chars = sum(len(t) for t in corpus)
+    results = {}
+    cases = (
+        ("legacy", legacy_all),
+        ("legacy_full_dict", legacy_all_full_dictionary),
+        ("single_pass", current_all),
+    )
+    for label, fn in cases:
+        seconds = time_it(fn, corpus, repeat)
+        results[label] = {
+            "seconds": round(seconds, 4),
+            "resumes_per_second": round(count / seconds, 1),
+            "mb_per_second": round(chars / seconds / 1e6, 2),
+        }
+    return {"count": count, "chars": chars, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    report = run(args.count, args.seed, args.repeat)
+    print(f"{report['count']} resumes, {report['chars'] / 1e6:.1f} MB of text")
+    for label, r in report["results"].items():
+        print(f"  {label:<18} {r['seconds']:>8.3f}s  {r['resumes_per_second']:>9.1f} resumes/s")
+
+
+if __name__ == "__main__":
+    main()
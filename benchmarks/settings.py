@@ -0,0 +1,37 @@
+# benchmarks/settings.py
+"""
+Django settings for the benchmark suite: the app settings with a separate
+SQLite database and media directory under BENCH_DATA_DIR, so benchmarks
+never touch development data.
+"""
+import os
+import tempfile
+
+from resume_parser.settings.base import *
+
+BENCH_DATA_DIR = os.environ.get(
+    "BENCH_DATA_DIR", os.path.join(tempfile.gettempdir(), "resume-bench")
+)
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.path.join(BENCH_DATA_DIR, "bench.sqlite3"),
+    }
+}
+MEDIA_ROOT = os.path.join(BENCH_DATA_DIR, "media")
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+
+# Uploads are parsed inline by the suite, and every parse is a cache miss
+# (the formats share one corpus, so near-duplicate reuse is off as well)
+RESUME_JOB_INPROCESS_WORKERS = 0
+RESUME_PARSE_CACHE_ENABLED = False
+RESUME_DEDUP_MODE = "off"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "root": {"handlers": [], "level": "CRITICAL"},
+}
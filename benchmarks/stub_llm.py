@@ -0,0 +1,133 @@
+# benchmarks/stub_llm.py
+"""
+Stand-in for the Groq client, so LLM code paths can be timed offline.
+
+Answers are built with the local parser from the resume text in the
+prompt (one object, or one array entry per resume for batch prompts),
+after a fixed simulated latency. Streamed calls (stream=True) get their
+first chunk after STREAM_FIRST_SHARE of the latency and the rest spread
+over the remainder.
+
+    with stub_groq(latency=0.05):
+        parse_resume_with_llm(text)
+        await aparse_resume_with_llm(text)   # async client, stub.aio
+"""
+import asyncio
+import json
+import re
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Iterator
+
+from resumes.utils import llm_client
+from resumes.utils.llm_parser import quick_local_parse
+
+_BLOCK_RE = re.compile(r'(?:Resume (\d+):\n)?"""(.*?)"""', re.DOTALL)
+
+STREAM_CHUNK_CHARS = 32
+STREAM_FIRST_SHARE = 0.25
+
+
+def _chunk(piece: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+class StubStream:
+    def __init__(self, content: str, latency: float = 0.0):
+        self.pieces = [content[i:i + STREAM_CHUNK_CHARS]
+                       for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        self.first = latency * STREAM_FIRST_SHARE
+        self.step = (latency - self.first) / max(1, len(self.pieces))
+        self.closed = False
+
+    def __iter__(self):
+        if self.first:
+            time.sleep(self.first)
+        for piece in self.pieces:
+            if self.closed:
+                return
+            yield _chunk(piece)
+            if self.step:
+                time.sleep(self.step)
+
+    def close(self):
+        self.closed = True
+
+
+class StubAsyncStream(StubStream):
+    async def __aiter__(self):
+        if self.first:
+            await asyncio.sleep(self.first)
+        for piece in self.pieces:
+            if self.closed:
+                return
+            yield _chunk(piece)
+            if self.step:
+                await asyncio.sleep(self.step)
+
+    async def close(self):
+        self.closed = True
+
+
+class StubCompletions:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, model, messages, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return StubStream(self.content(messages), self.latency)
+        if self.latency:
+            time.sleep(self.latency)
+        return self.answer(messages)
+
+    @classmethod
+    def answer(cls, messages):
+        message = SimpleNamespace(content=cls.content(messages))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    @staticmethod
+    def content(messages) -> str:
+        prompt = messages[-1]["content"]
+        items = []
+        for index, text in _BLOCK_RE.findall(prompt):
+            data = quick_local_parse(text)
+            data.pop("source", None)
+            if index:
+                data["index"] = int(index)
+            items.append(data)
+
+        batch = "JSON array" in prompt
+        return json.dumps(items if batch else (items[0] if items else {}))
+
+
+class StubAsyncCompletions(StubCompletions):
+    async def create(self, model, messages, stream=False, **kwargs):
+        self.calls += 1
+        if stream:
+            return StubAsyncStream(self.content(messages), self.latency)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.answer(messages)
+
+
+class StubGroq:
+    def __init__(self, latency: float = 0.0):
+        self.chat = SimpleNamespace(completions=StubCompletions(latency))
+        # Stands in for the AsyncGroq clients
+        self.aio = SimpleNamespace(chat=SimpleNamespace(completions=StubAsyncCompletions(latency)))
+
+
+@contextmanager
+def stub_groq(latency: float = 0.0) -> Iterator[StubGroq]:
+    """Route every llm_client call to a StubGroq for the duration."""
+    saved = llm_client.GROQ_API_KEY, llm_client._client, llm_client.get_async_client
+    stub = StubGroq(latency)
+    llm_client.GROQ_API_KEY, llm_client._client = "stub", stub
+    llm_client.get_async_client = lambda: stub.aio
+    try:
+        yield stub
+    finally:
+        llm_client.GROQ_API_KEY, llm_client._client, llm_client.get_async_client = saved
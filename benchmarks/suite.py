@@ -0,0 +1,382 @@
+# benchmarks/suite.py
+"""
+End-to-end benchmark suite.
+
+Times text extraction per format, local and (stubbed) LLM parsing, ATS
+scoring, full uploads through the Django test client, list/search pages at
+several table sizes and bulk rescoring. Results are written as JSON so two
+runs (e.g. two commits) can be compared:
+
+    python -m benchmarks.suite --out before.json
+    python -m benchmarks.suite --out after.json --compare before.json
+
+Everything runs against separate SQLite databases under BENCH_DATA_DIR
+(see benchmarks/settings.py); seeded tables are kept and reused between
+runs.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+
+from benchmarks.corpus import FORMATS, make_corpus, make_files  # noqa: E402
+from benchmarks.stub_llm import stub_groq  # noqa: E402
+from resumes import blobstore, jobs, parse_cache, semantic  # noqa: E402
+from resumes.models import Resume, ResumeSkill, Skill  # noqa: E402
+from resumes.pipeline import build_resume  # noqa: E402
+from resumes.skills import resume_skill_names  # noqa: E402
+from resumes.utils.ats import calculate_ats_score  # noqa: E402
+from resumes.utils.llm_parser import (  # noqa: E402
+    aparse_resume_with_llm,
+    extract_text_from_bytes,
+    parse_resume_with_llm,
+    parse_resumes_with_llm,
+    quick_local_parse,
+)
+
+SEED_BATCH = 2000
+
+
+class Skip(Exception):
+    """Raised by a scenario that cannot run in this environment."""
+
+
+# ---- timing -----------------------------------------------------------------
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        "n": len(ordered),
+        "total_s": round(total, 4),
+        "mean_ms": round(total / len(ordered) * 1000, 3),
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "ops_per_s": round(len(ordered) / total, 1) if total else 0.0,
+    }
+
+
+def time_each(fn: Callable, items: Iterable, warmup: int = 1) -> List[float]:
+    """Per-call durations of fn(item); the first `warmup` calls are not kept."""
+    samples = []
+    for i, item in enumerate(items):
+        start = time.perf_counter()
+        fn(item)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+# ---- scenarios --------------------------------------------------------------
+
+def _tesseract_available() -> bool:
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+def bench_extract(fmt: str, count: int, seed: int) -> List[float]:
+    if fmt == "png" and not _tesseract_available():
+        raise Skip("tesseract is not installed")
+    files = make_files(count + 1, fmt, seed=seed)
+    return time_each(lambda f: extract_text_from_bytes(f[1], f[0]), files)
+
+
+def bench_local_parse(count: int, seed: int) -> List[float]:
+    return time_each(quick_local_parse, make_corpus(count + 1, seed=seed))
+
+
+def bench_llm_parse(count: int, seed: int, latency: float) -> List[float]:
+    with stub_groq(latency):
+        return time_each(parse_resume_with_llm, make_corpus(count + 1, seed=seed))
+
+
+def bench_llm_batch(count: int, seed: int, latency: float) -> List[float]:
+    # One sample per resume: each batch call's time split over its resumes
+    texts = make_corpus(count, seed=seed)
+    with stub_groq(latency):
+        start = time.perf_counter()
+        parse_resumes_with_llm(texts)
+        elapsed = time.perf_counter() - start
+    return [elapsed / len(texts)] * len(texts)
+
+
+def bench_llm_async(count: int, seed: int, latency: float) -> List[float]:
+    # All resumes awaited concurrently on one event loop; per-resume share of the total
+    texts = make_corpus(count, seed=seed)
+
+    async def parse_all():
+        return await asyncio.gather(*(aparse_resume_with_llm(t) for t in texts))
+
+    with stub_groq(latency):
+        start = time.perf_counter()
+        asyncio.run(parse_all())
+        elapsed = time.perf_counter() - start
+    return [elapsed / len(texts)] * len(texts)
+
+
+def bench_ats_score(count: int, seed: int) -> List[float]:
+    resumes = [build_resume(quick_local_parse(t)) for t in make_corpus(count + 1, seed=seed)]
+    return time_each(calculate_ats_score, resumes)
+
+
+def bench_upload(fmt: str, count: int, seed: int, latency: float) -> List[float]:
+    """POST to the upload view, then run the queued job to completion."""
+    if fmt == "png" and not _tesseract_available():
+        raise Skip("tesseract is not installed")
+    use_database(os.path.join(settings.BENCH_DATA_DIR, "bench.sqlite3"))
+    client = Client()
+    files = make_files(count + 1, fmt, seed=seed)
+    forget_files([parse_cache.hash_bytes(data) for _, data in files])
+
+    def upload(item):
+        name, data = item
+        response = client.post("/resumes/upload/", {"resume_file": SimpleUploadedFile(name, data)})
+        if response.status_code != 302:
+            raise RuntimeError(f"upload returned {response.status_code}")
+        jobs.work(burst=True)
+
+    with stub_groq(latency):
+        return time_each(upload, files)
+
+
+def forget_files(hashes: List[str]) -> None:
+    """Drop resumes and blobs from earlier runs, so uploads are extracted again."""
+    stored = Resume.objects.filter(file_sha256__in=hashes)
+    for key in stored.exclude(text_sha256="").values_list("text_sha256", flat=True):
+        blobstore.delete(key)
+    stored.delete()
+    for key in hashes:
+        blobstore.delete(key)
+
+
+def bench_page(path: str, repeat: int) -> List[float]:
+    client = Client()
+
+    def get(_):
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+
+    return time_each(get, range(repeat + 1))
+
+
+def bench_semantic(rows: int, repeat: int) -> List[float]:
+    """Semantic search page; the vector index is built once per database and kept."""
+    seed_semantic_index(rows)
+    return bench_page("/resumes/?q=k8s+platform+engineer&mode=semantic", repeat)
+
+
+def bench_rescore(repeat: int) -> List[float]:
+    """rescore_resumes with every stored score stale, so all rows are written."""
+    samples = []
+    with open(os.devnull, "w") as devnull:
+        for _ in range(repeat):
+            Resume.objects.update(ats_score=-1)
+            start = time.perf_counter()
+            call_command("rescore_resumes", stdout=devnull)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+# ---- seeded databases -------------------------------------------------------
+
+def use_database(path: str) -> None:
+    """Point the default connection (and the semantic index) at `path`, migrating it if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if connection.settings_dict["NAME"] != path:
+        connection.close()
+        connection.settings_dict["NAME"] = path
+    settings.RESUME_SEMANTIC_DIR = path + ".semantic"
+    semantic.get_index.cache_clear()
+    call_command("migrate", verbosity=0)
+
+
+def seed_resumes(rows: int, seed: int) -> None:
+    """Top the current database up to `rows` resumes, with their skill links."""
+    have = Resume.objects.count()
+    if have >= rows:
+        return
+    texts = make_corpus(rows, seed=seed)[have:]
+    skill_ids = dict(Skill.objects.values_list("name", "id"))
+
+    for start in range(0, len(texts), SEED_BATCH):
+        with transaction.atomic():
+            resumes = Resume.objects.bulk_create(
+                [build_resume(quick_local_parse(t)) for t in texts[start:start + SEED_BATCH]]
+            )
+            links = []
+            for pk, names in resume_skill_names(resumes).items():
+                for name in names:
+                    if name not in skill_ids:
+                        skill_ids[name] = Skill.objects.create(name=name).pk
+                    links.append(ResumeSkill(resume_id=pk, skill_id=skill_ids[name]))
+            ResumeSkill.objects.bulk_create(links)
+        print(f"  seeded {have + start + len(resumes)}/{rows}", file=sys.stderr)
+
+
+def seed_semantic_index(rows: int) -> None:
+    """Build the semantic index of the current database unless it covers `rows` resumes."""
+    if semantic.get_index().stats().get("live", 0) < rows:
+        semantic.rebuild_semantic_index(
+            progress=lambda n: n % 10000 == 0 and print(f"  embedded {n}/{rows}", file=sys.stderr)
+        )
+
+
+# ---- runner -----------------------------------------------------------------
+
+def build_scenarios(args) -> Dict[str, Callable[[], List[float]]]:
+    n, seed, latency = args.count, args.seed, args.llm_latency
+    scenarios = {}
+    for fmt in FORMATS:
+        scenarios[f"extract.{fmt}"] = lambda fmt=fmt: bench_extract(fmt, n, seed)
+    scenarios["parse.local"] = lambda: bench_local_parse(n * 10, seed)
+    scenarios["parse.llm_stub"] = lambda: bench_llm_parse(n, seed, latency)
+    scenarios["parse.llm_stub_batch"] = lambda: bench_llm_batch(n, seed, latency)
+    scenarios["parse.llm_stub_async"] = lambda: bench_llm_async(n, seed, latency)
+    scenarios["ats.score"] = lambda: bench_ats_score(n * 10, seed)
+    for fmt in FORMATS:
+        scenarios[f"upload.{fmt}"] = lambda fmt=fmt: bench_upload(fmt, n, seed, latency)
+
+    for rows in args.rows:
+        def seeded(fn, rows=rows):
+            def run():
+                use_database(os.path.join(settings.BENCH_DATA_DIR, f"bench-{rows}.sqlite3"))
+                seed_resumes(rows, seed)
+                return fn()
+            return run
+
+        label = f"{rows // 1000}k" if rows % 1000 == 0 else str(rows)
+        repeat = args.repeat
+        scenarios[f"list.{label}"] = seeded(lambda: bench_page("/resumes/", repeat))
+        scenarios[f"list.{label}.skill"] = seeded(lambda: bench_page("/resumes/?skill=python", repeat))
+        scenarios[f"search.{label}"] = seeded(lambda: bench_page("/resumes/?q=python+django", repeat))
+        scenarios[f"search.{label}.semantic"] = seeded(lambda rows=rows: bench_semantic(rows, repeat))
+        scenarios[f"rescore.{label}"] = seeded(lambda: bench_rescore(max(1, repeat // 10)))
+    return scenarios
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def run(args) -> Dict:
+    scenarios = build_scenarios(args)
+    selected = [
+        name for name in scenarios
+        if not args.only or any(name.startswith(prefix) for prefix in args.only)
+    ]
+
+    results = {}
+    for name in selected:
+        print(f"{name} ...", file=sys.stderr)
+        try:
+            results[name] = summarize(scenarios[name]())
+        except Skip as e:
+            results[name] = {"skipped": str(e)}
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print a mean-time comparison; returns the scenarios slower than `threshold`."""
+    regressions = []
+    print(f"\n{'scenario':<26}{'base ms':>12}{'new ms':>12}{'ratio':>8}")
+    for name, new in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old or "mean_ms" not in old or "mean_ms" not in new:
+            continue
+        ratio = new["mean_ms"] / old["mean_ms"] if old["mean_ms"] else float("inf")
+        flag = "  slower" if ratio > threshold else ""
+        print(f"{name:<26}{old['mean_ms']:>12.3f}{new['mean_ms']:>12.3f}{ratio:>8.2f}{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(f"{'scenario':<26}{'n':>6}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}{'ops/s':>10}")
+    for name, r in report["results"].items():
+        if "skipped" in r:
+            print(f"{name:<26}  skipped: {r['skipped']}")
+            continue
+        print(f"{name:<26}{r['n']:>6}{r['mean_ms']:>12.3f}{r['p50_ms']:>12.3f}"
+              f"{r['p95_ms']:>12.3f}{r['ops_per_s']:>10.1f}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20,
+                        help="Files per extraction/upload scenario (parsing uses 10x).")
+    parser.add_argument("--rows", type=int, nargs="*", default=[10_000, 100_000],
+                        help="Table sizes for the list/search/rescore scenarios.")
+    parser.add_argument("--repeat", type=int, default=20, help="Requests per list/search scenario.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Simulated seconds per stubbed Groq call.")
+    parser.add_argument("--only", nargs="*", default=[],
+                        help="Run only scenarios starting with these prefixes (e.g. extract parse.local).")
+    parser.add_argument("--out", default="bench_results.json", help="Where to write the JSON report.")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.15,
+                        help="Mean-time ratio above which --compare reports a regression.")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) slower than x{args.threshold}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
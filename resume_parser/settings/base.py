@@ -129,3 +129,73 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Resume parse cache: duplicate uploads reuse a previous LLM parse.
+RESUME_PARSE_CACHE_ENABLED = os.environ.get("RESUME_PARSE_CACHE_ENABLED", "1") == "1"
+RESUME_PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_PARSE_CACHE_MAX_ENTRIES", 5000))
+RESUME_PARSE_CACHE_TTL = int(os.environ.get("RESUME_PARSE_CACHE_TTL", 30 * 24 * 3600))
+
+# Background parse jobs: uploads are queued in the DB and parsed by worker
+# threads. Set to 0 when running `manage.py parse_worker` separately.
+RESUME_JOB_INPROCESS_WORKERS = int(os.environ.get("RESUME_JOB_INPROCESS_WORKERS", 2))
+RESUME_JOB_STALE_AFTER = int(os.environ.get("RESUME_JOB_STALE_AFTER", 600))
+# Stale jobs are requeued until they have had this many tries, then failed
+RESUME_JOB_MAX_ATTEMPTS = int(os.environ.get("RESUME_JOB_MAX_ATTEMPTS", 3))
+# Seconds between sweeps that hand the in-process runner jobs it never got
+# (left queued or stale by a restart)
+RESUME_JOB_SWEEP_INTERVAL = int(os.environ.get("RESUME_JOB_SWEEP_INTERVAL", 60))
+# When > 0, in-process jobs run as coroutines on one event loop, up to this
+# many at once, instead of on RESUME_JOB_INPROCESS_WORKERS threads. Their
+# file extraction uses RESUME_JOB_EXTRACT_THREADS threads.
+RESUME_JOB_INPROCESS_ASYNC = int(os.environ.get("RESUME_JOB_INPROCESS_ASYNC", 0))
+RESUME_JOB_EXTRACT_THREADS = int(os.environ.get("RESUME_JOB_EXTRACT_THREADS", min(4, os.cpu_count() or 1)))
+
+# Uploads stream to a temp file and are refused beyond this size
+# (resumes/uploads.py); bulk ingest skips larger files too.
+RESUME_UPLOAD_MAX_BYTES = int(os.environ.get("RESUME_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+
+# Content-addressed store for original files and extracted text
+# (resumes/blobstore.py); empty root means MEDIA_ROOT/blobs.
+RESUME_BLOB_ROOT = os.environ.get("RESUME_BLOB_ROOT", "")
+RESUME_BLOB_COMPRESS = os.environ.get("RESUME_BLOB_COMPRESS", "1") == "1"
+
+# Near-duplicate detection (resumes/dedup.py): "link" stores a near-duplicate
+# linked to its first copy, "merge" stores nothing new, "off" disables it.
+# Linked copies reuse the first copy's parse unless REUSE_PARSE is 0.
+RESUME_DEDUP_MODE = os.environ.get("RESUME_DEDUP_MODE", "link")
+RESUME_DEDUP_THRESHOLD = float(os.environ.get("RESUME_DEDUP_THRESHOLD", 0.8))
+RESUME_DEDUP_REUSE_PARSE = os.environ.get("RESUME_DEDUP_REUSE_PARSE", "1") == "1"
+
+RESUME_LIST_PAGE_SIZE = int(os.environ.get("RESUME_LIST_PAGE_SIZE", 25))
+
+# Job-description matching (resumes/matching.py)
+RESUME_MATCH_RESULTS = int(os.environ.get("RESUME_MATCH_RESULTS", 25))
+RESUME_MATCH_SKILL_BOOST = float(os.environ.get("RESUME_MATCH_SKILL_BOOST", 2.0))
+RESUME_MATCH_MAX_DF_RATIO = float(os.environ.get("RESUME_MATCH_MAX_DF_RATIO", 0.5))
+RESUME_MATCH_PACK_AFTER = int(os.environ.get("RESUME_MATCH_PACK_AFTER", 1000))
+
+# Semantic search (resumes/semantic.py): memory-mapped vector index, empty
+# dir means MEDIA_ROOT/semantic. Changing the dimension needs
+# `manage.py rebuild_semantic_index`.
+RESUME_SEMANTIC_DIR = os.environ.get("RESUME_SEMANTIC_DIR", "")
+RESUME_SEMANTIC_DIM = int(os.environ.get("RESUME_SEMANTIC_DIM", 256))
+RESUME_SEMANTIC_NPROBE = int(os.environ.get("RESUME_SEMANTIC_NPROBE", 32))
+RESUME_SEMANTIC_MIN_SCORE = float(os.environ.get("RESUME_SEMANTIC_MIN_SCORE", 0.05))
+
+# Load the spaCy NER model at startup (use with gunicorn --preload)
+RESUME_SPACY_PRELOAD = os.environ.get("RESUME_SPACY_PRELOAD", "0") == "1"
+
+# Pipeline metrics at /metrics; RESUME_TIMING_LOG=1 also logs one JSON line
+# of stage timings per parse job/upload (resumes/utils/metrics.py)
+RESUME_METRICS_ENABLED = os.environ.get("RESUME_METRICS_ENABLED", "1") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "resumes.timing": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
@@ -2,8 +2,11 @@ from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
 
+from resumes.views import metrics
+
 urlpatterns = [
     path("", lambda request: redirect("resumes/")),
     path("admin/", admin.site.urls),
+    path("metrics", metrics, name="metrics"),
     path("resumes/", include("resumes.urls")),
 ]
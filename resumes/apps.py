@@ -1,6 +1,36 @@
+import gc
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.models.signals import post_migrate
+
+
+def start_job_sweeper(**kwargs):
+    # Once, on the first request a web process serves: management commands
+    # (migrate, parse_worker, ...) never start the in-process runner's sweeper
+    from .jobs import start_sweeper
+
+    request_started.disconnect(start_job_sweeper)
+    start_sweeper()
 
 
 class ResumesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resumes'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_search_schema
+
+        post_migrate.connect(ensure_search_schema, sender=self)
+        request_started.connect(start_job_sweeper)
+
+        if getattr(settings, "RESUME_SPACY_PRELOAD", False):
+            # Load once in the parent (e.g. gunicorn --preload) so forked
+            # workers share the model's memory copy-on-write; freezing keeps
+            # the GC from touching (and so copying) those pages.
+            from .utils.parser import get_nlp
+
+            get_nlp()
+            gc.freeze()
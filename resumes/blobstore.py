@@ -0,0 +1,199 @@
+# resumes/blobstore.py
+"""
+Content-addressed storage for original resume files and their extracted text.
+
+Blobs live under RESUME_BLOB_ROOT (default MEDIA_ROOT/blobs), named by the
+sha256 of their content and sharded on its first two byte pairs:
+
+    blobs/3f/a2/3fa2...e1       stored as is
+    blobs/3f/a2/3fa2...e1.gz    gzip-compressed
+
+Storing content that is already present writes nothing, so a file uploaded
+twice is kept once. With RESUME_BLOB_COMPRESS on, a blob is gzipped when a
+sample of it compresses well (text does; PDFs, DOCX and images rarely do).
+Writes go to a temp file that is renamed into place, so readers never see
+a partial blob.
+"""
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import zlib
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional, Union
+
+from django.conf import settings
+
+from .utils import metrics
+
+CHUNK_BYTES = 1 << 20
+
+# A blob is compressed when its first SAMPLE_BYTES shrink below this ratio
+SAMPLE_BYTES = 64 * 1024
+COMPRESS_RATIO = 0.9
+
+GZIP_SUFFIX = ".gz"
+_HEX = frozenset("0123456789abcdef")
+
+BLOB_WRITES = metrics.counter(
+    "resume_blob_writes_total", "Blob store puts, by outcome (stored or deduplicated).", ("outcome",)
+)
+
+
+def root() -> str:
+    configured = getattr(settings, "RESUME_BLOB_ROOT", "")
+    return str(configured or os.path.join(settings.MEDIA_ROOT, "blobs"))
+
+
+def compress_enabled() -> bool:
+    return getattr(settings, "RESUME_BLOB_COMPRESS", True)
+
+
+def _base_path(sha256: str) -> str:
+    if len(sha256) != 64 or not _HEX.issuperset(sha256):
+        raise ValueError(f"Not a sha256 hex digest: {sha256!r}")
+    return os.path.join(root(), sha256[:2], sha256[2:4], sha256)
+
+
+def locate(sha256: str) -> Optional[str]:
+    """Path of the stored blob (possibly gzipped), or None."""
+    base = _base_path(sha256)
+    for path in (base, base + GZIP_SUFFIX):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def exists(sha256: str) -> bool:
+    return locate(sha256) is not None
+
+
+# -----------------------------
+# WRITING
+# -----------------------------
+
+def put_file(path: str, sha256: str = "") -> str:
+    """Store a file's content and return its sha256."""
+    with open(path, "rb") as f:
+        return put_stream(f, sha256)
+
+
+def put_bytes(data: bytes, sha256: str = "") -> str:
+    return put_stream(io.BytesIO(data), sha256)
+
+
+def put_text(text: str) -> str:
+    return put_bytes(text.encode("utf-8"))
+
+
+def put(source: Union[bytes, str], sha256: str = "") -> str:
+    """Store a file given as a path or raw bytes."""
+    return put_file(source, sha256) if isinstance(source, str) else put_bytes(source, sha256)
+
+
+def put_stream(stream: BinaryIO, sha256: str = "") -> str:
+    """
+    Store a binary stream, hashing it while it is written. When the caller
+    already knows the sha256 and the blob exists, nothing is read.
+    """
+    if sha256 and exists(sha256):
+        BLOB_WRITES.inc(outcome="deduplicated")
+        return sha256
+
+    head = stream.read(SAMPLE_BYTES)
+    compress = compress_enabled() and _compressible(head)
+
+    tmp_dir = os.path.join(root(), "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as raw:
+            out = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) if compress else raw
+            chunk = head
+            while chunk:
+                digest.update(chunk)
+                out.write(chunk)
+                chunk = stream.read(CHUNK_BYTES)
+            if compress:
+                out.close()   # flushes the gzip trailer; raw stays open
+
+        key = digest.hexdigest()
+        if sha256 and key != sha256:
+            raise ValueError(f"Content hashes to {key}, not {sha256}")
+        if exists(key):
+            BLOB_WRITES.inc(outcome="deduplicated")
+            return key
+
+        final = _base_path(key) + (GZIP_SUFFIX if compress else "")
+        os.makedirs(os.path.dirname(final), exist_ok=True)
+        os.replace(tmp_path, final)
+        tmp_path = None
+        BLOB_WRITES.inc(outcome="stored")
+        return key
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+def _compressible(sample: bytes) -> bool:
+    return bool(sample) and len(zlib.compress(sample, 1)) < len(sample) * COMPRESS_RATIO
+
+
+# -----------------------------
+# READING
+# -----------------------------
+
+def open_blob(sha256: str) -> BinaryIO:
+    """Binary file object with the blob's original content."""
+    path = locate(sha256)
+    if path is None:
+        raise FileNotFoundError(f"No blob {sha256}")
+    return gzip.open(path, "rb") if path.endswith(GZIP_SUFFIX) else open(path, "rb")
+
+
+def read_bytes(sha256: str) -> bytes:
+    with open_blob(sha256) as f:
+        return f.read()
+
+
+def read_text(sha256: str) -> str:
+    return read_bytes(sha256).decode("utf-8")
+
+
+@contextmanager
+def local_path(sha256: str, suffix: str = "") -> Iterator[str]:
+    """
+    Path of a file holding the blob's original content, for readers that
+    need a real file. Compressed blobs are unpacked into a temp file that
+    is removed afterwards.
+    """
+    path = locate(sha256)
+    if path is None:
+        raise FileNotFoundError(f"No blob {sha256}")
+    if not path.endswith(GZIP_SUFFIX):
+        yield path
+        return
+
+    with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+        with gzip.open(path, "rb") as src:
+            shutil.copyfileobj(src, tmp, CHUNK_BYTES)
+        tmp.flush()
+        yield tmp.name
+
+
+def delete(sha256: str) -> bool:
+    """Remove a blob; True if it existed. Callers check it is unreferenced."""
+    path = locate(sha256)
+    if path is None:
+        return False
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
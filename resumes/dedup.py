@@ -0,0 +1,178 @@
+# resumes/dedup.py
+"""
+Near-duplicate detection for uploaded and ingested resumes.
+
+Every stored resume keeps a MinHash signature of its extracted text and
+its LSH band keys (MinHashBand, see resumes/utils/minhash.py). A new text
+is compared only with the resumes sharing one of its band keys, through
+the key index, so a lookup costs the same at 1k or 1M resumes.
+
+A match at RESUME_DEDUP_THRESHOLD or above is handled per
+RESUME_DEDUP_MODE:
+
+- "link" (default): the new resume is stored with duplicate_of pointing at
+  the first copy. With RESUME_DEDUP_REUSE_PARSE on, that copy's parsed
+  fields are reused instead of calling the LLM; email and phone still come
+  from the new text, since those are what an edited copy tends to change.
+- "merge": no new resume is stored; the upload resolves to the first copy.
+- "off": no detection.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .models import MinHashBand, Resume
+from .utils import metrics, minhash
+from .utils.llm_parser import result_version
+from .utils.local_extractor import extract_fields
+
+LINK, MERGE, OFF = "link", "merge", "off"
+
+# Keeps IN (...) lists well under database parameter limits
+LOOKUP_BATCH = 500
+
+DUPLICATES = metrics.counter(
+    "resume_duplicates_total", "Near-duplicate resumes detected, by what was done with them.",
+    ("action",),
+)
+
+
+def mode() -> str:
+    value = getattr(settings, "RESUME_DEDUP_MODE", LINK)
+    return value if value in (LINK, MERGE) else OFF
+
+
+def threshold() -> float:
+    return getattr(settings, "RESUME_DEDUP_THRESHOLD", 0.8)
+
+
+def reuse_parse_enabled() -> bool:
+    return getattr(settings, "RESUME_DEDUP_REUSE_PARSE", True)
+
+
+class Duplicate(NamedTuple):
+    # The first copy: a stored resume, or an earlier text of the same batch
+    resume_id: Optional[int]
+    position: Optional[int]
+    similarity: float
+
+
+# -----------------------------
+# Lookup
+# -----------------------------
+def signatures(texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+    return [minhash.signature(text) for text in texts]
+
+
+def find_duplicates(sigs: Sequence[Optional[np.ndarray]]) -> List[Optional[Duplicate]]:
+    """
+    The best near-duplicate of each signature at or above the threshold:
+    a stored resume, or else an earlier signature of the same list (for
+    batches whose resumes are not stored yet). None where there is none.
+    """
+    if mode() == OFF:
+        return [None] * len(sigs)
+
+    keys = [minhash.band_keys(sig) if sig is not None else [] for sig in sigs]
+    all_keys = list({k for row in keys for k in row})
+
+    # Stored resumes sharing a band with each key
+    stored: Dict[int, List[int]] = defaultdict(list)
+    for i in range(0, len(all_keys), LOOKUP_BATCH):
+        rows = MinHashBand.objects.filter(
+            key__in=all_keys[i:i + LOOKUP_BATCH]
+        ).values_list("key", "resume_id")
+        for key, resume_id in rows:
+            stored[key].append(resume_id)
+
+    candidate_ids = list({pk for ids in stored.values() for pk in ids})
+    candidates: Dict[int, tuple] = {}
+    for i in range(0, len(candidate_ids), LOOKUP_BATCH):
+        rows = Resume.objects.filter(pk__in=candidate_ids[i:i + LOOKUP_BATCH]).values_list(
+            "id", "minhash", "duplicate_of_id"
+        )
+        candidates.update((pk, (minhash.unpack(blob), first)) for pk, blob, first in rows)
+
+    limit = threshold()
+    found: List[Optional[Duplicate]] = []
+    earlier: Dict[int, List[int]] = defaultdict(list)
+    for position, (sig, row_keys) in enumerate(zip(sigs, keys)):
+        best = None
+        if sig is not None:
+            for pk in {pk for k in row_keys for pk in stored.get(k, ())}:
+                other, first = candidates.get(pk, (None, None))
+                score = minhash.similarity(sig, other) if other is not None else 0.0
+                if score >= limit and (best is None or score > best.similarity):
+                    # Link to the first copy, not to a copy of it
+                    best = Duplicate(first or pk, None, score)
+            if best is None:
+                for j in {j for k in row_keys for j in earlier.get(k, ())}:
+                    score = minhash.similarity(sig, sigs[j])
+                    if score >= limit and (best is None or score > best.similarity):
+                        best = Duplicate(None, j, score)
+            if best is None:
+                # Later texts of the batch compare with first copies only
+                for k in row_keys:
+                    earlier[k].append(position)
+        found.append(best)
+    return found
+
+
+def check(text: str) -> Tuple[bytes, Optional[Duplicate]]:
+    """(packed signature, best stored near-duplicate) of one resume text."""
+    if mode() == OFF:
+        return b"", None
+    with metrics.stage("dedup"):
+        sig = minhash.signature(text)
+        if sig is None:
+            return b"", None
+        return minhash.pack(sig), find_duplicates([sig])[0]
+
+
+# -----------------------------
+# Parse reuse
+# -----------------------------
+def copy_parse(data: Dict[str, Any], text: str = "") -> Dict[str, Any]:
+    """
+    Parsed data for a near-duplicate of the text `data` was parsed from.
+    Email and phone found in the new text win.
+    """
+    copy = dict(data, source="duplicate", parser_version=result_version(data))
+    if text:
+        local = extract_fields(text)
+        copy["email"] = local["email"] or copy.get("email", "")
+        copy["mobile"] = local["mobile"] or copy.get("mobile", "")
+    return copy
+
+
+def parse_of(resume_id: int, text: str = "") -> Optional[Dict[str, Any]]:
+    """copy_parse of a stored resume's fields; None if it no longer exists."""
+    resume = Resume.objects.filter(pk=resume_id).first()
+    if resume is None:
+        return None
+    return copy_parse({
+        "name": resume.name,
+        "email": resume.email,
+        "mobile": resume.mobile,
+        "skills": resume.skill_list(),
+        "experience": resume.experience,
+        "education": resume.education,
+        "professional_summary": resume.summary,
+        # The copy is exactly as current as the parse it came from
+        "parser_version": resume.parser_version,
+    }, text)
+
+
+# -----------------------------
+# Indexing
+# -----------------------------
+def index_resumes(resumes: Iterable[Resume]) -> None:
+    """Store the band keys of saved resumes that have a signature."""
+    rows = []
+    for resume in resumes:
+        sig = minhash.unpack(resume.minhash)
+        if resume.pk and sig is not None:
+            rows.extend(MinHashBand(resume_id=resume.pk, key=k) for k in set(minhash.band_keys(sig)))
+    MinHashBand.objects.bulk_create(rows, ignore_conflicts=True, batch_size=LOOKUP_BATCH)
@@ -0,0 +1,442 @@
+# resumes/jobs.py
+"""
+DB-backed parse job queue.
+
+Uploads are saved as ParseJob rows and parsed outside the request thread,
+either by the in-process worker pool or by `manage.py parse_worker`.
+Jobs are claimed with a conditional UPDATE, so any number of workers can
+share the queue without an external broker.
+
+Jobs run on threads (work, RESUME_JOB_INPROCESS_WORKERS) or as coroutines
+on an event loop (awork, RESUME_JOB_INPROCESS_ASYNC). A coroutine waiting
+on the LLM holds no thread, so one loop can have hundreds of jobs in flight.
+
+While the LLM answer streams in, the fields already complete (name,
+email, skills, ...) are saved on the job as its preview, for the status
+page to show before the parse is done.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from . import parse_cache
+from .models import ParseJob
+from .pipeline import aparse_resume_file, parse_resume_file, run_blocking, store_parsed
+from .utils import metrics
+
+logger = logging.getLogger(__name__)
+
+JOBS_FINISHED = metrics.counter(
+    "resume_parse_jobs_finished_total", "Parse jobs finished, by final status.", ("status",)
+)
+JOB_SECONDS = metrics.histogram(
+    "resume_parse_job_seconds", "Wall time of a parse job, from claim to stored result."
+)
+JOB_QUEUE_SECONDS = metrics.histogram(
+    "resume_parse_job_queue_seconds", "Time a parse job waited in the queue before a worker claimed it."
+)
+JOBS_BY_STATUS = metrics.gauge(
+    "resume_parse_jobs", "Parse jobs currently in each status.", ("status",)
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# In-process async runner: an event loop on its own thread
+_loop = None
+_loop_slots = None
+
+# Jobs handed to the in-process runner and not finished yet, and the
+# thread that recovers jobs it was never handed (see start_sweeper)
+_dispatched = set()
+_sweeper = None
+
+# Most queued jobs one sweep hands to the in-process runner
+SWEEP_BATCH = 500
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    global _executor
+    workers = getattr(settings, "RESUME_JOB_INPROCESS_WORKERS", 2)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse-job")
+        return _executor
+
+
+def _get_loop() -> Optional[asyncio.AbstractEventLoop]:
+    global _loop, _loop_slots
+    concurrency = getattr(settings, "RESUME_JOB_INPROCESS_ASYNC", 0)
+    if concurrency <= 0:
+        return None
+    with _executor_lock:
+        if _loop is None:
+            _loop_slots = asyncio.Semaphore(concurrency)
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="parse-job-loop", daemon=True).start()
+        return _loop
+
+
+def _has_inprocess_runner() -> bool:
+    return (getattr(settings, "RESUME_JOB_INPROCESS_ASYNC", 0) > 0
+            or getattr(settings, "RESUME_JOB_INPROCESS_WORKERS", 2) > 0)
+
+
+def _dispatch(job_id: int) -> None:
+    """Hand a committed job to the in-process runner, if there is one."""
+    loop = _get_loop()
+    if loop is not None:
+        with _executor_lock:
+            _dispatched.add(job_id)
+        asyncio.run_coroutine_threadsafe(_arun_in_loop(job_id), loop)
+        return
+    executor = _get_executor()
+    if executor is not None:
+        with _executor_lock:
+            _dispatched.add(job_id)
+        executor.submit(_run_in_thread, job_id)
+
+
+def _finished(job_id: int) -> None:
+    with _executor_lock:
+        _dispatched.discard(job_id)
+
+
+def sweep() -> int:
+    """
+    Requeue stale running jobs, then hand the in-process runner the queued
+    jobs it does not hold yet (left over from a restart, or queued by a
+    process without a runner). Returns the number of jobs dispatched.
+    """
+    requeue_stale()
+    queued = ParseJob.objects.filter(status=ParseJob.STATUS_QUEUED).order_by("created_at", "pk")
+    with _executor_lock:
+        held = set(_dispatched)
+    ids = [pk for pk in queued.values_list("pk", flat=True)[:SWEEP_BATCH + len(held)] if pk not in held]
+    for pk in ids[:SWEEP_BATCH]:
+        _dispatch(pk)
+    return len(ids[:SWEEP_BATCH])
+
+
+def _sweep_forever(interval: float) -> None:
+    while True:
+        try:
+            dispatched = sweep()
+            if dispatched:
+                logger.info("Dispatched %s queued parse job(s) to the in-process runner", dispatched)
+        except Exception:
+            logger.exception("Parse job sweep failed")
+        finally:
+            connections.close_all()
+        time.sleep(interval)
+
+
+def start_sweeper() -> None:
+    """
+    Start the in-process runner's sweeper thread (once per process; no-op
+    without an in-process runner). Its first sweep picks up the jobs a
+    restart left behind; later ones run every RESUME_JOB_SWEEP_INTERVAL
+    seconds.
+    """
+    global _sweeper
+    if not _has_inprocess_runner():
+        return
+    with _executor_lock:
+        if _sweeper is not None:
+            return
+        interval = getattr(settings, "RESUME_JOB_SWEEP_INTERVAL", 60)
+        _sweeper = threading.Thread(
+            target=_sweep_forever, args=(interval,), name="parse-job-sweeper", daemon=True
+        )
+    _sweeper.start()
+
+
+def enqueue(uploaded_file) -> ParseJob:
+    """Persist the upload as a queued job and hand it to the local runner."""
+    job = ParseJob.objects.create(upload=uploaded_file, original_name=uploaded_file.name)
+    transaction.on_commit(lambda: _dispatch(job.pk))
+    return job
+
+
+async def aenqueue(uploaded_file) -> ParseJob:
+    """enqueue for async views."""
+    job = await ParseJob.objects.acreate(upload=uploaded_file, original_name=uploaded_file.name)
+    # Async views run outside atomic blocks: the row is already committed
+    _dispatch(job.pk)
+    return job
+
+
+def claim(job_id: Optional[int] = None) -> Optional[ParseJob]:
+    """Atomically mark a queued job as running and return it."""
+    queued = ParseJob.objects.filter(status=ParseJob.STATUS_QUEUED)
+    if job_id is not None:
+        candidates = [job_id]
+    else:
+        candidates = list(queued.order_by("created_at", "pk").values_list("pk", flat=True)[:10])
+
+    for pk in candidates:
+        claimed = queued.filter(pk=pk).update(
+            status=ParseJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+            attempts=F("attempts") + 1,
+            preview={},
+        )
+        if claimed:
+            return ParseJob.objects.get(pk=pk)
+    return None
+
+
+async def aclaim(job_id: Optional[int] = None) -> Optional[ParseJob]:
+    """Async claim."""
+    queued = ParseJob.objects.filter(status=ParseJob.STATUS_QUEUED)
+    if job_id is not None:
+        candidates = [job_id]
+    else:
+        oldest = queued.order_by("created_at", "pk").values_list("pk", flat=True)[:10]
+        candidates = [pk async for pk in oldest]
+
+    for pk in candidates:
+        claimed = await queued.filter(pk=pk).aupdate(
+            status=ParseJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+            attempts=F("attempts") + 1,
+            preview={},
+        )
+        if claimed:
+            return await ParseJob.objects.aget(pk=pk)
+    return None
+
+
+def run_job(job: ParseJob) -> ParseJob:
+    """Extract, parse and store the resume for a claimed job."""
+    if job.started_at:
+        JOB_QUEUE_SECONDS.observe((job.started_at - job.created_at).total_seconds())
+
+    with metrics.trace(job=job.pk, file=job.original_name) as timings, JOB_SECONDS.time():
+        try:
+            with metrics.stage("read"):
+                source, file_hash = _job_source(job)
+
+            filename = job.original_name or job.upload.name
+            parsed = parse_resume_file(source, filename, file_hash, _preview_saver(job))
+            if parsed is None:
+                job.status = ParseJob.STATUS_FAILED
+                job.error = "Unable to extract text from file."
+            else:
+                job.resume = store_parsed(parsed, os.path.basename(filename))
+                job.status = ParseJob.STATUS_DONE
+                job.error = ""
+                _discard_upload(job)
+        except Exception as e:
+            logger.exception("Parse job %s failed: %s", job.pk, e)
+            job.status = ParseJob.STATUS_FAILED
+            job.error = str(e) or e.__class__.__name__
+
+        job.finished_at = timezone.now()
+        with metrics.stage("db_write"):
+            job.save(update_fields=["upload", "status", "resume", "error", "finished_at"])
+        timings["status"] = job.status
+
+    JOBS_FINISHED.inc(status=job.status)
+    return job
+
+
+async def arun_job(job: ParseJob) -> ParseJob:
+    """run_job for an event loop: file work runs on the extraction pool, the LLM call is awaited."""
+    if job.started_at:
+        JOB_QUEUE_SECONDS.observe((job.started_at - job.created_at).total_seconds())
+
+    with metrics.trace(job=job.pk, file=job.original_name) as timings, JOB_SECONDS.time():
+        try:
+            with metrics.stage("read"):
+                source, file_hash = await run_blocking(_job_source, job)
+
+            filename = job.original_name or job.upload.name
+            previews = []
+
+            def save_preview(fields: Dict[str, Any]) -> None:
+                previews.append(asyncio.ensure_future(
+                    ParseJob.objects.filter(pk=job.pk).aupdate(preview=fields)
+                ))
+
+            parsed = await aparse_resume_file(source, filename, file_hash, save_preview)
+            await asyncio.gather(*previews, return_exceptions=True)
+            if parsed is None:
+                job.status = ParseJob.STATUS_FAILED
+                job.error = "Unable to extract text from file."
+            else:
+                # Saving runs the (sync) matching-index signal handlers
+                job.resume = await sync_to_async(store_parsed)(parsed, os.path.basename(filename))
+                job.status = ParseJob.STATUS_DONE
+                job.error = ""
+                await run_blocking(_discard_upload, job)
+        except Exception as e:
+            logger.exception("Parse job %s failed: %s", job.pk, e)
+            job.status = ParseJob.STATUS_FAILED
+            job.error = str(e) or e.__class__.__name__
+
+        job.finished_at = timezone.now()
+        with metrics.stage("db_write"):
+            await job.asave(update_fields=["upload", "status", "resume", "error", "finished_at"])
+        timings["status"] = job.status
+
+    JOBS_FINISHED.inc(status=job.status)
+    return job
+
+
+def _preview_saver(job: ParseJob):
+    """on_fields callback storing a job's preview; runs on LLM client threads."""
+    owner = threading.get_ident()
+
+    def save(fields: Dict[str, Any]) -> None:
+        try:
+            ParseJob.objects.filter(pk=job.pk).update(preview=fields)
+        finally:
+            if threading.get_ident() != owner:
+                # Pooled LLM threads never close connections themselves
+                connections.close_all()
+
+    return save
+
+
+def _job_source(job: ParseJob):
+    """(path or bytes, sha256) of a job's upload, preferring the file path."""
+    try:
+        # Extractors read the stored file in place; it is never loaded whole
+        path = job.upload.path
+    except NotImplementedError:
+        # Storage without local paths
+        with job.upload.open("rb") as f:
+            file_bytes = f.read()
+        return file_bytes, parse_cache.hash_bytes(file_bytes)
+    return path, parse_cache.hash_file(path)
+
+
+def _discard_upload(job: ParseJob) -> None:
+    """Drop the queued copy of a parsed upload; the blob store keeps the original."""
+    try:
+        job.upload.storage.delete(job.upload.name)
+    except OSError as e:
+        logger.warning("Could not remove upload %s: %s", job.upload.name, e)
+    job.upload.name = ""
+
+
+def _run_in_thread(job_id: int) -> None:
+    try:
+        job = claim(job_id)
+        if job is not None:
+            run_job(job)
+    except Exception:
+        logger.exception("Parse worker crashed on job %s", job_id)
+    finally:
+        _finished(job_id)
+        connections.close_all()
+
+
+async def _arun_in_loop(job_id: int) -> None:
+    async with _loop_slots:
+        try:
+            job = await aclaim(job_id)
+            if job is not None:
+                await arun_job(job)
+        except Exception:
+            logger.exception("Parse worker crashed on job %s", job_id)
+        finally:
+            _finished(job_id)
+
+
+def update_queue_metrics() -> None:
+    """Refresh the per-status job gauge (called when metrics are scraped)."""
+    counts = dict(ParseJob.objects.values_list("status").annotate(n=Count("pk")).order_by())
+    for status, _ in ParseJob.STATUS_CHOICES:
+        JOBS_BY_STATUS.set(counts.get(status, 0), status=status)
+
+
+def requeue_stale(older_than: Optional[int] = None) -> int:
+    """
+    Put jobs left running by a crashed worker back on the queue. Jobs that
+    already had RESUME_JOB_MAX_ATTEMPTS tries (an upload that kills or hangs
+    its worker every time) are marked failed instead.
+    """
+    if older_than is None:
+        older_than = getattr(settings, "RESUME_JOB_STALE_AFTER", 600)
+    max_attempts = getattr(settings, "RESUME_JOB_MAX_ATTEMPTS", 3)
+    cutoff = timezone.now() - timedelta(seconds=older_than)
+    stale = ParseJob.objects.filter(status=ParseJob.STATUS_RUNNING, started_at__lt=cutoff)
+
+    given_up = stale.filter(attempts__gte=max_attempts).update(
+        status=ParseJob.STATUS_FAILED,
+        error=f"The parse worker died or hung on this upload {max_attempts} times.",
+        finished_at=timezone.now(),
+    )
+    if given_up:
+        JOBS_FINISHED.inc(given_up, status=ParseJob.STATUS_FAILED)
+        logger.warning("Gave up on %s parse job(s) after %s attempts", given_up, max_attempts)
+    return stale.filter(attempts__lt=max_attempts).update(
+        status=ParseJob.STATUS_QUEUED, started_at=None
+    )
+
+
+def work(poll_interval: float = 1.0, burst: bool = False, stop_event: Optional[threading.Event] = None) -> int:
+    """
+    Process queued jobs until stopped. With burst=True, return as soon as
+    the queue is empty. Returns the number of jobs processed.
+    """
+    processed = 0
+    try:
+        while stop_event is None or not stop_event.is_set():
+            job = claim()
+            if job is None:
+                if burst:
+                    break
+                time.sleep(poll_interval)
+                continue
+            run_job(job)
+            processed += 1
+    finally:
+        connections.close_all()
+    return processed
+
+
+async def awork(concurrency: int = 100, poll_interval: float = 1.0, burst: bool = False,
+                stop_event: Optional[threading.Event] = None) -> int:
+    """work() on an event loop, with up to `concurrency` jobs in flight."""
+    running = set()
+    processed = 0
+    while stop_event is None or not stop_event.is_set():
+        if len(running) >= concurrency:
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            processed += len(done)
+            continue
+
+        job = await aclaim()
+        if job is None:
+            if burst and not running:
+                break
+            if running:
+                done, running = await asyncio.wait(
+                    running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                processed += len(done)
+            else:
+                await asyncio.sleep(poll_interval)
+            continue
+        running.add(asyncio.ensure_future(arun_job(job)))
+
+    if running:
+        await asyncio.wait(running)
+        processed += len(running)
+    return processed
@@ -0,0 +1,200 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from resumes import blobstore, dedup, semantic
+from resumes.matching import index_resumes, pack_match_index
+from resumes.models import Resume
+from resumes.pipeline import build_resume, parse_resume_texts
+from resumes.utils import minhash
+from resumes.utils.bulk_extract import SUPPORTED_EXTENSIONS, extract_file, init_worker
+
+
+def iter_resume_paths(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(SUPPORTED_EXTENSIONS):
+                yield os.path.join(dirpath, filename)
+
+
+def bounded_map(pool, fn, items, window):
+    """
+    pool.map(fn, items) in order, with at most `window` calls submitted
+    ahead of the consumer: extraction can't run far ahead of the slower
+    parse-and-write loop, so memory stays flat and a crash loses little.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-ingest resumes from a directory tree. Files already stored "
+        "(matched by content hash) are skipped, so an interrupted run can "
+        "simply be restarted. Near-duplicates of stored or earlier resumes "
+        "reuse their parse and are linked or merged per RESUME_DEDUP_MODE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                            help="Extraction processes.")
+        parser.add_argument("--llm-concurrency", type=int, default=4,
+                            help="Parallel batched LLM calls per chunk.")
+        parser.add_argument("--chunk-size", type=int, default=100,
+                            help="Resumes parsed and written per batch.")
+
+    def handle(self, *args, **options):
+        root = options["directory"]
+        if not os.path.isdir(root):
+            raise CommandError(f"Not a directory: {root}")
+
+        known = frozenset(
+            Resume.objects.exclude(file_sha256="").values_list("file_sha256", flat=True)
+        )
+        self.seen = set(known)
+        self.stats = {"created": 0, "merged": 0, "skipped": 0, "failed": 0}
+        self.linked = 0
+        self.started = time.perf_counter()
+        chunk_size = max(1, options["chunk_size"])
+        self.llm_concurrency = max(1, options["llm_concurrency"])
+
+        workers = max(1, options["workers"])
+        window = max(2 * chunk_size, 2 * workers)
+
+        chunk = []
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(known,),
+        ) as pool, ThreadPoolExecutor(max_workers=self.llm_concurrency) as llm_pool:
+            for item in bounded_map(pool, extract_file, iter_resume_paths(root), window):
+                if item.error:
+                    self.stats["failed"] += 1
+                    self.stderr.write(f"{item.path}: {item.error}")
+                    continue
+                if item.skipped or item.sha256 in self.seen:
+                    self.stats["skipped"] += 1
+                    continue
+
+                self.seen.add(item.sha256)
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    self._flush(chunk, llm_pool)
+                    chunk = []
+
+            if chunk:
+                self._flush(chunk, llm_pool)
+
+        if self.stats["created"]:
+            pack_match_index()
+        self._report(final=True)
+
+    def _flush(self, chunk, llm_pool):
+        signatures = dedup.signatures([item.text for item in chunk])
+        duplicates = dedup.find_duplicates(signatures)
+        if dedup.mode() == dedup.MERGE:
+            # A near-duplicate resolves to its first copy: nothing to store
+            kept = [i for i, duplicate in enumerate(duplicates) if duplicate is None]
+            self.stats["merged"] += len(chunk) - len(kept)
+            dedup.DUPLICATES.inc(len(chunk) - len(kept), action="merged")
+            chunk = [chunk[i] for i in kept]
+            signatures = [signatures[i] for i in kept]
+            duplicates = [None] * len(kept)
+        reuse = dedup.reuse_parse_enabled()
+
+        # Near-duplicates of stored resumes reuse their parse
+        parsed = {}
+        for item, duplicate in zip(chunk, duplicates):
+            if reuse and duplicate is not None and duplicate.resume_id:
+                data = dedup.parse_of(duplicate.resume_id, item.text)
+                if data is not None:
+                    parsed[item.sha256] = data
+        pending = [
+            item for item, duplicate in zip(chunk, duplicates)
+            if item.sha256 not in parsed
+            and not (reuse and duplicate is not None and duplicate.position is not None)
+        ]
+
+        # Split the rest into one group per LLM worker; each group is packed
+        # into as few batch prompts as its token budget allows.
+        groups = [pending[i::self.llm_concurrency] for i in range(self.llm_concurrency)]
+        for group, results in zip(groups, llm_pool.map(self._parse, groups)):
+            for item, data in zip(group, results):
+                parsed[item.sha256] = data
+
+        # Near-duplicates of earlier files in this chunk reuse their parse
+        for item, duplicate in zip(chunk, duplicates):
+            if item.sha256 not in parsed:
+                first = chunk[duplicate.position]
+                parsed[item.sha256] = dedup.copy_parse(parsed[first.sha256], item.text)
+
+        resumes = [
+            build_resume(
+                parsed[item.sha256], item.sha256, self._store_blobs(item), os.path.basename(item.path),
+                minhash.pack(signature) if signature is not None else b"",
+                duplicate.resume_id if duplicate is not None else None,
+            )
+            for item, signature, duplicate in zip(chunk, signatures, duplicates)
+        ]
+        # Copies of a resume in this chunk are inserted once it has its id
+        copies = {
+            i: duplicate.position for i, duplicate in enumerate(duplicates)
+            if duplicate is not None and duplicate.position is not None
+        }
+
+        with transaction.atomic():
+            Resume.objects.bulk_create(
+                [r for i, r in enumerate(resumes) if i not in copies], batch_size=500
+            )
+            for i, position in copies.items():
+                resumes[i].duplicate_of_id = resumes[position].pk
+            Resume.objects.bulk_create([resumes[i] for i in copies], batch_size=500)
+            # bulk_create sends no post_save, so index for matching here
+            index_resumes(resumes)
+            dedup.index_resumes(resumes)
+        semantic.index_resumes(resumes)
+
+        linked = sum(duplicate is not None for duplicate in duplicates)
+        dedup.DUPLICATES.inc(linked, action="linked")
+        self.stats["created"] += len(resumes)
+        self.linked += linked
+        self._report()
+
+    def _store_blobs(self, item):
+        """Keep the original file and its text; returns the text's blob key."""
+        try:
+            blobstore.put_file(item.path, item.sha256)
+        except (OSError, ValueError) as e:
+            # Unreadable, or changed since it was hashed
+            self.stderr.write(f"{item.path}: original not stored: {e}")
+        return blobstore.put_text(item.text)
+
+    @staticmethod
+    def _parse(group):
+        try:
+            return parse_resume_texts([(item.text, item.sha256) for item in group])
+        finally:
+            connections.close_all()
+
+    def _report(self, final=False):
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.stats.values())
+        rate = total / elapsed if elapsed else 0.0
+        line = (
+            f"{total} files ({self.stats['created']} created, {self.linked} of them "
+            f"near-duplicates, {self.stats['merged']} merged, "
+            f"{self.stats['skipped']} skipped, {self.stats['failed']} failed) "
+            f"in {elapsed:.1f}s — {rate:.1f} files/s"
+        )
+        self.stdout.write(self.style.SUCCESS(line) if final else line)
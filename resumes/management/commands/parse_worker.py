@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from resumes import jobs
+from resumes.utils import metrics
+from resumes.utils.llm_client import update_breaker_metrics
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves this worker's pipeline metrics in the Prometheus text format."""
+
+    def do_GET(self):
+        update_breaker_metrics()
+        body = metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Run background workers that parse queued resume uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=2, help="Number of worker threads.")
+        parser.add_argument("--async", dest="async_jobs", type=int, default=0,
+                            help="Run up to this many jobs at once on one event loop instead of "
+                                 "threads (0: use --threads).")
+        parser.add_argument("--poll", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--burst", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument("--metrics-port", type=int, default=0,
+                            help="Serve this worker's metrics over HTTP on this port (0: off).")
+
+    def handle(self, *args, **options):
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        if options["metrics_port"]:
+            server = ThreadingHTTPServer(("", options["metrics_port"]), MetricsHandler)
+            threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+            self.stdout.write(f"Serving metrics on port {options['metrics_port']}.")
+
+        stop = threading.Event()
+        counts = []
+
+        def run():
+            counts.append(jobs.work(poll_interval=options["poll"], burst=options["burst"], stop_event=stop))
+
+        def run_async():
+            counts.append(asyncio.run(jobs.awork(
+                options["async_jobs"], poll_interval=options["poll"], burst=options["burst"], stop_event=stop,
+            )))
+
+        if options["async_jobs"] > 0:
+            threads = [threading.Thread(target=run_async, name="parse-worker-async", daemon=True)]
+            started = f"Started an async parse worker ({options['async_jobs']} concurrent jobs)."
+        else:
+            threads = [
+                threading.Thread(target=run, name=f"parse-worker-{i}", daemon=True)
+                for i in range(max(1, options["threads"]))
+            ]
+            started = f"Started {len(threads)} parse worker(s)."
+        for t in threads:
+            t.start()
+
+        self.stdout.write(started)
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(timeout=0.5)
+        except KeyboardInterrupt:
+            stop.set()
+            for t in threads:
+                t.join()
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {sum(counts)} job(s)."))
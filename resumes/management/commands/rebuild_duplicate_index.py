@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from resumes import dedup
+from resumes.models import MinHashBand, Resume
+from resumes.utils import minhash
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the near-duplicate index (MinHash signatures and LSH bands) "
+        "from every resume's stored text. With --link, resumes that nearly "
+        "duplicate an earlier one are also linked to it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Resumes indexed per transaction.")
+        parser.add_argument("--link", action="store_true",
+                            help="Set duplicate_of on near-duplicates of earlier resumes, "
+                                 "and clear it on resumes that no longer match one.")
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        # Without --link, existing links are left as they are
+        fields = ["minhash", "duplicate_of"] if options["link"] else ["minhash"]
+        resumes = Resume.objects.order_by("pk").only("id", "text_sha256", "duplicate_of_id")
+
+        # Resumes are indexed in id order, so each is compared with earlier ones only
+        MinHashBand.objects.all().delete()
+
+        total = linked = 0
+        last_pk = 0
+        while True:
+            chunk = list(resumes.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+
+            signatures = dedup.signatures([r.extracted_text() for r in chunk])
+            duplicates = dedup.find_duplicates(signatures) if options["link"] else [None] * len(chunk)
+            for resume, signature, duplicate in zip(chunk, signatures, duplicates):
+                resume.minhash = minhash.pack(signature) if signature is not None else b""
+                if options["link"]:
+                    # Links that no longer hold are cleared, not kept
+                    resume.duplicate_of_id = None
+                    if duplicate is not None:
+                        resume.duplicate_of_id = duplicate.resume_id or chunk[duplicate.position].pk
+                        linked += 1
+
+            with transaction.atomic():
+                Resume.objects.bulk_update(chunk, fields, batch_size=500)
+                dedup.index_resumes(chunk)
+            total += len(chunk)
+            self.stdout.write(f"{total} indexed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt duplicate index for {total} resumes ({linked} linked as near-duplicates)."
+        ))
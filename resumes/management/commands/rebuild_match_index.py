@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from resumes.matching import index_resumes, pack_match_index
+from resumes.models import Resume
+
+
+class Command(BaseCommand):
+    help = "Rebuild the job-matching skill and term index for every resume."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500,
+                            help="Resumes indexed per transaction.")
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options["chunk_size"])
+        resumes = Resume.objects.order_by("pk").only("id", "skills", "experience", "summary")
+
+        total = 0
+        last_pk = 0
+        while True:
+            chunk = list(resumes.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            index_resumes(chunk)
+            total += len(chunk)
+            self.stdout.write(f"{total} indexed")
+
+        pack_match_index()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt match index for {total} resumes."))
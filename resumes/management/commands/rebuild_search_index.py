@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from resumes.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Recreate the full-text search index from the resumes table."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.ensure_schema()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index ({backend.__class__.__name__})."))
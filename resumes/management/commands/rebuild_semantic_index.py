@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from resumes.semantic import get_index, rebuild_semantic_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the semantic search vector index for every resume."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000,
+                            help="Resumes embedded per batch.")
+
+    def handle(self, *args, **options):
+        total = rebuild_semantic_index(
+            chunk_size=max(1, options["chunk_size"]),
+            progress=lambda n: self.stdout.write(f"{n} indexed"),
+        )
+        lists = get_index().read_meta().get("nlist", 0)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt semantic index for {total} resumes ({lists or 'no'} IVF lists)."
+        ))
@@ -0,0 +1,177 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Count
+
+from resumes import blobstore, semantic
+from resumes.matching import index_resumes, pack_match_index
+from resumes.models import Resume
+from resumes.pipeline import PARSED_FIELDS, apply_parse, extract_resume_text, parse_resume_texts
+from resumes.utils.llm_client import get_client
+from resumes.utils.llm_parser import parser_version
+
+
+def resume_text(resume):
+    """Stored text of a resume, extracted from its stored original if needed."""
+    text = resume.extracted_text()
+    if text or not (resume.file_sha256 and blobstore.exists(resume.file_sha256)):
+        return text
+
+    suffix = os.path.splitext(resume.original_name)[1]
+    with blobstore.local_path(resume.file_sha256, suffix) as path:
+        text, resume.text_sha256 = extract_resume_text(
+            path, resume.original_name, resume.file_sha256
+        )
+    return text
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-parse stored resumes whose parser_version is stale (the prompt, "
+        "model list or parser revision changed since they were parsed). Text "
+        "comes from the blob store, results are committed per chunk and the "
+        "position is checkpointed, so an interrupted run continues where it "
+        "stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=50,
+                            help="Resumes parsed and committed per chunk.")
+        parser.add_argument("--concurrency", type=int, default=4,
+                            help="Parallel batched LLM calls per chunk.")
+        parser.add_argument("--rate", type=float, default=0,
+                            help="Max resumes per minute (0: no limit).")
+        parser.add_argument("--limit", type=int, default=0,
+                            help="Stop after this many resumes (0: all stale ones).")
+        parser.add_argument("--checkpoint",
+                            default=os.path.join(settings.MEDIA_ROOT, "reparse-checkpoint.json"),
+                            help="File recording the last committed resume id.")
+        parser.add_argument("--restart", action="store_true",
+                            help="Ignore the checkpoint and start from the first stale resume.")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Report stale resumes per parser version without parsing.")
+
+    def handle(self, *args, **options):
+        version = parser_version()
+        stale = Resume.objects.exclude(parser_version=version)
+
+        if options["dry_run"]:
+            counts = stale.values("parser_version").annotate(n=Count("pk")).order_by("-n")
+            for row in counts:
+                self.stdout.write(f"  {row['parser_version'] or '(none)'}: {row['n']}")
+            self.stdout.write(f"{sum(r['n'] for r in counts)} stale resumes (current version {version}).")
+            return
+
+        if get_client() is None:
+            raise CommandError("GROQ_API_KEY is not set; re-parsing would only repeat the local parse.")
+
+        self.checkpoint = options["checkpoint"]
+        last_pk = 0 if options["restart"] else self._load_checkpoint(version)
+        if last_pk:
+            self.stdout.write(f"Continuing after resume {last_pk} (from {self.checkpoint}).")
+
+        chunk_size = max(1, options["chunk_size"])
+        concurrency = max(1, options["concurrency"])
+        rate, limit = options["rate"], options["limit"]
+        self.stats = {"updated": 0, "failed": 0, "no_text": 0}
+        self.started = time.perf_counter()
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while not limit or processed < limit:
+                size = min(chunk_size, limit - processed) if limit else chunk_size
+                # Keyset chunks over the stale rows, in id order
+                chunk = list(stale.filter(pk__gt=last_pk).order_by("pk")[:size])
+                if not chunk:
+                    break
+
+                groups = [chunk[i::concurrency] for i in range(concurrency)]
+                updated = []
+                for group, results in zip(groups, pool.map(self._parse, groups)):
+                    updated += self._apply(group, results)
+
+                with transaction.atomic():
+                    Resume.objects.bulk_update(
+                        updated, PARSED_FIELDS + ("text_sha256",), batch_size=500
+                    )
+                    # bulk_update sends no post_save, so index for matching here
+                    index_resumes(updated)
+                semantic.index_resumes(updated)
+
+                last_pk = chunk[-1].pk
+                self._save_checkpoint(version, last_pk)
+                processed += len(chunk)
+                self._report(processed)
+
+                if rate:
+                    # Hold the average at --rate resumes per minute
+                    ahead = processed * 60 / rate - (time.perf_counter() - self.started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+
+        if not limit or processed < limit:
+            # Finished: the next run starts over, retrying rows that failed
+            self._clear_checkpoint()
+        if self.stats["updated"]:
+            pack_match_index()
+        self._report(processed, final=True)
+
+    @staticmethod
+    def _parse(group):
+        try:
+            texts = [resume_text(resume) for resume in group]
+            items = [(text, resume.file_sha256) for resume, text in zip(group, texts) if text]
+            parsed = iter(parse_resume_texts(items))
+            return [next(parsed) if text else None for text in texts]
+        finally:
+            connections.close_all()
+
+    def _apply(self, group, results):
+        updated = []
+        for resume, data in zip(group, results):
+            if data is None:
+                self.stats["no_text"] += 1
+            elif data.get("source") != "llm":
+                # LLM unusable: keep the previous parse rather than a local one
+                self.stats["failed"] += 1
+            else:
+                updated.append(apply_parse(resume, data))
+                self.stats["updated"] += 1
+        return updated
+
+    def _load_checkpoint(self, version):
+        try:
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        # A checkpoint from another parser version does not apply
+        return state.get("last_pk", 0) if state.get("version") == version else 0
+
+    def _save_checkpoint(self, version, last_pk):
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint)), exist_ok=True)
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": version, "last_pk": last_pk}, f)
+        os.replace(tmp, self.checkpoint)
+
+    def _clear_checkpoint(self):
+        try:
+            os.remove(self.checkpoint)
+        except FileNotFoundError:
+            pass
+
+    def _report(self, processed, final=False):
+        elapsed = time.perf_counter() - self.started
+        rate = processed / elapsed * 60 if elapsed else 0.0
+        line = (
+            f"{processed} resumes ({self.stats['updated']} updated, "
+            f"{self.stats['failed']} failed, {self.stats['no_text']} without text) "
+            f"in {elapsed:.1f}s — {rate:.0f}/min"
+        )
+        self.stdout.write(self.style.SUCCESS(line) if final else line)
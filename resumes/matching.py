@@ -0,0 +1,466 @@
+# resumes/matching.py
+"""
+Ranking stored resumes against a job description.
+
+Two indexes are kept in the database and updated whenever a resume is
+saved (see resumes/signals.py) or bulk-ingested:
+
+- skills: Skill / ResumeSkill, the canonical skills of Resume.skills
+  (see resumes/skills.py)
+- terms: MatchTerm / MatchPosting, term frequencies over experience and
+  summary, scored with BM25 at query time
+
+pack_match_index() precomputes each term's and skill's postings into a
+compact array stored on its row. A query reads only the packed arrays of
+the terms and skills in the job description and scores them with NumPy;
+resumes indexed since the last pack are scored from their posting rows
+and override the packed data. Once enough resumes have changed, a repack
+runs in the background. The resumes table is never scanned.
+"""
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from .models import MatchDocument, MatchPosting, MatchTerm, Resume, ResumeSkill, Skill
+from .skills import canonical_names, resume_skill_names
+from .utils.local_extractor import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Resume fields the indexes are built from
+INDEXED_FIELDS = frozenset(("skills", "experience", "summary"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# A matched skill counts this many times as much as a term of the same idf
+SKILL_BOOST = getattr(settings, "RESUME_MATCH_SKILL_BOOST", 2.0)
+
+# Terms in more than this share of resumes carry almost no signal; skipping
+# them keeps the postings read per query small.
+MAX_DF_RATIO = getattr(settings, "RESUME_MATCH_MAX_DF_RATIO", 0.5)
+MAX_QUERY_TERMS = 64
+MAX_SKILL_WORDS = 4
+
+# Unpacked resumes (indexed since the last pack) before a repack is started
+PACK_AFTER = getattr(settings, "RESUME_MATCH_PACK_AFTER", 1000)
+# Past this many unpacked resumes, rank with one SQL aggregate instead
+MAX_DELTA = 20000
+
+# Keeps IN (...) lists well under database parameter limits
+LOOKUP_BATCH = 500
+
+STATS_TTL = 60
+
+STOP_WORDS = frozenset("""
+a about above after all also an and any are as at be been being below between
+both but by can could did do does doing during each etc few for from further
+had has have having he her here his how i if in into is it its itself just
+like may me more most must my no nor not of off on once only or other our
+out over own per same she should so some such than that the their them then
+there these they this those through to too under until up us very via was we
+well were what when where which while who whom why will with within without
+would you your
+years year experience work worked working role team looking candidate
+responsibilities requirements required preferred strong ability plus using
+""".split())
+
+_stats: Tuple[float, int, float] = (0.0, 0, 0.0)   # (fetched at, N, avgdl)
+_pack_lock = threading.Lock()
+
+
+class Match(NamedTuple):
+    resume_id: int
+    score: float
+    matched_skills: List[str]
+
+
+def text_terms(text: str) -> List[str]:
+    return [
+        t for t in tokenize(text)
+        if 1 < len(t) <= 64 and t not in STOP_WORDS and not t.isdigit()
+    ]
+
+
+def _batches(values: Sequence, size: int = LOOKUP_BATCH):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _lookup(model, field: str, values: Iterable[str], *columns: str) -> Dict[str, tuple]:
+    """{value: (id, *columns)} for the values that already exist."""
+    found: Dict[str, tuple] = {}
+    for batch in _batches(list(set(values))):
+        rows = model.objects.filter(**{f"{field}__in": batch}).values_list(field, "id", *columns)
+        found.update((row[0], row[1:]) for row in rows)
+    return found
+
+
+def _get_or_create_ids(model, field: str, values: Iterable[str]) -> Dict[str, int]:
+    values = set(values)
+    found = {v: row[0] for v, row in _lookup(model, field, values).items()}
+    missing = values - found.keys()
+    if missing:
+        model.objects.bulk_create(
+            [model(**{field: v}) for v in missing], ignore_conflicts=True, batch_size=LOOKUP_BATCH
+        )
+        found.update((v, row[0]) for v, row in _lookup(model, field, missing).items())
+    return found
+
+
+# -----------------------------
+# Indexing
+# -----------------------------
+def index_resumes(resumes: Iterable[Resume]) -> None:
+    """(Re)build the skill and term postings of the given saved resumes."""
+    resumes = [r for r in resumes if r.pk]
+    if not resumes:
+        return
+
+    skills = resume_skill_names(resumes)
+    terms = {r.pk: Counter(text_terms(f"{r.experience}\n{r.summary}")) for r in resumes}
+
+    skill_ids = _get_or_create_ids(Skill, "name", chain.from_iterable(skills.values()))
+    term_ids = _get_or_create_ids(MatchTerm, "term", chain.from_iterable(terms.values()))
+
+    links, postings, documents = [], [], []
+    indexed_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    for pk in skills:
+        links.extend((pk, skill_ids[n]) for n in skills[pk])
+        length = sum(terms[pk].values())
+        postings.extend((pk, term_ids[t], tf, length) for t, tf in terms[pk].items())
+        documents.append((pk, length, indexed_at, False))
+
+    # Plain executemany: building model instances for bulk_create costs
+    # several times more than the inserts themselves.
+    pks = list(skills)
+    with transaction.atomic(), connection.cursor() as cursor:
+        for batch in _batches(pks):
+            ResumeSkill.objects.filter(resume_id__in=batch).delete()
+            MatchPosting.objects.filter(resume_id__in=batch).delete()
+            MatchDocument.objects.filter(resume_id__in=batch).delete()
+        cursor.executemany(
+            f"INSERT INTO {ResumeSkill._meta.db_table} (resume_id, skill_id) VALUES (%s, %s)",
+            links,
+        )
+        cursor.executemany(
+            f"INSERT INTO {MatchPosting._meta.db_table} (resume_id, term_id, tf, doc_length) "
+            f"VALUES (%s, %s, %s, %s)",
+            postings,
+        )
+        cursor.executemany(
+            f"INSERT INTO {MatchDocument._meta.db_table} (resume_id, length, indexed_at, packed) "
+            f"VALUES (%s, %s, %s, %s)",
+            documents,
+        )
+
+
+# Packed layouts: skills are int64 resume ids; terms are int64 resume ids,
+# then uint16 tf, then uint32 document lengths.
+SKILL_ROW_SIZE = 8
+TERM_ROW_SIZE = 14
+
+
+def _pack_terms(ids: np.ndarray, tf: np.ndarray, doc_length: np.ndarray) -> bytes:
+    return (
+        ids.astype("<i8").tobytes()
+        + np.minimum(tf, 0xFFFF).astype("<u2").tobytes()
+        + doc_length.astype("<u4").tobytes()
+    )
+
+
+def _unpack_terms(blob: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = len(blob) // TERM_ROW_SIZE
+    ids = np.frombuffer(blob, dtype="<i8", count=n)
+    tf = np.frombuffer(blob, dtype="<u2", count=n, offset=8 * n)
+    doc_length = np.frombuffer(blob, dtype="<u4", count=n, offset=10 * n)
+    return ids, tf, doc_length
+
+
+def _pack_ids(ids: np.ndarray) -> bytes:
+    return ids.astype("<i8").tobytes()
+
+
+def _unpack_ids(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype="<i8")
+
+
+def _pack_vocabulary(model, postings_table: str, key: str, columns: Sequence[str],
+                     pack, packed_at) -> None:
+    """
+    Pack the postings of every row of `model` (terms or skills). Postings
+    are read a key range at a time so no long read blocks writers.
+    """
+    keys = list(model.objects.order_by("pk").values_list("pk", flat=True))
+    sql = (
+        f"SELECT {key}, {', '.join(columns)} FROM {postings_table} "
+        f"WHERE {key} >= %s AND {key} <= %s ORDER BY {key}, resume_id"
+    )
+    for batch in _batches(keys):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [batch[0], batch[-1]])
+            rows = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 1 + len(columns))
+
+        packed = dict.fromkeys(batch, b"")
+        bounds = [0, *(np.flatnonzero(np.diff(rows[:, 0])) + 1).tolist(), len(rows)]
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start < stop:
+                packed[int(rows[start, 0])] = pack(rows[start:stop, 1:])
+
+        model.objects.bulk_update(
+            [model(pk=pk, packed=blob, packed_at=packed_at) for pk, blob in packed.items()],
+            ["packed", "packed_at"],
+        )
+
+
+def pack_match_index() -> None:
+    """Precompute the packed postings of every term and skill."""
+    started = time.perf_counter()
+    packed_at = timezone.now()
+    table = MatchDocument._meta.db_table
+
+    # Resumes this pack covers, with the indexed_at each had when it started
+    pending = list(MatchDocument.objects.filter(packed=False).values_list("resume_id", "indexed_at"))
+
+    _pack_vocabulary(
+        MatchTerm, MatchPosting._meta.db_table, "term_id", ("resume_id", "tf", "doc_length"),
+        lambda rows: _pack_terms(rows[:, 0], rows[:, 1], rows[:, 2]), packed_at,
+    )
+    _pack_vocabulary(
+        Skill, ResumeSkill._meta.db_table, "skill_id", ("resume_id",),
+        lambda rows: _pack_ids(rows[:, 0]), packed_at,
+    )
+
+    # A resume re-indexed meanwhile has a new indexed_at, stays unpacked and
+    # is scored from its posting rows until the next pack.
+    adapt = connection.ops.adapt_datetimefield_value
+    for batch in _batches(pending, 5000):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET packed = %s WHERE resume_id = %s AND indexed_at = %s",
+                [(True, pk, adapt(indexed_at)) for pk, indexed_at in batch],
+            )
+
+    logger.info("Packed match index for %d new resumes in %.1fs",
+                len(pending), time.perf_counter() - started)
+
+
+def _pack_in_background() -> None:
+    if not _pack_lock.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            pack_match_index()
+        except Exception:
+            logger.exception("Packing the match index failed")
+        finally:
+            connection.close()
+            _pack_lock.release()
+
+    threading.Thread(target=run, name="match-pack", daemon=True).start()
+
+
+# -----------------------------
+# Querying
+# -----------------------------
+def _corpus_stats() -> Tuple[int, float]:
+    """(indexed resumes, average document length), cached briefly."""
+    global _stats
+    fetched_at, count, avgdl = _stats
+    if time.monotonic() - fetched_at > STATS_TTL:
+        agg = MatchDocument.objects.aggregate(n=Count("pk"), avg=Avg("length"))
+        count, avgdl = agg["n"], float(agg["avg"] or 0.0)
+        _stats = (time.monotonic(), count, avgdl)
+    return count, avgdl
+
+
+def _idf(df: int, n: int) -> float:
+    return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+
+def _bm25(tf, doc_length, idf: float, avgdl: float):
+    """Works on scalars and on NumPy arrays."""
+    return idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * doc_length / avgdl))
+
+
+def _doc_freqs(model, field: str, ids: Iterable[int]) -> Dict[int, int]:
+    freqs: Dict[int, int] = {}
+    for batch in _batches(list(ids)):
+        rows = (
+            model.objects.filter(**{f"{field}__in": batch})
+            .values_list(field).annotate(n=Count("pk")).order_by()
+        )
+        freqs.update(rows)
+    return freqs
+
+
+def job_skills(tokens: List[str]) -> List[str]:
+    """Every 1-4 word phrase of a tokenized job description."""
+    return list({
+        " ".join(tokens[i:i + n])
+        for n in range(1, MAX_SKILL_WORDS + 1)
+        for i in range(len(tokens) - n + 1)
+    })
+
+
+def _weights(rows: Dict[int, tuple], model, field: str, n: int, row_size: int,
+             boost: float = 1.0, max_df: Optional[float] = None,
+             max_count: Optional[int] = None) -> Dict[int, float]:
+    """idf weight per id; rows are {id: (packed, packed_at)}."""
+    dfs = {pk: len(packed) // row_size for pk, (packed, packed_at) in rows.items() if packed_at}
+    # Created since the last pack: count their postings directly
+    dfs.update(_doc_freqs(model, field, [pk for pk in rows if pk not in dfs]))
+    useful = sorted(
+        (df, pk) for pk, df in dfs.items() if df and (max_df is None or df <= max_df)
+    )[:max_count]
+    return {pk: boost * _idf(df, n) for df, pk in useful}
+
+
+def _case(column: str, weights: Dict[int, float]) -> Tuple[str, list]:
+    sql = " ".join("WHEN %s THEN %s" for _ in weights)
+    params = list(chain.from_iterable(weights.items()))
+    return f"CASE {column} {sql} ELSE 0 END", params
+
+
+def _placeholders(values) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
+def _rank_sql(skill_weights: Dict[int, float], term_weights: Dict[int, float],
+              avgdl: float, limit: int) -> List[Tuple[int, float]]:
+    """Rank straight from the posting tables; used when the pack is far behind."""
+    parts, params = [], []
+    if skill_weights:
+        case, case_params = _case("skill_id", skill_weights)
+        parts.append(
+            f"SELECT resume_id, {case} AS score FROM {ResumeSkill._meta.db_table} "
+            f"WHERE skill_id IN ({_placeholders(skill_weights)})"
+        )
+        params += case_params + list(skill_weights)
+    if term_weights:
+        case, case_params = _case("term_id", term_weights)
+        parts.append(
+            f"SELECT resume_id, ({case}) * tf * %s "
+            f"/ (tf + %s * (%s + %s * doc_length / %s)) AS score "
+            f"FROM {MatchPosting._meta.db_table} "
+            f"WHERE term_id IN ({_placeholders(term_weights)})"
+        )
+        params += case_params + [
+            BM25_K1 + 1, BM25_K1, 1 - BM25_B, BM25_B, avgdl,
+        ] + list(term_weights)
+
+    sql = (
+        "SELECT resume_id, SUM(score) AS total FROM ("
+        + " UNION ALL ".join(parts)
+        + ") hits GROUP BY resume_id ORDER BY total DESC, resume_id DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [limit])
+        return cursor.fetchall()
+
+
+def _rank_packed(skills: Dict[int, tuple], terms: Dict[int, tuple],
+                 skill_weights: Dict[int, float], term_weights: Dict[int, float],
+                 delta: Dict[int, int], avgdl: float, limit: int) -> List[Tuple[int, float]]:
+    """Score the packed arrays, then let the unpacked resumes override them."""
+    ids_parts, score_parts = [], []
+    for pk, weight in term_weights.items():
+        ids, tf, doc_length = _unpack_terms(terms[pk][0])
+        ids_parts.append(ids)
+        score_parts.append(_bm25(tf.astype(np.float64), doc_length, weight, avgdl))
+    for pk, weight in skill_weights.items():
+        ids = _unpack_ids(skills[pk][0])
+        ids_parts.append(ids)
+        score_parts.append(np.full(len(ids), weight))
+
+    candidates: Dict[int, float] = {}
+    if ids_parts:
+        # Resume ids are dense enough to index a score array directly
+        scores = np.bincount(np.concatenate(ids_parts), weights=np.concatenate(score_parts))
+        stale = np.fromiter(delta, dtype=np.int64, count=len(delta))
+        scores[stale[stale < len(scores)]] = 0.0
+
+        k = min(limit, int(np.count_nonzero(scores)))
+        if k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates = {int(pk): float(scores[pk]) for pk in top}
+
+    delta_scores: Dict[int, float] = defaultdict(float)
+    for batch in _batches(list(delta)):
+        if term_weights:
+            rows = MatchPosting.objects.filter(
+                resume_id__in=batch, term_id__in=list(term_weights)
+            ).values_list("resume_id", "term_id", "tf")
+            for pk, term_id, tf in rows:
+                delta_scores[pk] += _bm25(tf, delta[pk], term_weights[term_id], avgdl)
+        if skill_weights:
+            rows = ResumeSkill.objects.filter(
+                resume_id__in=batch, skill_id__in=list(skill_weights)
+            ).values_list("resume_id", "skill_id")
+            for pk, skill_id in rows:
+                delta_scores[pk] += skill_weights[skill_id]
+
+    candidates.update(delta_scores)
+    return sorted(candidates.items(), key=lambda item: (-item[1], -item[0]))
+
+
+def match_resumes(job_description: str, limit: int = 20) -> List[Match]:
+    """The `limit` best-matching resumes for a job description, best first."""
+    n, avgdl = _corpus_stats()
+    tokens = tokenize(job_description or "")
+    if not n or not tokens:
+        return []
+    avgdl = max(avgdl, 1.0)
+
+    mentioned = canonical_names(job_skills(tokens)).values()
+    skills = {pk: rest for pk, *rest in _lookup(
+        Skill, "name", mentioned, "packed", "packed_at").values()}
+    terms = {pk: rest for pk, *rest in _lookup(
+        MatchTerm, "term", text_terms(job_description), "packed", "packed_at").values()}
+
+    skill_weights = _weights(skills, ResumeSkill, "skill_id", n, SKILL_ROW_SIZE,
+                             boost=SKILL_BOOST)
+    term_weights = _weights(terms, MatchPosting, "term_id", n, TERM_ROW_SIZE,
+                            max_df=MAX_DF_RATIO * n, max_count=MAX_QUERY_TERMS)
+    if not skill_weights and not term_weights:
+        return []
+
+    delta = dict(
+        MatchDocument.objects.filter(packed=False).values_list("resume_id", "length")[:MAX_DELTA + 1]
+    )
+
+    if len(delta) > PACK_AFTER:
+        _pack_in_background()
+
+    # Extra candidates cover deleted resumes still in the packed arrays
+    wanted = limit * 2
+    if len(delta) > MAX_DELTA:
+        ranked = _rank_sql(skill_weights, term_weights, avgdl, wanted)
+    else:
+        ranked = _rank_packed(skills, terms, skill_weights, term_weights, delta, avgdl, wanted)
+
+    alive = set(MatchDocument.objects.filter(
+        resume_id__in=[pk for pk, _ in ranked]
+    ).values_list("resume_id", flat=True))
+    ranked = [(pk, score) for pk, score in ranked if pk in alive][:limit]
+
+    matched: Dict[int, List[str]] = {pk: [] for pk, _ in ranked}
+    if matched and skill_weights:
+        rows = ResumeSkill.objects.filter(
+            resume_id__in=list(matched), skill_id__in=list(skill_weights)
+        ).values_list("resume_id", "skill__name")
+        for pk, name in rows:
+            matched[pk].append(name)
+
+    return [Match(pk, round(score, 3), sorted(matched[pk])) for pk, score in ranked]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0005_parsejob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
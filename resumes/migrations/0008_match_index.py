@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0007_resume_created_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchDocument',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='match_document', serialize=False, to='resumes.resume')),
+                ('length', models.PositiveIntegerField()),
+                ('indexed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('packed', models.BooleanField(db_index=True, default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MatchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True)),
+                ('packed', models.BinaryField(default=b'')),
+                ('packed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('packed', models.BinaryField(default=b'')),
+                ('packed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MatchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tf', models.PositiveIntegerField()),
+                ('doc_length', models.PositiveIntegerField()),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='match_postings', to='resumes.resume')),
+                ('term', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='resumes.matchterm')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('term', 'resume'), name='unique_match_posting')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='resumes.resume')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='resume_links', to='resumes.skill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'resume'), name='unique_resume_skill')],
+            },
+        ),
+    ]
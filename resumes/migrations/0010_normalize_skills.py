@@ -0,0 +1,98 @@
+import re
+
+from django.db import migrations
+
+# Frozen copy of local_extractor.TOKEN_RE as of this migration, so later
+# changes to the tokenizer don't change what it does on a fresh database
+TOKEN_RE = re.compile(r"\.?[a-z0-9](?:[a-z0-9+#./\-]*[a-z0-9+#])?")
+
+# canonical skill: spelling variants
+ALIASES = {
+    "javascript": ("js", "java script", "ecmascript", "es6"),
+    "typescript": ("ts",),
+    "node.js": ("node", "nodejs", "node js"),
+    "react": ("reactjs", "react.js", "react js"),
+    "vue.js": ("vue", "vuejs"),
+    "angular": ("angularjs", "angular.js"),
+    "next.js": ("nextjs",),
+    "express.js": ("expressjs",),
+    "ruby on rails": ("rails", "ror"),
+    "spring boot": ("springboot",),
+    ".net": ("dotnet", "dot net"),
+    "c#": ("c sharp", "csharp"),
+    "c++": ("cpp",),
+    "golang": ("go lang",),
+    "objective-c": ("objective c", "objc"),
+    "html": ("html5",),
+    "css": ("css3",),
+    "postgresql": ("postgres", "postgre sql", "psql"),
+    "mongodb": ("mongo",),
+    "mysql": ("my sql",),
+    "sql server": ("mssql", "ms sql", "microsoft sql server"),
+    "kubernetes": ("k8s",),
+    "aws": ("amazon web services",),
+    "gcp": ("google cloud", "google cloud platform"),
+    "azure": ("microsoft azure",),
+    "ci/cd": ("cicd", "ci cd"),
+    "rest api": ("rest apis", "restful api", "restful apis"),
+    "machine learning": ("ml",),
+    "artificial intelligence": ("ai",),
+    "natural language processing": ("nlp",),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "power bi": ("powerbi",),
+    "excel": ("ms excel", "microsoft excel"),
+}
+
+
+def normalize(skill):
+    return " ".join(TOKEN_RE.findall(skill.lower()))
+
+
+def normalize_skills(apps, schema_editor):
+    Resume = apps.get_model("resumes", "Resume")
+    Skill = apps.get_model("resumes", "Skill")
+    SkillAlias = apps.get_model("resumes", "SkillAlias")
+    ResumeSkill = apps.get_model("resumes", "ResumeSkill")
+    MatchDocument = apps.get_model("resumes", "MatchDocument")
+
+    canonical = {}
+    for name, aliases in ALIASES.items():
+        skill, _ = Skill.objects.get_or_create(name=normalize(name))
+        for alias in aliases:
+            alias = normalize(alias)
+            SkillAlias.objects.get_or_create(alias=alias, defaults={"skill": skill})
+            canonical[alias] = skill.name
+
+    # Rebuild every resume's links from the comma-joined column
+    ResumeSkill.objects.all().delete()
+    skill_ids = dict(Skill.objects.values_list("name", "id"))
+    links = []
+    for resume in Resume.objects.only("id", "skills").iterator(chunk_size=2000):
+        names = (normalize(s) for s in resume.skills.split(","))
+        for name in dict.fromkeys(canonical.get(n, n) for n in names if n and len(n) <= 100):
+            if name not in skill_ids:
+                skill_ids[name] = Skill.objects.create(name=name).id
+            links.append(ResumeSkill(resume_id=resume.id, skill_id=skill_ids[name]))
+        if len(links) >= 5000:
+            ResumeSkill.objects.bulk_create(links)
+            links = []
+    ResumeSkill.objects.bulk_create(links)
+
+    # Alias spellings are no longer skills of their own
+    Skill.objects.filter(name__in=list(canonical)).delete()
+
+    # Packed skill postings are stale: rank from the link rows until the
+    # next pack_match_index() (started automatically by the next query)
+    Skill.objects.update(packed=b"", packed_at=None)
+    MatchDocument.objects.update(packed=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resumes", "0009_skillalias"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_skills, migrations.RunPython.noop),
+    ]
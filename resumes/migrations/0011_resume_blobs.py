@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0010_normalize_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='text_sha256',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0011_resume_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='parser_version',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
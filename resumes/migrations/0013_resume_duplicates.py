@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0012_resume_parser_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='resumes.resume'),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='minhash',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+        migrations.CreateModel(
+            name='MinHashBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField()),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='minhash_bands', to='resumes.resume')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('key', 'resume'), name='unique_minhash_band')],
+            },
+        ),
+    ]
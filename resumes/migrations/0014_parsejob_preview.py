@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0013_resume_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsejob',
+            name='preview',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
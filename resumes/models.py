@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+from . import blobstore
 
 class Resume(models.Model):
     name = models.CharField(max_length=255, blank=True)
@@ -13,10 +16,201 @@ class Resume(models.Model):
     ats_score = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # sha256 of the uploaded file, used to skip re-ingesting the same file.
+    # The original is kept in the blob store under this key (resumes/blobstore.py).
+    file_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    original_name = models.CharField(max_length=255, blank=True)
+    # Blob store key of the extracted text, so a re-parse skips extraction/OCR
+    text_sha256 = models.CharField(max_length=64, blank=True)
+    # llm_parser.parser_version() of the parse that produced the fields above
+    # ("local" for the local fallback); `manage.py reparse` updates stale rows
+    parser_version = models.CharField(max_length=32, blank=True, db_index=True)
+
+    # MinHash signature of the extracted text (resumes/utils/minhash.py) and
+    # the earlier resume it is a near-duplicate of (resumes/dedup.py)
+    minhash = models.BinaryField(default=b"", blank=True)
+    duplicate_of = models.ForeignKey(
+        "self", null=True, blank=True, on_delete=models.SET_NULL, related_name="duplicates"
+    )
+
+    # Columns rendered by the resume list page
+    LIST_FIELDS = ("id", "name", "email", "mobile", "skills", "ats_score", "created_at")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="resume_created_idx"),
+        ]
+
     def skill_list(self):
         if self.skills:
             return [s.strip() for s in self.skills.split(",") if s.strip()]
         return []
 
+    def extracted_text(self):
+        """The stored extracted text, or "" if none was kept."""
+        if not self.text_sha256:
+            return ""
+        try:
+            return blobstore.read_text(self.text_sha256)
+        except FileNotFoundError:
+            return ""
+
     def __str__(self):
         return self.name or "Unnamed Resume"
+
+
+class Skill(models.Model):
+    # Normalized form, see matching.normalize_skill()
+    name = models.CharField(max_length=100, unique=True)
+
+    # Resume ids as of packed_at, precomputed for ranking (matching.pack_match_index)
+    packed = models.BinaryField(default=b"")
+    packed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    # Normalized variant spelling, e.g. "k8s" for "kubernetes"
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+
+    class Meta:
+        verbose_name_plural = "skill aliases"
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill_id}"
+
+
+class ResumeSkill(models.Model):
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name="skill_links")
+    # Indexed by the (skill, resume) constraint below
+    skill = models.ForeignKey(
+        Skill, on_delete=models.CASCADE, related_name="resume_links", db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["skill", "resume"], name="unique_resume_skill"),
+        ]
+
+    def __str__(self):
+        return f"{self.resume_id}: {self.skill_id}"
+
+
+class MatchTerm(models.Model):
+    term = models.CharField(max_length=64, unique=True)
+
+    # Postings as of packed_at, precomputed for ranking (matching.pack_match_index)
+    packed = models.BinaryField(default=b"")
+    packed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.term
+
+
+class MatchPosting(models.Model):
+    """How often a term occurs in one resume's experience and summary."""
+
+    # Indexed by the (term, resume) constraint below
+    term = models.ForeignKey(
+        MatchTerm, on_delete=models.CASCADE, related_name="postings", db_index=False
+    )
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name="match_postings")
+    tf = models.PositiveIntegerField()
+    # Copy of MatchDocument.length so ranking needs no join
+    doc_length = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["term", "resume"], name="unique_match_posting"),
+        ]
+
+    def __str__(self):
+        return f"{self.term_id} in {self.resume_id} ({self.tf})"
+
+
+class MatchDocument(models.Model):
+    resume = models.OneToOneField(
+        Resume, on_delete=models.CASCADE, primary_key=True, related_name="match_document"
+    )
+    length = models.PositiveIntegerField()
+    indexed_at = models.DateTimeField(default=timezone.now)
+    # False until pack_match_index() has folded this resume's postings in
+    packed = models.BooleanField(default=False, db_index=True)
+
+    def __str__(self):
+        return f"{self.resume_id} ({self.length} terms)"
+
+
+class MinHashBand(models.Model):
+    """One LSH band key of a resume's MinHash signature (resumes/dedup.py)."""
+
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name="minhash_bands")
+    key = models.BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["key", "resume"], name="unique_minhash_band"),
+        ]
+
+    def __str__(self):
+        return f"{self.resume_id}: {self.key}"
+
+
+class ParseCacheEntry(models.Model):
+    file_hash = models.CharField(max_length=64, db_index=True)
+    text_hash = models.CharField(max_length=64, db_index=True)
+    version = models.CharField(max_length=32)
+    data = models.JSONField(default=dict)
+
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["file_hash", "version"], name="unique_parse_cache_file_version"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.file_hash[:12]} ({self.version})"
+
+
+class ParseJob(models.Model):
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    upload = models.FileField(upload_to="uploads/%Y/%m/")
+    original_name = models.CharField(max_length=255, blank=True)
+
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED, db_index=True
+    )
+    resume = models.ForeignKey(Resume, null=True, blank=True, on_delete=models.SET_NULL)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Fields of a streamed LLM parse known before the rest of it has arrived
+    preview = models.JSONField(default=dict, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"Job {self.pk} ({self.status})"
@@ -0,0 +1,72 @@
+# resumes/pagination.py
+"""
+Keyset (cursor) pagination on (created_at, id), newest first.
+
+Unlike OFFSET pagination, each page is a single index range scan, so the
+cost of a page does not grow with the number of stored resumes.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.db.models import Q
+
+
+class KeysetPage(NamedTuple):
+    items: List
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+def encode_cursor(obj) -> str:
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Decode a cursor; malformed cursors are treated as absent."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, pk = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeError, binascii.Error):
+        return None
+
+
+def keyset_page(queryset, after: Optional[str] = None, before: Optional[str] = None,
+                page_size: int = 25) -> KeysetPage:
+    """
+    One page of `queryset` ordered by (-created_at, -id). Pass `after` to get
+    the next (older) page and `before` to get the previous (newer) one.
+    """
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before)
+
+    if before_key and not after_key:
+        created_at, pk = before_key
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            .order_by("created_at", "id")[:page_size + 1]
+        )
+        has_newer = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+        has_older = True
+    else:
+        if after_key:
+            created_at, pk = after_key
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        rows = list(queryset.order_by("-created_at", "-id")[:page_size + 1])
+        has_older = len(rows) > page_size
+        items = rows[:page_size]
+        has_newer = after_key is not None
+
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(items[-1]) if items and has_older else None,
+        prev_cursor=encode_cursor(items[0]) if items and has_newer else None,
+    )
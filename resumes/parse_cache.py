@@ -0,0 +1,161 @@
+# resumes/parse_cache.py
+"""
+Persistent cache of LLM parse results keyed by upload content.
+
+Entries are looked up by the sha256 of the uploaded bytes first (skips
+extraction and the LLM call) and then by the hash of the normalized text
+(skips only the LLM call). Every entry is stamped with the parser version,
+so changing the prompt or GROQ_MODELS invalidates old results.
+"""
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ParseCacheEntry
+from .utils.llm_parser import parser_version
+
+logger = logging.getLogger(__name__)
+
+# store() runs evict() on its first call in a process and then every this
+# many calls, so the size bound may be overshot by up to this many per process
+EVICT_EVERY = 100
+
+_stats_lock = threading.Lock()
+_stats = {
+    "file_hits": 0,
+    "text_hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+}
+
+
+def _record(counter: str, amount: int = 1) -> int:
+    with _stats_lock:
+        _stats[counter] += amount
+        return _stats[counter]
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss counters for this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "RESUME_PARSE_CACHE_ENABLED", True)
+
+
+def hash_bytes(b: bytes) -> str:
+    return hashlib.sha256(b).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def hash_text(text: str) -> str:
+    return hash_bytes(normalize_text(text).encode("utf-8"))
+
+
+def _expiry_cutoff():
+    ttl = getattr(settings, "RESUME_PARSE_CACHE_TTL", 30 * 24 * 3600)
+    return timezone.now() - timedelta(seconds=ttl) if ttl else None
+
+
+def _fresh_entries():
+    qs = ParseCacheEntry.objects.filter(version=parser_version())
+    cutoff = _expiry_cutoff()
+    if cutoff:
+        qs = qs.filter(created_at__gte=cutoff)
+    return qs
+
+
+def lookup(file_hash: str = "", text_hash: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Return a cached parse for the given file hash or text hash, or None.
+    A hit refreshes the entry's LRU timestamp.
+    """
+    if not is_enabled():
+        return None
+
+    if file_hash:
+        entry = _fresh_entries().filter(file_hash=file_hash).only("pk", "data").first()
+        counter = "file_hits"
+    else:
+        entry = (
+            _fresh_entries()
+            .filter(text_hash=text_hash)
+            .order_by("-last_used_at")
+            .only("pk", "data")
+            .first()
+        )
+        counter = "text_hits"
+
+    if entry is None:
+        if not file_hash:
+            _record("misses")
+        return None
+
+    ParseCacheEntry.objects.filter(pk=entry.pk).update(
+        last_used_at=timezone.now(), hits=F("hits") + 1
+    )
+    _record(counter)
+    return entry.data
+
+
+def store(file_hash: str, text_hash: str, data: Dict[str, Any]) -> None:
+    """Cache an LLM parse result. Local fallback results are never cached."""
+    if not is_enabled() or data.get("source") != "llm":
+        return
+
+    now = timezone.now()
+    ParseCacheEntry.objects.update_or_create(
+        file_hash=file_hash,
+        version=parser_version(),
+        defaults={
+            "text_hash": text_hash,
+            "data": data,
+            # A re-stored result expires from now, not from the first store
+            "created_at": now,
+            "last_used_at": now,
+        },
+    )
+    if _record("stores") % EVICT_EVERY == 1:
+        evict()
+
+
+def evict() -> int:
+    """Drop expired and stale-version entries, then trim to the size bound (LRU)."""
+    stale = ~Q(version=parser_version())
+    cutoff = _expiry_cutoff()
+    if cutoff:
+        stale |= Q(created_at__lt=cutoff)
+    removed, _ = ParseCacheEntry.objects.filter(stale).delete()
+
+    max_entries = getattr(settings, "RESUME_PARSE_CACHE_MAX_ENTRIES", 5000)
+    overflow = ParseCacheEntry.objects.count() - max_entries
+    if overflow > 0:
+        oldest = ParseCacheEntry.objects.order_by("last_used_at").values_list("pk", flat=True)[:overflow]
+        trimmed, _ = ParseCacheEntry.objects.filter(pk__in=list(oldest)).delete()
+        removed += trimmed
+
+    if removed:
+        _record("evictions", removed)
+        logger.info("Parse cache evicted %s entries", removed)
+    return removed
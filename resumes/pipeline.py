@@ -0,0 +1,344 @@
+# resumes/pipeline.py
+"""
+Upload → text → parsed data → Resume row.
+
+Shared by the upload view and anything else that turns a resume file into
+a stored Resume. The original file and its extracted text are kept in the
+blob store, so a file is only ever extracted (and OCR'd) once. A text that
+nearly duplicates a stored resume reuses its parse instead of calling the
+LLM, and is linked to it or merged into it (see resumes/dedup.py).
+
+The a-prefixed functions are the same steps for event-loop callers: file
+work (hashing, extraction, OCR) runs on a bounded thread pool and the LLM
+call is awaited, so waiting on Groq holds no thread.
+"""
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import blobstore, dedup, parse_cache
+from .models import Resume
+from .utils import metrics
+from .utils.ats import calculate_ats_score
+from .utils.llm_parser import (
+    PARSES,
+    FieldsCallback,
+    aparse_resume_with_llm,
+    extract_text_from_bytes,
+    parse_resume_with_llm,
+    parse_resumes_with_llm,
+    result_version,
+)
+
+
+def _hash_source(source: Union[bytes, str]) -> str:
+    return parse_cache.hash_file(source) if isinstance(source, str) else parse_cache.hash_bytes(source)
+
+
+class ParsedFile(NamedTuple):
+    data: Dict[str, Any]
+    file_sha256: str
+    # Blob store key of the extracted text ("" if none is stored)
+    text_sha256: str
+    # Packed MinHash signature of the text, and the stored resume it nearly duplicates
+    minhash: bytes = b""
+    duplicate: Optional[dedup.Duplicate] = None
+
+
+def parse_resume_file(
+    source: Union[bytes, str], filename: str, file_hash: Optional[str] = None,
+    on_fields: Optional[FieldsCallback] = None,
+) -> Optional[ParsedFile]:
+    """
+    Store and parse a resume file (a path, or its raw bytes), reusing a
+    cached result for duplicate uploads. Returns None when no text could be
+    extracted. on_fields gets early fields of a streamed LLM parse.
+    """
+    file_hash = file_hash or _hash_source(source)
+
+    with metrics.stage("blob_store"):
+        blobstore.put(source, file_hash)
+
+    with metrics.stage("cache_lookup"):
+        data = parse_cache.lookup(file_hash=file_hash)
+    if data is not None:
+        PARSES.inc(source="cache")
+        metrics.note(source="cache")
+        text_sha256 = stored_text_sha256(file_hash)
+        return ParsedFile(data, file_hash, text_sha256, *dedup.check(_stored_text(text_sha256)))
+
+    resume_text, text_sha256 = extract_resume_text(source, filename, file_hash)
+    if not resume_text:
+        return None
+
+    signature, duplicate = dedup.check(resume_text)
+    data = _duplicate_parse(duplicate, resume_text)
+    if data is None:
+        data = parse_resume_text(resume_text, file_hash, on_fields)
+    return ParsedFile(data, file_hash, text_sha256, signature, duplicate)
+
+
+def extract_resume_text(
+    source: Union[bytes, str], filename: str, file_hash: str
+) -> Tuple[str, str]:
+    """
+    (text, blob key of the text) for a resume file. Text already stored for
+    the same file is reused; otherwise the file is extracted and its text
+    stored. Returns ("", "") when no text could be extracted.
+    """
+    text_sha256 = stored_text_sha256(file_hash)
+    if text_sha256:
+        try:
+            with metrics.stage("text_lookup"):
+                return blobstore.read_text(text_sha256), text_sha256
+        except FileNotFoundError:
+            pass
+
+    resume_text = extract_text_from_bytes(source, filename)
+    if not resume_text:
+        return "", ""
+    with metrics.stage("blob_store"):
+        return resume_text, blobstore.put_text(resume_text)
+
+
+def _stored_text(text_sha256: str) -> str:
+    try:
+        return blobstore.read_text(text_sha256) if text_sha256 else ""
+    except FileNotFoundError:
+        return ""
+
+
+def _duplicate_parse(
+    duplicate: Optional[dedup.Duplicate], resume_text: str
+) -> Optional[Dict[str, Any]]:
+    """The stored near-duplicate's parse, when it may be reused; else None."""
+    if duplicate is None or (dedup.mode() == dedup.LINK and not dedup.reuse_parse_enabled()):
+        return None
+    data = dedup.parse_of(duplicate.resume_id, resume_text)
+    if data is not None:
+        PARSES.inc(source="duplicate")
+        metrics.note(source="duplicate")
+    return data
+
+
+def stored_text_sha256(file_hash: str) -> str:
+    """Blob key of the text extracted earlier from this file, or ""."""
+    return (
+        Resume.objects.filter(file_sha256=file_hash)
+        .exclude(text_sha256="")
+        .values_list("text_sha256", flat=True)
+        .first()
+    ) or ""
+
+
+def parse_resume_text(resume_text: str, file_hash: str,
+                      on_fields: Optional[FieldsCallback] = None) -> Dict[str, Any]:
+    """Parse already-extracted text, reusing a cached result for the same text."""
+    with metrics.stage("cache_lookup"):
+        text_hash = parse_cache.hash_text(resume_text)
+        data = parse_cache.lookup(text_hash=text_hash)
+    if data is None:
+        data = parse_resume_with_llm(resume_text, on_fields)
+        metrics.note(source=data.get("source", ""))
+    else:
+        PARSES.inc(source="cache")
+        metrics.note(source="cache")
+
+    with metrics.stage("cache_store"):
+        parse_cache.store(file_hash, text_hash, data)
+    return data
+
+
+def parse_resume_texts(items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Batch version of parse_resume_text for (resume_text, file_hash) pairs.
+    Cache misses are parsed together with parse_resumes_with_llm.
+    """
+    text_hashes = [parse_cache.hash_text(text) for text, _ in items]
+    results = [parse_cache.lookup(text_hash=h) for h in text_hashes]
+
+    missing = [i for i, data in enumerate(results) if data is None]
+    PARSES.inc(len(results) - len(missing), source="cache")
+    parsed = parse_resumes_with_llm([items[i][0] for i in missing])
+    for i, data in zip(missing, parsed):
+        results[i] = data
+        if items[i][1]:
+            parse_cache.store(items[i][1], text_hashes[i], data)
+
+    return results
+
+
+# Resume fields set by apply_parse
+PARSED_FIELDS = (
+    "name", "email", "mobile", "skills", "experience", "education", "summary",
+    "ats_score", "parser_version",
+)
+
+
+def apply_parse(resume: Resume, data: Dict[str, Any]) -> Resume:
+    """Set a resume's PARSED_FIELDS from parsed data, scoring it."""
+    resume.name = data.get("name", "")
+    resume.email = data.get("email", "")
+    resume.mobile = data.get("mobile", "")
+    resume.skills = ", ".join(data.get("skills", []))
+    resume.experience = data.get("experience", "")
+    resume.education = data.get("education", "")
+    resume.summary = data.get("professional_summary", "")
+    resume.parser_version = result_version(data)
+    resume.ats_score = calculate_ats_score(resume)
+    return resume
+
+
+def build_resume(
+    data: Dict[str, Any], file_sha256: str = "", text_sha256: str = "", original_name: str = "",
+    minhash: bytes = b"", duplicate_of_id: Optional[int] = None,
+) -> Resume:
+    """Unsaved Resume populated from parsed data, with its ATS score set."""
+    resume = Resume(
+        file_sha256=file_sha256,
+        text_sha256=text_sha256,
+        original_name=original_name[:255],
+        minhash=minhash,
+        duplicate_of_id=duplicate_of_id,
+    )
+    return apply_parse(resume, data)
+
+
+def create_resume(
+    data: Dict[str, Any], file_sha256: str = "", text_sha256: str = "", original_name: str = "",
+    minhash: bytes = b"", duplicate_of_id: Optional[int] = None,
+) -> Resume:
+    resume = build_resume(data, file_sha256, text_sha256, original_name, minhash, duplicate_of_id)
+    with metrics.stage("db_write"):
+        resume.save()
+        dedup.index_resumes([resume])
+    return resume
+
+
+def store_parsed(parsed: ParsedFile, original_name: str = "") -> Resume:
+    """
+    The Resume for a parsed file: a new row (linked to its near-duplicate,
+    if any), or with RESUME_DEDUP_MODE=merge the near-duplicate itself.
+    """
+    duplicate = parsed.duplicate
+    if duplicate is not None and dedup.mode() == dedup.MERGE:
+        resume = Resume.objects.filter(pk=duplicate.resume_id).first()
+        if resume is not None:
+            dedup.DUPLICATES.inc(action="merged")
+            return resume
+    if duplicate is not None:
+        dedup.DUPLICATES.inc(action="linked")
+    return create_resume(
+        parsed.data, parsed.file_sha256, parsed.text_sha256, original_name,
+        parsed.minhash, duplicate.resume_id if duplicate is not None else None,
+    )
+
+
+# -----------------------------
+# ASYNC VARIANTS
+# -----------------------------
+
+_blocking_executor = None
+_blocking_lock = threading.Lock()
+
+
+def _get_blocking_executor() -> ThreadPoolExecutor:
+    global _blocking_executor
+    with _blocking_lock:
+        if _blocking_executor is None:
+            workers = getattr(settings, "RESUME_JOB_EXTRACT_THREADS", min(4, os.cpu_count() or 1))
+            _blocking_executor = ThreadPoolExecutor(
+                max_workers=max(1, workers), thread_name_prefix="resume-extract"
+            )
+        return _blocking_executor
+
+
+async def run_blocking(fn: Callable, *args) -> Any:
+    """Run blocking file work off the event loop, on the bounded extraction pool."""
+    # Keep the caller's metrics trace for stages timed inside fn
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_blocking_executor(), context.run, fn, *args)
+
+
+async def aparse_resume_file(
+    source: Union[bytes, str], filename: str, file_hash: Optional[str] = None,
+    on_fields: Optional[FieldsCallback] = None,
+) -> Optional[ParsedFile]:
+    """Async parse_resume_file."""
+    if not file_hash:
+        file_hash = await run_blocking(_hash_source, source)
+
+    with metrics.stage("blob_store"):
+        await run_blocking(blobstore.put, source, file_hash)
+
+    with metrics.stage("cache_lookup"):
+        data = await sync_to_async(parse_cache.lookup)(file_hash=file_hash)
+    if data is not None:
+        PARSES.inc(source="cache")
+        metrics.note(source="cache")
+        text_sha256 = await astored_text_sha256(file_hash)
+        resume_text = await run_blocking(_stored_text, text_sha256)
+        return ParsedFile(data, file_hash, text_sha256, *await sync_to_async(dedup.check)(resume_text))
+
+    resume_text, text_sha256 = await aextract_resume_text(source, filename, file_hash)
+    if not resume_text:
+        return None
+
+    signature, duplicate = await sync_to_async(dedup.check)(resume_text)
+    data = await sync_to_async(_duplicate_parse)(duplicate, resume_text)
+    if data is None:
+        data = await aparse_resume_text(resume_text, file_hash, on_fields)
+    return ParsedFile(data, file_hash, text_sha256, signature, duplicate)
+
+
+async def aextract_resume_text(
+    source: Union[bytes, str], filename: str, file_hash: str
+) -> Tuple[str, str]:
+    """Async extract_resume_text."""
+    text_sha256 = await astored_text_sha256(file_hash)
+    if text_sha256:
+        try:
+            with metrics.stage("text_lookup"):
+                return await run_blocking(blobstore.read_text, text_sha256), text_sha256
+        except FileNotFoundError:
+            pass
+
+    resume_text = await run_blocking(extract_text_from_bytes, source, filename)
+    if not resume_text:
+        return "", ""
+    with metrics.stage("blob_store"):
+        return resume_text, await run_blocking(blobstore.put_text, resume_text)
+
+
+async def astored_text_sha256(file_hash: str) -> str:
+    return (
+        await Resume.objects.filter(file_sha256=file_hash)
+        .exclude(text_sha256="")
+        .values_list("text_sha256", flat=True)
+        .afirst()
+    ) or ""
+
+
+async def aparse_resume_text(resume_text: str, file_hash: str,
+                             on_fields: Optional[FieldsCallback] = None) -> Dict[str, Any]:
+    """Async parse_resume_text."""
+    with metrics.stage("cache_lookup"):
+        text_hash = parse_cache.hash_text(resume_text)
+        data = await sync_to_async(parse_cache.lookup)(text_hash=text_hash)
+    if data is None:
+        data = await aparse_resume_with_llm(resume_text, on_fields)
+        metrics.note(source=data.get("source", ""))
+    else:
+        PARSES.inc(source="cache")
+        metrics.note(source="cache")
+
+    with metrics.stage("cache_store"):
+        await sync_to_async(parse_cache.store)(file_hash, text_hash, data)
+    return data
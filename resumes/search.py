@@ -0,0 +1,191 @@
+# resumes/search.py
+"""
+Full-text search over resumes.
+
+On SQLite the index is an external-content FTS5 table kept in sync with
+resumes_resume by triggers, so creates, edits, deletes and bulk writes are
+all covered without Python signal handlers. Other databases fall back to
+an icontains scan. A different backend can be plugged in with the
+RESUME_SEARCH_BACKEND setting (dotted path to a SearchBackend subclass).
+"""
+import logging
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from .models import Resume, ResumeSkill
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("name", "email", "skills", "experience", "education", "summary")
+
+# bm25() column weights, same order as SEARCH_FIELDS
+FIELD_WEIGHTS = (10.0, 6.0, 8.0, 3.0, 2.0, 1.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize_query(query: str) -> List[str]:
+    return TOKEN_RE.findall((query or "").lower())
+
+
+class SearchBackend:
+    """
+    Base class: return resume ids matching every query term, best first.
+    With skill_ids, only resumes linked to all of those skills are returned.
+    """
+
+    def ensure_schema(self, using: str = "default") -> None:
+        pass
+
+    def rebuild(self, using: str = "default") -> None:
+        pass
+
+    def search(self, query: str, limit: Optional[int] = None, offset: int = 0,
+               skill_ids: Sequence[int] = ()) -> List[int]:
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(SearchBackend):
+    """Portable fallback: every term must appear (icontains) in some field."""
+
+    def search(self, query, limit=None, offset=0, skill_ids=()):
+        qs = Resume.objects.all()
+        for skill_id in skill_ids:
+            qs = qs.filter(skill_links__skill_id=skill_id)
+        for term in tokenize_query(query):
+            term_q = Q()
+            for field in SEARCH_FIELDS:
+                term_q |= Q(**{f"{field}__icontains": term})
+            qs = qs.filter(term_q)
+
+        qs = qs.order_by("-created_at", "-id").values_list("id", flat=True)
+        end = offset + limit if limit is not None else None
+        return list(qs[offset:end])
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """Ranked prefix search backed by an SQLite FTS5 index."""
+
+    table = "resumes_resume_fts"
+    source = "resumes_resume"
+    triggers = ("resumes_resume_fts_ai", "resumes_resume_fts_ad", "resumes_resume_fts_au")
+
+    def _columns(self, prefix=""):
+        return ", ".join(f"{prefix}{field}" for field in SEARCH_FIELDS)
+
+    def ensure_schema(self, using="default"):
+        """
+        Create the FTS table and sync triggers if missing. Triggers are lost
+        whenever a migration rebuilds resumes_resume, so this runs after
+        every migrate and reindexes when it had to recreate them.
+        """
+        connection = connections[using]
+        with connection.cursor() as cursor:
+            if self.source not in connection.introspection.table_names(cursor):
+                return
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                f"{self._columns()}, content='{self.source}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+                [self.source],
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if existing.issuperset(self.triggers):
+                return
+
+            for name in self.triggers:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+            insert_new = (
+                f"INSERT INTO {self.table}(rowid, {self._columns()}) "
+                f"VALUES (new.id, {self._columns('new.')});"
+            )
+            delete_old = (
+                f"INSERT INTO {self.table}({self.table}, rowid, {self._columns()}) "
+                f"VALUES ('delete', old.id, {self._columns('old.')});"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {self.triggers[0]} AFTER INSERT ON {self.source} "
+                f"BEGIN {insert_new} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {self.triggers[1]} AFTER DELETE ON {self.source} "
+                f"BEGIN {delete_old} END"
+            )
+            cursor.execute(
+                f"CREATE TRIGGER {self.triggers[2]} AFTER UPDATE OF {self._columns()} "
+                f"ON {self.source} BEGIN {delete_old} {insert_new} END"
+            )
+
+        self.rebuild(using)
+
+    def rebuild(self, using="default"):
+        with connections[using].cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    @staticmethod
+    def match_expression(query: str) -> str:
+        # Quote every token so user input can never inject FTS syntax;
+        # the trailing * makes each term a prefix match.
+        return " ".join(f'"{term}"*' for term in tokenize_query(query))
+
+    def search(self, query, limit=None, offset=0, skill_ids=()):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+
+        weights = ", ".join(str(w) for w in FIELD_WEIGHTS)
+        skill_filter = "".join(
+            f" AND rowid IN (SELECT resume_id FROM {ResumeSkill._meta.db_table} WHERE skill_id = %s)"
+            for _ in skill_ids
+        )
+        sql = (
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s{skill_filter} "
+            f"ORDER BY bm25({self.table}, {weights}), rowid DESC "
+            f"LIMIT %s OFFSET %s"
+        )
+        params = [expression, *skill_ids, -1 if limit is None else limit, offset]
+        try:
+            with connections["default"].cursor() as cursor:
+                cursor.execute(sql, params)
+                return [row[0] for row in cursor.fetchall()]
+        except DatabaseError as e:
+            logger.warning("FTS search unavailable, falling back to icontains: %s", e)
+            return DatabaseSearchBackend().search(query, limit, offset, skill_ids)
+
+
+@lru_cache(maxsize=1)
+def get_search_backend() -> SearchBackend:
+    path = getattr(settings, "RESUME_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    if connections["default"].vendor == "sqlite":
+        return SQLiteFTSBackend()
+    return DatabaseSearchBackend()
+
+
+def search_resumes(query: str, limit: Optional[int] = None, offset: int = 0,
+                   skill_ids: Sequence[int] = ()) -> List[int]:
+    """Ranked resume ids for a free-text query, optionally limited to skills."""
+    return get_search_backend().search(query, limit, offset, skill_ids)
+
+
+def ensure_search_schema(sender=None, using="default", **kwargs) -> None:
+    """post_migrate hook."""
+    if connections[using].vendor != "sqlite" and not getattr(settings, "RESUME_SEARCH_BACKEND", None):
+        return
+    try:
+        get_search_backend().ensure_schema(using)
+    except DatabaseError as e:
+        logger.warning("Could not create the full-text search index: %s", e)
@@ -0,0 +1,179 @@
+# resumes/semantic.py
+"""
+Semantic resume search.
+
+Each resume's skills, summary and experience are embedded with the local
+hashing vectorizer in resumes/utils/embeddings.py and kept in a
+memory-mapped vector index under RESUME_SEMANTIC_DIR. Canonical skill
+names are added as whole-phrase features, and query phrases are mapped
+through the skill aliases first, so "k8s" finds resumes listing
+"Kubernetes" and "postgres" finds "PostgreSQL".
+
+The index is updated on save and delete (resumes/signals.py) and by the
+bulk writers; `manage.py rebuild_semantic_index` rebuilds it from scratch.
+Its IVF lists are retrained in the background as it grows.
+"""
+import logging
+import threading
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from .matching import STOP_WORDS, job_skills
+from .models import Resume, ResumeSkill
+from .skills import canonical_names, resume_skill_names
+from .utils.embeddings import MIN_TRAIN, StaleIndex, VectorIndex, embed
+from .utils.local_extractor import tokenize
+
+logger = logging.getLogger(__name__)
+
+SKILLS_WEIGHT = 3.0
+SUMMARY_WEIGHT = 1.5
+EXPERIENCE_WEIGHT = 1.0
+
+# Results below this cosine similarity are noise
+MIN_SCORE = getattr(settings, "RESUME_SEMANTIC_MIN_SCORE", 0.05)
+
+# Retrain the IVF lists once the index has grown this much since training
+RETRAIN_GROWTH = 2.0
+
+_train_lock = threading.Lock()
+
+
+class SemanticMatch(NamedTuple):
+    resume_id: int
+    score: float
+
+
+@lru_cache(maxsize=1)
+def get_index() -> VectorIndex:
+    path = getattr(settings, "RESUME_SEMANTIC_DIR", "") or f"{settings.MEDIA_ROOT}/semantic"
+    return VectorIndex(
+        str(path),
+        dim=getattr(settings, "RESUME_SEMANTIC_DIM", 256),
+        nprobe=getattr(settings, "RESUME_SEMANTIC_NPROBE", 32),
+    )
+
+
+def _resume_vectors(resumes: Sequence[Resume]) -> np.ndarray:
+    skills = resume_skill_names(resumes)
+    dim = get_index().dim
+    return np.vstack([
+        embed(
+            [(" ".join(skills[r.pk]), SKILLS_WEIGHT),
+             (r.summary or "", SUMMARY_WEIGHT),
+             (r.experience or "", EXPERIENCE_WEIGHT)],
+            phrases=[(name, SKILLS_WEIGHT) for name in skills[r.pk]],
+            dim=dim,
+            stop_words=STOP_WORDS,
+        )
+        for r in resumes
+    ])
+
+
+def embed_query(query: str) -> np.ndarray:
+    """Query vector; phrases naming a known skill also match it as a whole."""
+    tokens = tokenize(query or "")
+    mentioned = set(canonical_names(job_skills(tokens)).values())
+    return embed(
+        [(query or "", 1.0)],
+        phrases=[(name, SKILLS_WEIGHT) for name in mentioned],
+        dim=get_index().dim,
+        stop_words=STOP_WORDS,
+    )
+
+
+# -----------------------------
+# Indexing
+# -----------------------------
+def index_resumes(resumes: Iterable[Resume]) -> None:
+    """Embed the given saved resumes and add or replace their vectors."""
+    resumes = [r for r in resumes if r.pk]
+    if not resumes:
+        return
+    index = get_index()
+    if not index.is_current() and index.read_meta() is not None:
+        # Built by another vectorizer version: a rebuild is needed
+        logger.warning("Semantic index at %s is stale; run rebuild_semantic_index", index.path)
+        return
+    index.upsert([r.pk for r in resumes], _resume_vectors(resumes))
+    _maybe_train()
+
+
+def remove_resumes(ids: Sequence[int]) -> None:
+    if ids and get_index().is_current():
+        get_index().remove(ids)
+
+
+def rebuild_semantic_index(chunk_size: int = 1000, progress=None) -> int:
+    """Re-embed every resume into an emptied index; returns the number indexed."""
+    index = get_index()
+    index.clear()
+    resumes = Resume.objects.order_by("pk").only("id", "skills", "experience", "summary")
+
+    total, last_pk = 0, 0
+    while True:
+        chunk = list(resumes.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        index.upsert([r.pk for r in chunk], _resume_vectors(chunk))
+        total += len(chunk)
+        if progress:
+            progress(total)
+
+    index.train()
+    return total
+
+
+def _needs_training(meta: dict) -> bool:
+    count = meta.get("count", 0)
+    if not meta.get("nlist"):
+        return count >= MIN_TRAIN
+    return count > meta.get("trained_on", 0) * RETRAIN_GROWTH
+
+
+def _maybe_train() -> None:
+    meta = get_index().read_meta() or {}
+    if not _needs_training(meta) or not _train_lock.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            get_index().train()
+        except Exception:
+            logger.exception("Training the semantic index failed")
+        finally:
+            _train_lock.release()
+
+    threading.Thread(target=run, name="semantic-train", daemon=True).start()
+
+
+# -----------------------------
+# Querying
+# -----------------------------
+def semantic_search(query: str, limit: int = 20, offset: int = 0,
+                    skill_ids: Sequence[int] = ()) -> List[SemanticMatch]:
+    """Resumes closest in meaning to the query, best first; optionally limited to skills."""
+    vector = embed_query(query)
+    if not vector.any():
+        return []
+
+    allowed: Optional[np.ndarray] = None
+    for skill_id in skill_ids:
+        ids = np.fromiter(
+            ResumeSkill.objects.filter(skill_id=skill_id).values_list("resume_id", flat=True),
+            dtype=np.int64,
+        )
+        allowed = ids if allowed is None else np.intersect1d(allowed, ids)
+    if allowed is not None and not len(allowed):
+        return []
+
+    try:
+        hits = get_index().search(vector, limit, offset, allowed)
+    except StaleIndex as e:
+        logger.warning("%s; run rebuild_semantic_index", e)
+        return []
+    return [SemanticMatch(pk, round(score, 3)) for pk, score in hits if score >= MIN_SCORE]
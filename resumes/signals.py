@@ -0,0 +1,29 @@
+# resumes/signals.py
+"""
+Keeps the job-matching and semantic indexes in step with saved resumes.
+
+Bulk writes (bulk_create, queryset.update) skip these handlers; code that
+bulk-creates resumes calls matching.index_resumes() and
+semantic.index_resumes() itself.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import semantic
+from .matching import INDEXED_FIELDS, index_resumes
+from .models import Resume
+
+
+@receiver(post_save, sender=Resume)
+def index_resume_for_matching(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    index_resumes([instance])
+    semantic.index_resumes([instance])
+
+
+@receiver(post_delete, sender=Resume)
+def remove_resume_from_semantic_index(sender, instance, **kwargs):
+    semantic.remove_resumes([instance.pk])
@@ -0,0 +1,54 @@
+# resumes/skills.py
+"""
+Normalized skills.
+
+Resume.skills keeps the list as parsed or typed. Each resume is also linked
+to one canonical Skill row per skill (ResumeSkill), kept in sync on save by
+the match indexer. SkillAlias maps spelling variants ("k8s", "nodejs",
+"postgres") to their canonical skill, so filtering on any of them finds
+every resume with that skill through the (skill, resume) index.
+"""
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .models import Resume, Skill, SkillAlias
+from .utils.local_extractor import tokenize
+
+# Keeps IN (...) lists well under database parameter limits
+LOOKUP_BATCH = 500
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(tokenize(skill))
+
+
+def canonical_names(names: Iterable[str]) -> Dict[str, str]:
+    """{normalized name: canonical name}; names without an alias map to themselves."""
+    names = list({n for n in names if n})
+    canonical = {n: n for n in names}
+    for i in range(0, len(names), LOOKUP_BATCH):
+        rows = SkillAlias.objects.filter(
+            alias__in=names[i:i + LOOKUP_BATCH]
+        ).values_list("alias", "skill__name")
+        canonical.update(rows)
+    return canonical
+
+
+def resume_skill_names(resumes: Sequence[Resume]) -> Dict[int, List[str]]:
+    """Canonical, de-duplicated skill names of each resume, keyed by pk."""
+    raw = {
+        r.pk: [n for n in (normalize_skill(s) for s in r.skill_list()) if n and len(n) <= 100]
+        for r in resumes
+    }
+    canonical = canonical_names(chain.from_iterable(raw.values()))
+    return {pk: list(dict.fromkeys(canonical[n] for n in names)) for pk, names in raw.items()}
+
+
+def find_skill_ids(names: Sequence[str]) -> List[Optional[int]]:
+    """The Skill id for each name (via aliases), None where no resume has it."""
+    normalized = [normalize_skill(n) for n in names]
+    canonical = canonical_names(normalized)
+    ids = dict(
+        Skill.objects.filter(name__in=set(canonical.values())).values_list("name", "id")
+    )
+    return [ids.get(canonical.get(n, "")) for n in normalized]
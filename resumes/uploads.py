@@ -0,0 +1,74 @@
+# resumes/uploads.py
+"""
+Streaming upload handling for resume files.
+
+Uploads are written to a temporary file chunk by chunk, so a worker never
+holds a whole file in memory. A request is refused as soon as it exceeds
+RESUME_UPLOAD_MAX_BYTES, and a file is refused after its first chunk when
+the content is not a supported resume type. The stored temp file is later
+moved (not copied) into MEDIA_ROOT and parsed from its path.
+"""
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, StopUpload, TemporaryFileUploadHandler
+
+from .utils.extractors import DOCX, HEAD_BYTES, is_docx, sniff_head
+
+# Room for the multipart boundaries and the other form fields
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def max_upload_bytes() -> int:
+    return getattr(settings, "RESUME_UPLOAD_MAX_BYTES", 10 * 1024 * 1024)
+
+
+class ResumeUploadHandler(TemporaryFileUploadHandler):
+    """
+    Temp-file upload handler with a size cap and content sniffing. After
+    parsing, `error` explains why an upload was refused ("" if it wasn't).
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_bytes = max_upload_bytes()
+        self.error = ""
+        self.too_large = False
+        self.kind = ""
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Refuse before reading any file data when the request is declared too big
+        if content_length and content_length > self.max_bytes + FORM_OVERHEAD_BYTES:
+            self._refuse_size()
+        return None
+
+    def new_file(self, *args, **kwargs):
+        if self.error:
+            raise StopUpload(connection_reset=False)
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            self._refuse_size()
+            raise SkipFile()
+        if start == 0:
+            # Decided by content only; the client's file name is not trusted
+            self.kind = sniff_head(raw_data[:HEAD_BYTES])
+            if not self.kind:
+                self._refuse_type()
+                raise SkipFile()
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        # A zip can only be confirmed as DOCX once the whole file is here
+        if self.kind == DOCX and not is_docx(uploaded.temporary_file_path()):
+            self._refuse_type()
+            uploaded.close()
+            return None
+        return uploaded
+
+    def _refuse_type(self):
+        self.error = "Unsupported file type. Upload a PDF, DOCX, image or text file."
+
+    def _refuse_size(self):
+        self.too_large = True
+        self.error = f"File is too large (max {self.max_bytes // (1024 * 1024)} MB)."
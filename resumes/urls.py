@@ -6,6 +6,9 @@ app_name = "resumes"
 urlpatterns = [
     path("", views.resume_list, name="resume_list"),
     path("upload/", views.upload_resume, name="upload_resume"),
+    path("match/", views.job_match, name="job_match"),
+    path("jobs/<int:job_id>/", views.job_status, name="job_status"),
+    path("jobs/<int:job_id>/status/", views.job_status_json, name="job_status_json"),
     path("delete/<int:resume_id>/", views.delete_resume, name="delete_resume"),
     path("view/<int:resume_id>/", views.view_resume, name="view_resume"),
     path("edit/<int:resume_id>/", views.edit_resume, name="edit_resume"),
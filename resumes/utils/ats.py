@@ -1,99 +1,117 @@
 import re
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(\+?\d[\d\-\s]{6,}\d)")
 
+MAX_SCORE = 100
+
+# Resume columns the rubric reads, in the order score_rows() expects them
+FEATURE_FIELDS = ("name", "email", "mobile", "skills", "experience", "education")
+
+
+class Criterion(NamedTuple):
+    label: str
+    feature: str                        # feature that earns points
+    tiers: Tuple[Tuple[int, int], ...]  # (minimum value, points), best tier first
+    ok_feature: str                     # feature the breakdown checks
+    ok_min: int
+    weak_status: str                    # breakdown status when below ok_min
+    suggestion: str
+
+
+# The rubric. Both the per-resume and the batch scorer read it, so a rubric
+# change is made here and applied to stored scores with `rescore_resumes`.
+RUBRIC = (
+    Criterion("Name", "name_length", ((3, 10),),
+              "name_length", 3, "missing", "Add your full name."),
+    Criterion("Email", "email_valid", ((1, 10),),
+              "email_present", 1, "missing", "Add a professional email address."),
+    Criterion("Phone", "phone_valid", ((1, 10),),
+              "phone_present", 1, "missing", "Add a contact phone number."),
+    Criterion("Skills", "skill_count", ((5, 25), (3, 15), (1, 8)),
+              "skill_count", 5, "weak", "Add at least 5 relevant skills."),
+    Criterion("Experience", "experience_length", ((150, 25), (75, 15), (30, 8)),
+              "experience_length", 75, "weak", "Add detailed work experience with responsibilities."),
+    Criterion("Education", "education_length", ((80, 20), (40, 12), (20, 6)),
+              "education_length", 40, "weak", "Add your education details clearly."),
+)
+
+
+def feature_columns(rows: Sequence[Sequence]) -> Dict[str, np.ndarray]:
+    """
+    Columnar features for many resumes. Each row holds the FEATURE_FIELDS
+    values of one resume; the result has one int array per feature.
+    """
+    n = len(rows)
+    names, emails, mobiles, skills, experience, education = (
+        zip(*rows) if n else ((),) * len(FEATURE_FIELDS)
+    )
+
+    def column(values):
+        return np.fromiter(values, dtype=np.int32, count=n)
+
+    return {
+        "name_length": column(len((v or "").strip()) for v in names),
+        "email_present": column(bool(v) for v in emails),
+        "email_valid": column(bool(v and EMAIL_RE.search(v)) for v in emails),
+        "phone_present": column(bool(v) for v in mobiles),
+        "phone_valid": column(bool(v and PHONE_RE.search(v)) for v in mobiles),
+        "skill_count": column(
+            sum(1 for s in (v or "").split(",") if s.strip()) for v in skills
+        ),
+        "experience_length": column(len((v or "").strip()) for v in experience),
+        "education_length": column(len((v or "").strip()) for v in education),
+    }
+
+
+def score_features(features: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores for every resume, plus a boolean (resumes x RUBRIC) matrix that
+    is True where a criterion is "ok".
+    """
+    n = len(features["name_length"])
+    scores = np.zeros(n, dtype=np.int32)
+    ok = np.empty((n, len(RUBRIC)), dtype=bool)
+
+    for i, criterion in enumerate(RUBRIC):
+        values = features[criterion.feature]
+        scores += np.select(
+            [values >= minimum for minimum, _ in criterion.tiers],
+            [points for _, points in criterion.tiers],
+            default=0,
+        ).astype(np.int32)
+        ok[:, i] = features[criterion.ok_feature] >= criterion.ok_min
+
+    np.minimum(scores, MAX_SCORE, out=scores)
+    return scores, ok
+
+
+def score_rows(rows: Sequence[Sequence]) -> Tuple[np.ndarray, np.ndarray]:
+    return score_features(feature_columns(rows))
+
+
+def _row(resume) -> Tuple:
+    return tuple(getattr(resume, field) for field in FEATURE_FIELDS)
+
+
 def calculate_ats_score(resume):
-    score = 0
-
-    # Name
-    if resume.name and len(resume.name.strip()) >= 3:
-        score += 10
-
-    # Email
-    if resume.email and EMAIL_RE.search(resume.email):
-        score += 10
-
-    # Mobile
-    if resume.mobile and PHONE_RE.search(resume.mobile):
-        score += 10
-
-    # Skills
-    skills = [s.strip() for s in (resume.skills or "").split(",") if s.strip()]
-    if len(skills) >= 5:
-        score += 25
-    elif len(skills) >= 3:
-        score += 15
-    elif len(skills) >= 1:
-        score += 8
-
-    # Experience
-    if resume.experience:
-        length = len(resume.experience.strip())
-        if length >= 150:
-            score += 25
-        elif length >= 75:
-            score += 15
-        elif length >= 30:
-            score += 8
-
-    # Education
-    if resume.education:
-        length = len(resume.education.strip())
-        if length >= 80:
-            score += 20
-        elif length >= 40:
-            score += 12
-        elif length >= 20:
-            score += 6
-
-    return min(score, 100)
+    scores, _ = score_rows([_row(resume)])
+    return int(scores[0])
+
 
 def ats_breakdown(resume):
-    breakdown = []
-    suggestions = []
-
-    # Name
-    if resume.name and len(resume.name.strip()) >= 3:
-        breakdown.append(("Name", "ok"))
-    else:
-        breakdown.append(("Name", "missing"))
-        suggestions.append("Add your full name.")
-
-    # Email
-    if resume.email:
-        breakdown.append(("Email", "ok"))
-    else:
-        breakdown.append(("Email", "missing"))
-        suggestions.append("Add a professional email address.")
-
-    # Mobile
-    if resume.mobile:
-        breakdown.append(("Phone", "ok"))
-    else:
-        breakdown.append(("Phone", "missing"))
-        suggestions.append("Add a contact phone number.")
-
-    # Skills
-    skills = [s.strip() for s in (resume.skills or "").split(",") if s.strip()]
-    if len(skills) >= 5:
-        breakdown.append(("Skills", "ok"))
-    else:
-        breakdown.append(("Skills", "weak"))
-        suggestions.append("Add at least 5 relevant skills.")
-
-    # Experience
-    if resume.experience and len(resume.experience.strip()) >= 75:
-        breakdown.append(("Experience", "ok"))
-    else:
-        breakdown.append(("Experience", "weak"))
-        suggestions.append("Add detailed work experience with responsibilities.")
-
-    # Education
-    if resume.education and len(resume.education.strip()) >= 40:
-        breakdown.append(("Education", "ok"))
-    else:
-        breakdown.append(("Education", "weak"))
-        suggestions.append("Add your education details clearly.")
+    _, ok = score_rows([_row(resume)])
+    breakdown: List[Tuple[str, str]] = []
+    suggestions: List[str] = []
+
+    for criterion, passed in zip(RUBRIC, ok[0]):
+        if passed:
+            breakdown.append((criterion.label, "ok"))
+        else:
+            breakdown.append((criterion.label, criterion.weak_status))
+            suggestions.append(criterion.suggestion)
 
     return breakdown, suggestions
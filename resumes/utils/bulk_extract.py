@@ -0,0 +1,67 @@
+# resumes/utils/bulk_extract.py
+"""
+Process-pool helpers for bulk ingestion.
+
+This module must not import Django: it is loaded by worker processes that
+never run django.setup().
+"""
+import hashlib
+import logging
+import os
+from typing import FrozenSet, NamedTuple, Optional
+
+from . import pdf_text
+from .extractors import EXTENSIONS, extract_text
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = tuple(EXTENSIONS)
+
+# Same cap as web uploads (RESUME_UPLOAD_MAX_BYTES)
+MAX_FILE_BYTES = int(os.environ.get("RESUME_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+
+_known_hashes: FrozenSet[str] = frozenset()
+
+
+class ExtractedFile(NamedTuple):
+    path: str
+    sha256: str
+    text: Optional[str]
+    skipped: bool = False
+    error: str = ""
+
+
+def init_worker(known_hashes: FrozenSet[str]) -> None:
+    """Pool initializer: hashes of files that are already ingested."""
+    global _known_hashes
+    _known_hashes = known_hashes
+    # Already one process per file; don't fan pages out to nested pools.
+    pdf_text.PDF_WORKERS = 1
+
+
+def extract_file(path: str) -> ExtractedFile:
+    """Hash a file and, unless it is already ingested, extract its text."""
+    try:
+        if os.path.getsize(path) > MAX_FILE_BYTES:
+            return ExtractedFile(path, "", None, error=f"larger than {MAX_FILE_BYTES} bytes")
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError as e:
+        return ExtractedFile(path, "", None, error=str(e))
+
+    sha256 = digest.hexdigest()
+    if sha256 in _known_hashes:
+        return ExtractedFile(path, sha256, None, skipped=True)
+
+    try:
+        # Backends read the file from its path; it is not loaded whole
+        text = extract_text(path)
+    except Exception as e:
+        logger.exception("Extraction failed for %s", path)
+        return ExtractedFile(path, sha256, None, error=str(e))
+
+    if not text:
+        return ExtractedFile(path, sha256, None, error="no text extracted")
+    return ExtractedFile(path, sha256, text)
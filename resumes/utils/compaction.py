@@ -0,0 +1,173 @@
+# resumes/utils/compaction.py
+"""
+Shrinks resume text before it is put into an LLM prompt.
+
+- Whitespace is collapsed, and lines that carry nothing for the parsed
+  fields are dropped: page numbers, separator rules, "References available
+  on request", declarations, and long lines seen before (page headers and
+  footers repeated on every page, copy-pasted bullets).
+- Email and phone are found by regex (local_extractor.extract_contacts)
+  and cut from the text; the parser fills them in from here instead.
+- Lines are grouped into sections with the local parser's header
+  detection. If the text is still over GROQ_PROMPT_TOKEN_BUDGET, each
+  section is cut to its weighted share of the budget, keeping its first
+  lines (resumes list the most recent roles first). Sections smaller than
+  their share keep everything and leave the rest to the others.
+"""
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .local_extractor import HEADER_CLEAN_RE, detect_header, extract_contacts
+
+# Approximate resume tokens per prompt; 0 disables truncation
+PROMPT_TOKEN_BUDGET = int(os.environ.get("GROQ_PROMPT_TOKEN_BUDGET", 2500))
+
+# Relative share of the budget per section ("header": lines before the first one)
+SECTION_WEIGHTS = {
+    "header": 1.0,
+    "summary": 1.0,
+    "skills": 1.5,
+    "experience": 3.0,
+    "education": 1.0,
+    "projects": 1.0,
+    "certifications": 0.5,
+    "other": 0.25,
+}
+
+# Sections nothing is parsed from
+DROPPED_HEADERS = frozenset(("references", "declaration"))
+
+TRUNCATED = "[...]"
+
+# Repeats of lines at least this long are dropped
+REPEAT_MIN_CHARS = 20
+
+PAGE_RE = re.compile(r"^(?:page\s*)?-?\s*\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?\s*-?$", re.IGNORECASE)
+BOILERPLATE_RE = re.compile(
+    r"^(?:curriculum vitae|resume|cv|references? (?:are )?(?:available )?(?:up)?on request"
+    r"|i hereby declare\b.*)\.?$",
+    re.IGNORECASE,
+)
+CONTACT_LABEL_RE = re.compile(
+    r"\b(?:e-?mail(?:\s*id)?|phone|mobile|mob|tel|cell|contact)(?:\s*(?:no|number))?\.?"
+    r"\s*[:\-]?\s*(?=[|,•·]|$)",
+    re.IGNORECASE,
+)
+SEPARATORS_RE = re.compile(r"(?:\s*[|,•·]\s*){2,}")
+HAS_WORD_RE = re.compile(r"\w")
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text
+    return len(text) // 4 + 1
+
+
+class Compacted(NamedTuple):
+    text: str
+    # Found by regex and removed from text ("" if none)
+    email: str
+    mobile: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+def compact(text: str, budget: Optional[int] = None) -> Compacted:
+    """Prompt-ready text of a resume, with its pre-extracted email and phone."""
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    email, mobile = extract_contacts(text or "")
+
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    seen = set()
+    skipping = False
+    for raw_line in (text or "").splitlines():
+        line = " ".join(raw_line.split())
+        if not line or not HAS_WORD_RE.search(line) or PAGE_RE.match(line) or BOILERPLATE_RE.match(line):
+            continue
+
+        key = line.lower()
+        if len(key) >= REPEAT_MIN_CHARS:
+            if key in seen:
+                continue
+            seen.add(key)
+
+        section, rest = detect_header(line)
+        if section is not None:
+            heading = " ".join(HEADER_CLEAN_RE.sub(" ", line.partition(":")[0].lower()).split())
+            skipping = heading in DROPPED_HEADERS
+            if not skipping:
+                sections.append((section, [line]))
+            continue
+        if skipping:
+            continue
+
+        line = _strip_contacts(line, email, mobile)
+        if line:
+            sections[-1][1].append(line)
+
+    sections = [(name, lines) for name, lines in sections if lines]
+    if budget:
+        sections = _fit(sections, budget)
+
+    compacted = "\n".join(line for _, lines in sections for line in lines)
+    return Compacted(compacted, email, mobile, estimate_tokens(text or ""), estimate_tokens(compacted))
+
+
+def _strip_contacts(line: str, email: str, mobile: str) -> str:
+    stripped = line
+    for value in (email, mobile):
+        if value:
+            stripped = stripped.replace(value, "")
+    if stripped == line:
+        return line
+    # Labels left without their value, then doubled-up separators
+    stripped = CONTACT_LABEL_RE.sub("", stripped)
+    stripped = SEPARATORS_RE.sub(" | ", stripped).strip(" |,•·-:")
+    return stripped if HAS_WORD_RE.search(stripped) else ""
+
+
+def _fit(sections: List[Tuple[str, List[str]]], budget: int) -> List[Tuple[str, List[str]]]:
+    sizes = {i: sum(estimate_tokens(line) for line in lines) for i, (_, lines) in enumerate(sections)}
+    if sum(sizes.values()) <= budget:
+        return sections
+
+    weights = {i: SECTION_WEIGHTS.get(name, 1.0) for i, (name, _) in enumerate(sections)}
+    allowance = _allocate(sizes, weights, budget)
+    return [(name, _truncate(lines, allowance[i])) for i, (name, lines) in enumerate(sections)]
+
+
+def _allocate(sizes: Dict[int, int], weights: Dict[int, float], budget: int) -> Dict[int, int]:
+    """Weighted shares of the budget; what small sections don't use goes to the others."""
+    allowance: Dict[int, int] = {}
+    pending = dict(sizes)
+    left = budget
+    while pending:
+        total = sum(weights[i] for i in pending)
+        shares = {i: left * weights[i] / total for i in pending}
+        fitting = [i for i in pending if pending[i] <= shares[i]]
+        if not fitting:
+            allowance.update((i, int(share)) for i, share in shares.items())
+            break
+        for i in fitting:
+            allowance[i] = pending.pop(i)
+            left -= allowance[i]
+    return allowance
+
+
+def _truncate(lines: List[str], allowance: int) -> List[str]:
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost > allowance:
+            room = (allowance - used) * 4
+            if room > 40:
+                kept.append(line[:room].rsplit(" ", 1)[0])
+            kept.append(TRUNCATED)
+            break
+        kept.append(line)
+        used += cost
+    return kept
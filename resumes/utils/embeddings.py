@@ -0,0 +1,394 @@
+# resumes/utils/embeddings.py
+"""
+Local text embeddings and a memory-mapped vector index.
+
+embed(): a hashing vectorizer. Words, word pairs, character 4-grams and
+whole phrases (e.g. canonical skill names) are hashed into `dim` signed
+buckets, weighted by log(1 + tf) and L2-normalized. Texts sharing
+vocabulary, word fragments ("postgres" / "postgresql") or skills end up
+close together. No model download or training is needed, and the same
+text always gets the same vector.
+
+VectorIndex: unit vectors in a float32 matrix memory-mapped from disk, with
+an IVF (inverted file) approximate-nearest-neighbour index. Vectors are
+grouped around k-means centroids, and a query only scores the groups
+nearest to it. Rows are appended, overwritten or tombstoned in place under
+a file lock, so several processes can share one index. Readers map the
+files and never load them whole.
+"""
+import json
+import os
+import threading
+import zlib
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .local_extractor import tokenize
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_DIM = 256
+NGRAM = 4
+NGRAM_WEIGHT = 0.25
+BIGRAM_WEIGHT = 0.5
+
+# Bump when embed() changes: indexes built by another version are stale
+VECTORIZER_VERSION = "hash-1"
+
+
+def embed(
+    fields: Sequence[Tuple[str, float]],
+    phrases: Iterable[Tuple[str, float]] = (),
+    dim: int = DEFAULT_DIM,
+    stop_words: frozenset = frozenset(),
+) -> np.ndarray:
+    """Unit-length float32 vector for weighted texts and weighted whole phrases."""
+    counts: Dict[str, float] = defaultdict(float)
+    for text, weight in fields:
+        tokens = [t for t in tokenize(text) if t not in stop_words]
+        for i, token in enumerate(tokens):
+            counts["w" + token] += weight
+            if i:
+                counts[f"b{tokens[i - 1]} {token}"] += weight * BIGRAM_WEIGHT
+            if len(token) > NGRAM:
+                padded = f"<{token}>"
+                for j in range(len(padded) - NGRAM + 1):
+                    counts["c" + padded[j:j + NGRAM]] += weight * NGRAM_WEIGHT
+    for phrase, weight in phrases:
+        counts["p" + phrase] += weight
+    return _hash_counts(counts, dim)
+
+
+def _hash_counts(counts: Dict[str, float], dim: int) -> np.ndarray:
+    if not counts:
+        return np.zeros(dim, dtype=np.float32)
+    hashes = np.fromiter(
+        (zlib.crc32(f.encode("utf-8")) for f in counts), dtype=np.uint32, count=len(counts)
+    )
+    values = np.log1p(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+    # The top hash bit picks the sign, so collisions tend to cancel out
+    signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+    vec = np.bincount(hashes % dim, weights=signs * values, minlength=dim).astype(np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+# -----------------------------
+# VECTOR INDEX
+# -----------------------------
+
+META, VECTORS, IDS, LISTS, CENTROIDS, LOCK = (
+    "meta.json", "vectors.f32", "ids.i64", "lists.i32", "centroids.npy", "write.lock",
+)
+
+INITIAL_CAPACITY = 1024
+# Rows scored per step when a whole range is scanned
+SCAN_CHUNK = 32768
+# Below this many vectors, exact search is cheap and IVF is not trained
+MIN_TRAIN = 4096
+TRAIN_SAMPLE = 20000
+KMEANS_ITERATIONS = 8
+
+
+class StaleIndex(RuntimeError):
+    """The index on disk was built with another dimension or vectorizer."""
+
+
+class _Maps(NamedTuple):
+    generation: int
+    capacity: int
+    vectors: np.ndarray
+    ids: np.ndarray
+    lists: np.ndarray
+    centroids: Optional[np.ndarray]
+
+
+class VectorIndex:
+    """
+    Vectors keyed by positive integer ids (resume pks) in `path`:
+
+    - vectors.f32 / ids.i64 / lists.i32: one row per slot; id 0 marks a
+      deleted slot, list -1 a vector not yet assigned to an IVF list
+    - centroids.npy: the IVF centroids, once trained
+    - meta.json: row count, capacity and a generation bumped whenever the
+      files are replaced, so readers know to remap them
+    """
+
+    def __init__(self, path: str, dim: int = DEFAULT_DIM, version: str = VECTORIZER_VERSION,
+                 nprobe: int = 32):
+        self.path = path
+        self.dim = dim
+        self.version = version
+        self.nprobe = nprobe
+        self._maps: Optional[_Maps] = None
+        self._lock = threading.Lock()
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    # ---- metadata ---------------------------------------------------------
+
+    def read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._file(META)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta: dict) -> None:
+        tmp = self._file(META + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file(META))
+
+    def _compatible(self, meta: dict) -> bool:
+        return meta.get("dim") == self.dim and meta.get("version") == self.version
+
+    def is_current(self) -> bool:
+        meta = self.read_meta()
+        return meta is not None and self._compatible(meta)
+
+    def stats(self) -> dict:
+        """Row counts of the index on disk (empty dict when there is none)."""
+        meta = self.read_meta()
+        if meta is None:
+            return {}
+        live = 0
+        maps = self._open(meta) if self._compatible(meta) else None
+        if maps is not None:
+            live = int(np.count_nonzero(maps.ids[:meta["count"]]))
+        return dict(meta, live=live)
+
+    # ---- reading ----------------------------------------------------------
+
+    def _open(self, meta: dict) -> Optional[_Maps]:
+        """Read-only maps of the files, reopened when they were replaced or grown."""
+        maps = self._maps
+        if maps is not None and (maps.generation, maps.capacity) == (meta["generation"], meta["capacity"]):
+            return maps
+        if not meta["capacity"]:
+            return None
+        capacity = meta["capacity"]
+        centroids = None
+        if meta.get("nlist"):
+            centroids = np.load(self._file(CENTROIDS))
+        maps = _Maps(
+            meta["generation"],
+            capacity,
+            np.memmap(self._file(VECTORS), np.float32, "r", shape=(capacity, self.dim)),
+            np.memmap(self._file(IDS), np.int64, "r", shape=(capacity,)),
+            np.memmap(self._file(LISTS), np.int32, "r", shape=(capacity,)),
+            centroids,
+        )
+        self._maps = maps
+        return maps
+
+    def search(self, query: np.ndarray, k: int, offset: int = 0,
+               allowed: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        (id, cosine similarity) of the best k vectors after `offset`, best
+        first. With `allowed`, only those ids are considered.
+        """
+        meta = self.read_meta()
+        if meta is None or not meta["count"]:
+            return []
+        if not self._compatible(meta):
+            raise StaleIndex(f"Index at {self.path} was built for another vectorizer")
+        maps = self._open(meta)
+        if maps is None:
+            return []
+
+        n = meta["count"]
+        ids = maps.ids[:n]
+        eligible = ids > 0
+        if allowed is not None:
+            eligible &= np.isin(ids, allowed)
+        want = k + offset
+
+        candidates = None
+        if maps.centroids is not None:
+            probe = np.argsort(maps.centroids @ query)[::-1][:self.nprobe]
+            near = np.flatnonzero(eligible & np.isin(maps.lists[:n], probe))
+            if len(near) >= want:
+                candidates = near
+        if candidates is None:
+            # Untrained, or too few candidates near the query: exact search
+            candidates = np.flatnonzero(eligible)
+        if not len(candidates):
+            return []
+
+        scores = np.empty(len(candidates), dtype=np.float32)
+        for start in range(0, len(candidates), SCAN_CHUNK):
+            rows = candidates[start:start + SCAN_CHUNK]
+            scores[start:start + len(rows)] = maps.vectors[rows] @ query
+
+        if want < len(scores):
+            top = np.argpartition(-scores, want - 1)[:want]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")][offset:want]
+        return [(int(ids[candidates[i]]), float(scores[i])) for i in top]
+
+    # ---- writing ----------------------------------------------------------
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, open(self._file(LOCK), "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _writable(self, meta: dict):
+        capacity = meta["capacity"]
+        return (
+            np.memmap(self._file(VECTORS), np.float32, "r+", shape=(capacity, self.dim)),
+            np.memmap(self._file(IDS), np.int64, "r+", shape=(capacity,)),
+            np.memmap(self._file(LISTS), np.int32, "r+", shape=(capacity,)),
+        )
+
+    def _new_meta(self) -> dict:
+        return {"dim": self.dim, "version": self.version, "count": 0, "capacity": 0,
+                "generation": 0, "nlist": 0, "trained_on": 0}
+
+    def _grow(self, meta: dict, needed: int) -> None:
+        capacity = max(INITIAL_CAPACITY, meta["capacity"])
+        while capacity < needed:
+            capacity *= 2
+        if capacity == meta["capacity"]:
+            return
+        for name, row_bytes in ((VECTORS, 4 * self.dim), (IDS, 8), (LISTS, 4)):
+            with open(self._file(name), "a+b") as f:
+                f.truncate(capacity * row_bytes)
+        if meta["capacity"] == 0:
+            with open(self._file(LISTS), "r+b") as f:
+                f.write(np.full(capacity, -1, dtype=np.int32).tobytes())
+        else:
+            lists = np.memmap(self._file(LISTS), np.int32, "r+", shape=(capacity,))
+            lists[meta["capacity"]:] = -1
+            lists.flush()
+        meta["capacity"] = capacity
+
+    def upsert(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Add or replace the vectors of `ids`."""
+        if not len(ids):
+            return
+        ids = np.asarray(ids, dtype=np.int64)
+        with self._write_lock():
+            meta = self.read_meta() or self._new_meta()
+            if not self._compatible(meta):
+                raise StaleIndex(f"Index at {self.path} was built for another vectorizer")
+
+            n = meta["count"]
+            slots = np.full(len(ids), -1, dtype=np.int64)
+            if n:
+                stored = np.memmap(self._file(IDS), np.int64, "r", shape=(meta["capacity"],))[:n]
+                hits = np.flatnonzero(np.isin(stored, ids))
+                where = {int(stored[s]): s for s in hits}
+                slots = np.array([where.get(int(i), -1) for i in ids], dtype=np.int64)
+            new = np.flatnonzero(slots < 0)
+            slots[new] = np.arange(n, n + len(new))
+            self._grow(meta, n + len(new))
+
+            vec_map, id_map, list_map = self._writable(meta)
+            vec_map[slots] = vectors
+            id_map[slots] = ids
+            centroids = np.load(self._file(CENTROIDS)) if meta["nlist"] else None
+            list_map[slots] = np.argmax(vectors @ centroids.T, axis=1) if centroids is not None else -1
+            for m in (vec_map, id_map, list_map):
+                m.flush()
+
+            meta["count"] = n + len(new)
+            self._write_meta(meta)
+
+    def remove(self, ids: Sequence[int]) -> None:
+        """Drop the vectors of `ids`; their slots are reclaimed by a rebuild."""
+        meta = self.read_meta()
+        if not len(ids) or meta is None or not meta["count"]:
+            return
+        with self._write_lock():
+            meta = self.read_meta()
+            id_map = np.memmap(self._file(IDS), np.int64, "r+", shape=(meta["capacity"],))
+            hits = np.flatnonzero(np.isin(id_map[:meta["count"]], np.asarray(ids, dtype=np.int64)))
+            if len(hits):
+                id_map[hits] = 0
+                id_map.flush()
+
+    def clear(self) -> None:
+        """Empty the index, e.g. before a rebuild with another vectorizer."""
+        with self._write_lock():
+            old = self.read_meta() or {}
+            meta = self._new_meta()
+            meta["generation"] = old.get("generation", 0) + 1
+            for name in (VECTORS, IDS, LISTS, CENTROIDS):
+                try:
+                    os.remove(self._file(name))
+                except FileNotFoundError:
+                    pass
+            self._write_meta(meta)
+
+    def train(self, nlist: int = 0, seed: int = 0) -> int:
+        """
+        Cluster the stored vectors with spherical k-means and assign every
+        row to its nearest centroid. Returns the number of lists (0 while
+        the index is too small to need them).
+        """
+        with self._write_lock():
+            meta = self.read_meta()
+            if meta is None or not meta["count"]:
+                return 0
+            vec_map, id_map, list_map = self._writable(meta)
+            n = meta["count"]
+            live = np.flatnonzero(id_map[:n] > 0)
+
+            if len(live) < MIN_TRAIN:
+                nlist, centroids = 0, None
+                list_map[:n] = -1
+            else:
+                nlist = nlist or int(np.clip(np.sqrt(len(live)), 16, 4096))
+                rng = np.random.default_rng(seed)
+                sample = np.sort(rng.choice(live, min(len(live), TRAIN_SAMPLE), replace=False))
+                centroids = _spherical_kmeans(np.asarray(vec_map[sample]), nlist, rng)
+                for start in range(0, n, SCAN_CHUNK):
+                    block = vec_map[start:start + SCAN_CHUNK]
+                    list_map[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+                tmp = self._file("centroids.tmp.npy")
+                np.save(tmp, centroids)
+                os.replace(tmp, self._file(CENTROIDS))
+            list_map.flush()
+
+            meta.update(nlist=nlist, trained_on=len(live), generation=meta["generation"] + 1)
+            self._write_meta(meta)
+            return nlist
+
+
+def _spherical_kmeans(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k unit centroids for unit vectors x, by cosine similarity."""
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = np.argmax(x @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, x)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        # Empty clusters keep their previous centroid
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return centroids
@@ -0,0 +1,279 @@
+# resumes/utils/extractors.py
+"""
+One text-extraction entry point for every resume file.
+
+The file type is sniffed from its leading bytes (the extension is only a
+fallback), then the backends registered for that type are tried in
+priority order until one returns usable text. Backends import their
+libraries on first use, so importing this module is cheap and a process
+only loads the libraries for the formats it actually sees. A backend whose
+library is missing is skipped from then on.
+
+Priorities can be overridden per type, fastest first, e.g.
+RESUME_EXTRACTORS_PDF="pymupdf,pdfplumber,ocr".
+
+Sources are raw bytes or a file path. Prefer paths for uploads: every
+backend then reads the file directly instead of holding a copy in memory.
+"""
+import io
+import os
+import logging
+import threading
+import zipfile
+from typing import Callable, Dict, List, NamedTuple, Set, Union
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+PDF, DOCX, IMAGE, TEXT = "pdf", "docx", "image", "text"
+
+Source = Union[bytes, str]   # raw bytes or a file path
+
+# Enough leading bytes for every signature below
+HEAD_BYTES = 1024
+
+EXTENSIONS = {
+    ".pdf": PDF,
+    ".docx": DOCX,
+    ".png": IMAGE, ".jpg": IMAGE, ".jpeg": IMAGE, ".tiff": IMAGE, ".tif": IMAGE,
+    ".bmp": IMAGE, ".gif": IMAGE,
+    ".txt": TEXT,
+}
+
+# A PDF text layer shorter than this is treated as scanned (see ocr.py)
+MIN_PDF_CHARS = int(os.environ.get("RESUME_OCR_PDF_MIN_CHARS", 50))
+
+EXTRACTOR_RUNS = metrics.counter(
+    "resume_extractor_runs_total", "Extraction attempts per backend and outcome.",
+    ("kind", "backend", "outcome"),
+)
+
+
+class Backend(NamedTuple):
+    name: str
+    kind: str
+    extract: Callable[[Source], str]
+
+
+_backends: Dict[str, Dict[str, Backend]] = {}
+_unavailable: Set[str] = set()
+_lock = threading.Lock()
+
+
+def register(kind: str, name: str) -> Callable:
+    """Decorator registering `fn(source) -> raw text` as a backend for `kind`."""
+    def decorator(fn):
+        _backends.setdefault(kind, {})[name] = Backend(name, kind, fn)
+        return fn
+    return decorator
+
+
+DEFAULT_PRIORITY = {
+    PDF: "pymupdf,pypdf2,ocr",
+    DOCX: "python-docx",
+    IMAGE: "tesseract",
+    TEXT: "plain",
+}
+
+
+def priority(kind: str) -> List[Backend]:
+    """Registered, available backends for `kind`, in configured order."""
+    names = os.environ.get(f"RESUME_EXTRACTORS_{kind.upper()}", DEFAULT_PRIORITY.get(kind, ""))
+    registered = _backends.get(kind, {})
+    order = []
+    for name in (n.strip() for n in names.split(",")):
+        if name in registered and f"{kind}:{name}" not in _unavailable:
+            order.append(registered[name])
+        elif name and name not in registered:
+            logger.warning("Unknown %s extractor %r in RESUME_EXTRACTORS_%s", kind, name, kind.upper())
+    return order
+
+
+# -----------------------------
+# TYPE SNIFFING
+# -----------------------------
+
+def read_head(source: Source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(HEAD_BYTES)
+    return source[:HEAD_BYTES]
+
+
+def sniff(source: Source, filename: str = "") -> str:
+    """File type from the content's magic bytes, else from the extension ("" if unknown)."""
+    if not filename and isinstance(source, str):
+        filename = source
+    kind = sniff_head(read_head(source), filename)
+    if kind == DOCX and not is_docx(source):
+        return ""
+    return kind
+
+
+def sniff_head(head: bytes, filename: str = "") -> str:
+    """
+    Like sniff, from the first HEAD_BYTES of a file only (e.g. the first
+    chunk of an upload). Any zip is reported as DOCX, since the zip's
+    directory sits at the end of the file; sniff() checks it.
+    """
+    if b"%PDF-" in head:
+        return PDF
+    if head.startswith(b"PK\x03\x04"):
+        return DOCX
+    if head.startswith((b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a",
+                        b"II*\x00", b"MM\x00*", b"BM")):
+        return IMAGE
+
+    ext = os.path.splitext(filename.lower())[1]
+    kind = EXTENSIONS.get(ext, "")
+    if kind == TEXT or not ext:
+        # Plain text only for .txt files or files without an extension
+        return TEXT if _looks_like_text(head) else ""
+    return kind
+
+
+def is_docx(source: Source) -> bool:
+    """True for a zip holding a Word document; only its central directory is read."""
+    try:
+        with zipfile.ZipFile(source if isinstance(source, str) else io.BytesIO(source)) as z:
+            return "word/document.xml" in z.namelist()
+    except (zipfile.BadZipFile, OSError):
+        return False
+
+
+def _looks_like_text(head: bytes) -> bool:
+    if not head or b"\x00" in head:
+        return False
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is fine
+        return e.start >= len(head) - 3
+    return True
+
+
+# -----------------------------
+# EXTRACTION
+# -----------------------------
+
+def extract_text(source: Source, filename: str = "") -> str:
+    """Cleaned text of a resume file; "" when the type is unknown or nothing could be read."""
+    kind = sniff(source, filename)
+    if not kind:
+        return ""
+
+    best = ""
+    with metrics.stage(f"extract_{kind}"):
+        for backend in priority(kind):
+            text = _run(backend, source)
+            if len(text.strip()) > len(best.strip()):
+                best = text
+            if _usable(kind, best):
+                break
+    return clean_text(best)
+
+
+def _run(backend: Backend, source: Source) -> str:
+    try:
+        text = backend.extract(source) or ""
+    except ImportError as e:
+        with _lock:
+            _unavailable.add(f"{backend.kind}:{backend.name}")
+        logger.warning("%s extractor %s unavailable: %s", backend.kind, backend.name, e)
+        EXTRACTOR_RUNS.inc(kind=backend.kind, backend=backend.name, outcome="unavailable")
+        return ""
+    except Exception as e:
+        logger.warning("%s extractor %s failed: %s", backend.kind, backend.name, e)
+        EXTRACTOR_RUNS.inc(kind=backend.kind, backend=backend.name, outcome="error")
+        return ""
+
+    outcome = "ok" if text.strip() else "empty"
+    EXTRACTOR_RUNS.inc(kind=backend.kind, backend=backend.name, outcome=outcome)
+    return text
+
+
+def _usable(kind: str, text: str) -> bool:
+    stripped = text.strip()
+    return len(stripped) >= MIN_PDF_CHARS if kind == PDF else bool(stripped)
+
+
+def clean_text(text: str) -> str:
+    if not text:
+        return ""
+    text = text.replace("\r", "\n").replace("\t", " ")
+    text = text.replace("•", "\n- ")
+    lines = [l.strip() for l in text.splitlines() if l.strip()]
+    return "\n".join(lines)
+
+
+# -----------------------------
+# BACKENDS (imported lazily)
+# -----------------------------
+
+@register(PDF, "pymupdf")
+def _pymupdf(source: Source) -> str:
+    from .pdf_text import _fitz, extract_pdf_text
+
+    if _fitz() is None:
+        raise ImportError("PyMuPDF is not installed")
+    return extract_pdf_text(source, ocr_fallback=False, engine="pymupdf")
+
+
+@register(PDF, "pypdf2")
+def _pypdf2(source: Source) -> str:
+    from .pdf_text import extract_pdf_text
+
+    return extract_pdf_text(source, ocr_fallback=False, engine="pypdf2")
+
+
+@register(PDF, "pdfplumber")
+def _pdfplumber(source: Source) -> str:
+    import pdfplumber
+    from .pdf_text import PDF_MAX_PAGES, TEXT_MAX_CHARS
+
+    parts, total = [], 0
+    with pdfplumber.open(source if isinstance(source, str) else io.BytesIO(source)) as pdf:
+        for page in pdf.pages[:PDF_MAX_PAGES]:
+            text = page.extract_text() or ""
+            parts.append(text)
+            total += len(text) + 1
+            if total >= TEXT_MAX_CHARS:
+                break
+    return "\n".join(parts)[:TEXT_MAX_CHARS]
+
+
+@register(PDF, "ocr")
+def _ocr_pdf(source: Source) -> str:
+    from .ocr import ocr_pdf
+
+    return ocr_pdf(source)
+
+
+@register(DOCX, "python-docx")
+def _python_docx(source: Source) -> str:
+    import docx
+
+    document = docx.Document(source if isinstance(source, str) else io.BytesIO(source))
+    return "\n".join(p.text for p in document.paragraphs)
+
+
+@register(IMAGE, "tesseract")
+def _tesseract(source: Source) -> str:
+    from .ocr import ocr_image
+
+    return ocr_image(source)
+
+
+@register(TEXT, "plain")
+def _plain(source: Source) -> str:
+    from .pdf_text import TEXT_MAX_CHARS
+
+    # At most 4 bytes per character
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            data = f.read(TEXT_MAX_CHARS * 4)
+    else:
+        data = source[:TEXT_MAX_CHARS * 4]
+    return data.decode("utf-8", errors="ignore")[:TEXT_MAX_CHARS]
+
@@ -0,0 +1,175 @@
+# resumes/utils/json_stream.py
+"""
+Incremental parser for a JSON object arriving in pieces (a streamed LLM
+completion).
+
+Text before the opening brace (a code fence, "Here is the JSON:") is
+skipped, up to MAX_PREFIX_CHARS. From there the top-level structure is
+checked character by character, and each top-level value is decoded with
+json.loads as soon as its last character arrives, so:
+
+- fields are available while the rest of the object is still streaming
+- output that breaks the JSON structure, or a value that keeps growing
+  past MAX_VALUE_CHARS (a model repeating itself), raises MalformedJSON at
+  the first bad character instead of after the whole response
+
+Text after the closing brace is ignored.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+MAX_PREFIX_CHARS = 1000
+MAX_VALUE_CHARS = 20000
+
+# Parser states
+_PREFIX, _KEY_OR_END, _KEY, _COLON, _VALUE_START, _VALUE, _AFTER_VALUE, _DONE = range(8)
+
+_CLOSERS = {"{": "}", "[": "]"}
+_WHITESPACE = " \t\r\n"
+
+
+class MalformedJSON(ValueError):
+    """The text cannot be (the start of) a JSON object."""
+
+
+class JsonObjectStream:
+    """Feed chunks with feed(); completed top-level fields are in .fields."""
+
+    def __init__(self, max_prefix: int = MAX_PREFIX_CHARS, max_value: int = MAX_VALUE_CHARS):
+        self.max_prefix = max_prefix
+        self.max_value = max_value
+        self.fields: Dict[str, Any] = {}
+        self._state = _PREFIX
+        self._seen = 0
+        self._key: Optional[str] = None
+        self._token: List[str] = []
+        # Open brackets inside the current value, and string scanning state
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._scalar = False
+        self._after_comma = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def result(self) -> Dict[str, Any]:
+        if not self.done:
+            raise MalformedJSON("JSON object is incomplete")
+        return self.fields
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume the next piece of text; returns the keys it completed."""
+        completed: List[str] = []
+        for char in chunk:
+            if self._state == _DONE:
+                break
+            self._seen += 1
+            self._step(char, completed)
+        return completed
+
+    def _fail(self, message: str) -> None:
+        raise MalformedJSON(f"{message} at character {self._seen}")
+
+    def _step(self, char: str, completed: List[str]) -> None:
+        state = self._state
+
+        if state == _PREFIX:
+            if char == "{":
+                self._state = _KEY_OR_END
+            elif self._seen > self.max_prefix:
+                self._fail("No JSON object")
+
+        elif state in (_KEY, _VALUE):
+            if self._scalar and (char in _WHITESPACE or char in ",}"):
+                # Numbers, true, false and null end at the next delimiter
+                self._finish(completed)
+                if char not in _WHITESPACE:
+                    self._after_value(char)
+                return
+            self._token.append(char)
+            if len(self._token) > self.max_value:
+                self._fail(f"Value of {self._key!r} is too long")
+            if self._scan(char):
+                self._finish(completed)
+
+        elif char in _WHITESPACE:
+            return
+
+        elif state == _KEY_OR_END:
+            if char == '"':
+                self._token, self._in_string = [char], True
+                self._after_comma = False
+                self._state = _KEY
+            elif char == "}" and not self._after_comma:
+                self._state = _DONE
+            else:
+                self._fail(f"Expected a key, got {char!r}")
+
+        elif state == _COLON:
+            if char != ":":
+                self._fail(f"Expected ':', got {char!r}")
+            self._state = _VALUE_START
+
+        elif state == _VALUE_START:
+            self._token = [char]
+            self._state = _VALUE
+            if char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                self._stack = [char]
+            elif char.isalnum() or char == "-":
+                self._scalar = True
+            else:
+                self._fail(f"Expected a value, got {char!r}")
+
+        elif state == _AFTER_VALUE:
+            self._after_value(char)
+
+    def _scan(self, char: str) -> bool:
+        """Track strings and brackets in the current token; True once it is complete."""
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                return not self._stack
+            return False
+
+        if self._stack:
+            if char == '"':
+                self._in_string = True
+            elif char in _CLOSERS:
+                self._stack.append(char)
+            elif char in "]}":
+                if _CLOSERS[self._stack.pop()] != char:
+                    self._fail(f"Mismatched {char!r}")
+                return not self._stack
+        return False
+
+    def _finish(self, completed: List[str]) -> None:
+        text = "".join(self._token)
+        self._token, self._scalar = [], False
+        try:
+            value = json.loads(text)
+        except ValueError:
+            self._fail(f"Invalid JSON {text[:40]!r}")
+        if self._state == _KEY:
+            self._key = value
+            self._state = _COLON
+            return
+        self.fields[self._key] = value
+        completed.append(self._key)
+        self._state = _AFTER_VALUE
+
+    def _after_value(self, char: str) -> None:
+        if char == ",":
+            self._after_comma = True
+            self._state = _KEY_OR_END
+        elif char == "}":
+            self._state = _DONE
+        else:
+            self._fail(f"Expected ',' or '}}', got {char!r}")
@@ -0,0 +1,554 @@
+# resumes/utils/llm_client.py
+"""
+Groq call plumbing shared by the LLM parsers.
+
+- one pooled Groq client per process (connections are reused across calls)
+- a circuit breaker per model, so a model that keeps failing is skipped
+  until its cool-down expires
+- hedged requests: if the current model has not answered within
+  GROQ_HEDGE_DELAY seconds, the next model is started as well and the
+  first valid answer wins; hedged attempts are always streamed, so the
+  losers stop at their next chunk instead of running to GROQ_TIMEOUT
+- async twins (acomplete, ahedged_completion) on an AsyncGroq client, so
+  event-loop callers wait on the network without holding a thread each
+- optional streaming: with `stream_to`, each attempt's output is handed
+  over chunk by chunk as it arrives; a consumer that raises ValueError
+  (malformed output) cuts the attempt off, which counts as a failure, so
+  the next model starts right away instead of after the full bad answer
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Called with the model name when a streamed attempt starts; returns the
+# function fed with each piece of that attempt's output
+StreamConsumer = Callable[[str], Callable[[str], None]]
+
+GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
+
+GROQ_TIMEOUT = float(os.environ.get("GROQ_TIMEOUT", 30))
+GROQ_HEDGE_DELAY = float(os.environ.get("GROQ_HEDGE_DELAY", 4))
+# Deadline for a whole hedged call; 0: long enough for the last hedge to get
+# its full GROQ_TIMEOUT (GROQ_TIMEOUT + GROQ_HEDGE_DELAY per extra model)
+GROQ_TOTAL_TIMEOUT = float(os.environ.get("GROQ_TOTAL_TIMEOUT", 0))
+GROQ_MAX_CONNECTIONS = int(os.environ.get("GROQ_MAX_CONNECTIONS", 20))
+GROQ_BREAKER_THRESHOLD = int(os.environ.get("GROQ_BREAKER_THRESHOLD", 3))
+GROQ_BREAKER_COOLDOWN = float(os.environ.get("GROQ_BREAKER_COOLDOWN", 60))
+GROQ_STREAM = os.environ.get("GROQ_STREAM", "1").lower() not in ("0", "false", "no")
+
+if not GROQ_API_KEY:
+    logger.warning("⚠ GROQ_API_KEY not set. LLM extraction will fallback to local parser.")
+
+LLM_ATTEMPTS = metrics.counter(
+    "resume_llm_attempts_total", "Groq calls per model and outcome.", ("model", "outcome")
+)
+LLM_ATTEMPT_SECONDS = metrics.histogram(
+    "resume_llm_attempt_seconds", "Latency of single Groq calls, any outcome.", ("model",)
+)
+LLM_HEDGES = metrics.counter(
+    "resume_llm_hedges_total", "Models started early because the previous one was slow.", ("model",)
+)
+LLM_SKIPPED = metrics.counter(
+    "resume_llm_breaker_skips_total", "Models skipped because their circuit breaker was open.", ("model",)
+)
+LLM_BREAKER_OPEN = metrics.gauge(
+    "resume_llm_breaker_open", "1 while a model's circuit breaker is open.", ("model",)
+)
+
+_client = None
+_client_lock = threading.Lock()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_client():
+    """Shared Groq client, or None when no API key is configured."""
+    global _client
+    if not GROQ_API_KEY:
+        return None
+    with _client_lock:
+        if _client is None:
+            import httpx
+            from groq import DefaultHttpxClient, Groq
+
+            http_client = DefaultHttpxClient(
+                timeout=GROQ_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=GROQ_MAX_CONNECTIONS,
+                ),
+            )
+            # Retries are handled by hedging/fallback across models instead.
+            _client = Groq(
+                api_key=GROQ_API_KEY,
+                timeout=GROQ_TIMEOUT,
+                max_retries=0,
+                http_client=http_client,
+            )
+        return _client
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=GROQ_MAX_CONNECTIONS, thread_name_prefix="groq"
+            )
+        return _executor
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures. While open, calls are
+    rejected until `cooldown` seconds have passed; then a single trial call
+    is let through (half-open) and its outcome closes or re-opens it.
+    """
+
+    def __init__(self, threshold: int = GROQ_BREAKER_THRESHOLD, cooldown: float = GROQ_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                # half-open: let one trial through, block the rest for another cool-down
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker()
+        return _breakers[model]
+
+
+def update_breaker_metrics() -> None:
+    with _breakers_lock:
+        breakers = list(_breakers.items())
+    for model, breaker in breakers:
+        LLM_BREAKER_OPEN.set(int(breaker.is_open), model=model)
+
+
+class ModelsUnavailable(RuntimeError):
+    """Every model is skipped by its open circuit breaker."""
+
+
+class AttemptCancelled(Exception):
+    """A streamed attempt was stopped because another model already answered."""
+
+
+def is_timeout(error: Exception) -> bool:
+    """True for our deadlines and the client's (groq.APITimeoutError, httpx.TimeoutException)."""
+    return isinstance(error, TimeoutError) or "timeout" in type(error).__name__.lower()
+
+
+def _outcome(error: Exception) -> str:
+    if is_timeout(error):
+        return "timeout"
+    if isinstance(error, ValueError):
+        return "invalid"
+    return "error"
+
+
+def _response_content(res, model: str, validate: Optional[Callable[[str], Any]]) -> str:
+    content = ""
+    if hasattr(res, "choices") and res.choices:
+        content = (res.choices[0].message.content or "").strip()
+    return _checked_content(content, model, validate)
+
+
+def _stream_content(chunks, model: str, validate: Optional[Callable[[str], Any]],
+                    consume: Callable[[str], None], stop: Optional[threading.Event]) -> str:
+    parts = []
+    for chunk in chunks:
+        if stop is not None and stop.is_set():
+            raise AttemptCancelled(model)
+        piece = chunk.choices[0].delta.content if chunk.choices else None
+        if piece:
+            parts.append(piece)
+            consume(piece)
+    return _checked_content("".join(parts).strip(), model, validate)
+
+
+def _checked_content(content: str, model: str, validate: Optional[Callable[[str], Any]]) -> str:
+    if not content:
+        raise ValueError(f"Model {model} returned an empty response")
+    if validate is not None:
+        validate(content)
+    return content
+
+
+def _record_attempt(model: str, started: float, error: Optional[Exception] = None) -> None:
+    LLM_ATTEMPT_SECONDS.observe(time.perf_counter() - started, model=model)
+    if isinstance(error, AttemptCancelled):
+        # Says nothing about the model's health
+        LLM_ATTEMPTS.inc(model=model, outcome="cancelled")
+        return
+    breaker = get_breaker(model)
+    if error is None:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    LLM_ATTEMPTS.inc(model=model, outcome="ok" if error is None else _outcome(error))
+
+
+def complete(model: str, prompt: str, validate: Optional[Callable[[str], Any]] = None,
+             stream_to: Optional[StreamConsumer] = None,
+             stop: Optional[threading.Event] = None) -> str:
+    """
+    Single chat completion against one model, recorded on its breaker.
+    With stream_to, the response is streamed into it and abandoned once
+    `stop` is set.
+    """
+    client = get_client()
+    if client is None:
+        raise RuntimeError("GROQ_API_KEY missing; cannot call LLM.")
+
+    started = time.perf_counter()
+    try:
+        res = client.chat.completions.create(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            timeout=GROQ_TIMEOUT,
+            stream=stream_to is not None,
+        )
+        if stream_to is None:
+            content = _response_content(res, model, validate)
+        else:
+            try:
+                content = _stream_content(res, model, validate, stream_to(model), stop)
+            finally:
+                # Closing the response is what cuts a bad or unwanted answer off
+                res.close()
+    except Exception as e:
+        _record_attempt(model, started, e)
+        raise
+
+    _record_attempt(model, started)
+    return content
+
+
+def _ignore_stream(model: str) -> Callable[[str], None]:
+    return lambda piece: None
+
+
+def total_timeout(model_count: int, hedge_delay: float = GROQ_HEDGE_DELAY) -> float:
+    """Overall deadline of a hedged call, so a late hedge still gets its own full timeout."""
+    if GROQ_TOTAL_TIMEOUT > 0:
+        return GROQ_TOTAL_TIMEOUT
+    return GROQ_TIMEOUT + hedge_delay * max(0, model_count - 1)
+
+
+def _next_model(remaining: List[str]) -> Optional[str]:
+    """
+    Pop the next model whose circuit breaker lets a call through. Asked only
+    right before a launch: a half-open breaker's single trial call must not
+    go to a model that is never started.
+    """
+    while remaining:
+        model = remaining.pop(0)
+        if get_breaker(model).allow():
+            return model
+        LLM_SKIPPED.inc(model=model)
+    return None
+
+
+def hedged_completion(
+    prompt: str,
+    models: List[str],
+    validate: Optional[Callable[[str], Any]] = None,
+    hedge_delay: float = GROQ_HEDGE_DELAY,
+    timeout: Optional[float] = None,
+    stream_to: Optional[StreamConsumer] = None,
+) -> str:
+    """
+    Return the first valid completion from `models`, tried in order.
+
+    The next model is started when the previous one fails, or when it has
+    not answered after `hedge_delay` seconds. Models whose circuit breaker
+    is open are skipped. `validate` should raise on unusable output.
+    Attempts are streamed even without stream_to: those still running when
+    this returns stop at their next chunk instead of holding a pool thread
+    and a connection until GROQ_TIMEOUT.
+    `timeout` bounds the whole call (default: total_timeout()).
+    """
+    if get_client() is None:
+        raise RuntimeError("GROQ_API_KEY missing; cannot call LLM.")
+
+    executor = _get_executor()
+    pending = {}
+    errors: List[Exception] = []
+    attempted: List[str] = []
+    remaining = list(models)
+    timeout = total_timeout(len(models), hedge_delay) if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    stop = threading.Event()
+
+    def launch() -> bool:
+        model = _next_model(remaining)
+        if model is None:
+            return False
+        logger.info(f"Trying Groq model: {model}")
+        # Always streamed, so `stop` can end an attempt that lost
+        consumer = stream_to or _ignore_stream
+        pending[executor.submit(complete, model, prompt, validate, consumer, stop)] = model
+        attempted.append(model)
+        return True
+
+    if not launch():
+        raise ModelsUnavailable("All models are temporarily disabled by their circuit breakers.")
+    try:
+        while pending:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            wait_for = min(hedge_delay, left) if remaining else left
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            if not done:
+                if remaining and launch():
+                    logger.info("No answer after %.1fs, hedged with %s", hedge_delay, attempted[-1])
+                    LLM_HEDGES.inc(model=attempted[-1])
+                continue
+
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    content = future.result()
+                except Exception as e:
+                    logger.error(f"Model {model} failed: {e}")
+                    errors.append(e)
+                else:
+                    metrics.note(model=model, models_tried=attempted)
+                    return content
+
+            if not pending and remaining:
+                launch()
+
+        metrics.note(models_tried=attempted)
+        if pending:
+            raise TimeoutError(f"No model answered within {timeout:.0f}s")
+        raise errors[-1] if errors else RuntimeError("No model succeeded.")
+    finally:
+        # Attempts still queued never start; running ones stop at their next chunk
+        for future in pending:
+            future.cancel()
+        stop.set()
+
+
+# -----------------------------
+# ASYNC CLIENT
+# -----------------------------
+
+# httpx async connections belong to the event loop that opened them, so
+# each loop gets its own client, plus a semaphore holding calls beyond the
+# pool size (waiting inside httpx's pool would count toward the timeout).
+# Each client gets a closer task that waits until the loop cancels its
+# tasks on shutdown (asyncio.run does) and then closes the client's
+# connections; a loop that runs forever keeps its one client.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_async_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_async_closers: Set["asyncio.Task[None]"] = set()
+
+
+async def _close_on_shutdown(client) -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        with _client_lock:
+            if _async_clients.get(loop) is client:
+                del _async_clients[loop]
+        await client.close()
+
+
+def get_async_client():
+    """AsyncGroq client for the running event loop, or None when no API key is configured."""
+    if not GROQ_API_KEY:
+        return None
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            import httpx
+            from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+            http_client = DefaultAsyncHttpxClient(
+                timeout=GROQ_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=GROQ_MAX_CONNECTIONS,
+                    max_keepalive_connections=GROQ_MAX_CONNECTIONS,
+                ),
+            )
+            client = _async_clients[loop] = AsyncGroq(
+                api_key=GROQ_API_KEY,
+                timeout=GROQ_TIMEOUT,
+                max_retries=0,
+                http_client=http_client,
+            )
+            closer = loop.create_task(_close_on_shutdown(client))
+            _async_closers.add(closer)
+            closer.add_done_callback(_async_closers.discard)
+        return client
+
+
+def _call_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _client_lock:
+        slots = _async_slots.get(loop)
+        if slots is None:
+            slots = _async_slots[loop] = asyncio.Semaphore(GROQ_MAX_CONNECTIONS)
+        return slots
+
+
+async def _astream_content(chunks, model: str, validate: Optional[Callable[[str], Any]],
+                           consume: Callable[[str], None]) -> str:
+    parts = []
+    async for chunk in chunks:
+        piece = chunk.choices[0].delta.content if chunk.choices else None
+        if piece:
+            parts.append(piece)
+            consume(piece)
+    return _checked_content("".join(parts).strip(), model, validate)
+
+
+async def acomplete(model: str, prompt: str, validate: Optional[Callable[[str], Any]] = None,
+                    stream_to: Optional[StreamConsumer] = None) -> str:
+    """complete() for async callers; a streamed attempt is stopped by cancelling it."""
+    client = get_async_client()
+    if client is None:
+        raise RuntimeError("GROQ_API_KEY missing; cannot call LLM.")
+
+    async with _call_slots():
+        started = time.perf_counter()
+        try:
+            res = await client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0,
+                timeout=GROQ_TIMEOUT,
+                stream=stream_to is not None,
+            )
+            if stream_to is None:
+                content = _response_content(res, model, validate)
+            else:
+                try:
+                    content = await _astream_content(res, model, validate, stream_to(model))
+                finally:
+                    await res.close()
+        except Exception as e:
+            _record_attempt(model, started, e)
+            raise
+
+    _record_attempt(model, started)
+    return content
+
+
+async def ahedged_completion(
+    prompt: str,
+    models: List[str],
+    validate: Optional[Callable[[str], Any]] = None,
+    hedge_delay: float = GROQ_HEDGE_DELAY,
+    timeout: Optional[float] = None,
+    stream_to: Optional[StreamConsumer] = None,
+) -> str:
+    """
+    hedged_completion() for async callers. Attempts are tasks instead of
+    pool threads; the ones still running when a model answers are cancelled.
+    """
+    if get_async_client() is None:
+        raise RuntimeError("GROQ_API_KEY missing; cannot call LLM.")
+
+    pending: Dict[asyncio.Future, str] = {}
+    errors: List[Exception] = []
+    attempted: List[str] = []
+    remaining = list(models)
+    timeout = total_timeout(len(models), hedge_delay) if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+
+    def launch() -> bool:
+        model = _next_model(remaining)
+        if model is None:
+            return False
+        logger.info(f"Trying Groq model: {model}")
+        pending[asyncio.ensure_future(acomplete(model, prompt, validate, stream_to))] = model
+        attempted.append(model)
+        return True
+
+    if not launch():
+        raise ModelsUnavailable("All models are temporarily disabled by their circuit breakers.")
+    try:
+        while pending:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                break
+            wait_for = min(hedge_delay, left) if remaining else left
+            done, _ = await asyncio.wait(
+                list(pending), timeout=wait_for, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if not done:
+                if remaining and launch():
+                    logger.info("No answer after %.1fs, hedged with %s", hedge_delay, attempted[-1])
+                    LLM_HEDGES.inc(model=attempted[-1])
+                continue
+
+            for task in done:
+                model = pending.pop(task)
+                try:
+                    content = task.result()
+                except Exception as e:
+                    logger.error(f"Model {model} failed: {e}")
+                    errors.append(e)
+                else:
+                    metrics.note(model=model, models_tried=attempted)
+                    return content
+
+            if not pending and remaining:
+                launch()
+
+        metrics.note(models_tried=attempted)
+        if pending:
+            raise TimeoutError(f"No model answered within {timeout:.0f}s")
+        raise errors[-1] if errors else RuntimeError("No model succeeded.")
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,113 +1,176 @@
 # resumes/utils/llm_parser.py
 import os
-import io
 import re
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List
-
-from groq import Groq
-from PyPDF2 import PdfReader
-import docx
-from PIL import Image
-import pytesseract
+import threading
+import time
+from typing import Dict, Any, List, Optional, Callable, Union
+
+from . import extractors, metrics
+from .compaction import Compacted, compact, estimate_tokens
+from .json_stream import JsonObjectStream, MalformedJSON
+from .llm_client import (
+    GROQ_STREAM,
+    ModelsUnavailable,
+    StreamConsumer,
+    ahedged_completion,
+    get_client,
+    hedged_completion,
+    is_timeout,
+)
+from .local_extractor import extract_fields
 
 logger = logging.getLogger(__name__)
 
-# Optional Tesseract path
-TESSERACT_CMD = os.environ.get("TESSERACT_CMD")
-if TESSERACT_CMD:
-    pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
-
-# Groq client
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
-if not GROQ_API_KEY:
-    logger.warning("⚠ GROQ_API_KEY not set. LLM extraction will fallback to local parser.")
-    client = None
-else:
-    client = Groq(api_key=GROQ_API_KEY)
-
-# Models list (use in fallback order)
-GROQ_MODELS = [
+# Models list (use in fallback order); GROQ_MODELS="a,b" overrides it
+GROQ_MODELS = [m.strip() for m in os.environ.get("GROQ_MODELS", "").split(",") if m.strip()] or [
     "llama-3.3-70b-specdec",
     "llama-3.3-70b-versatile",
     "llama-3.2-90b-text-preview",
 ]
 
-# -----------------------------
-# FILE TEXT EXTRACTION
-# -----------------------------
-def extract_text_from_uploaded_file(uploaded_file) -> str:
-    filename = getattr(uploaded_file, "name", "").lower()
-    file_bytes = uploaded_file.read()
+# Bump when parsing code changes in a way the prompts and models don't show
+# (e.g. normalize_parsed), so stored resumes count as stale for `reparse`
+PARSER_REVISION = "1"
+
+# Stamped on resumes parsed by the local fallback; never current
+LOCAL_PARSER_VERSION = "local"
+
+PARSES = metrics.counter(
+    "resume_parses_total", "Resumes parsed, by where the result came from.", ("source",)
+)
+LLM_FALLBACKS = metrics.counter(
+    "resume_llm_fallbacks_total", "Resumes parsed locally because the LLM was not usable.", ("reason",)
+)
+LLM_BATCH_FAILURES = metrics.counter(
+    "resume_llm_batch_failures_total", "Batch LLM calls whose resumes were re-parsed one by one.", ("reason",)
+)
+PROMPT_TOKENS = metrics.counter(
+    "resume_prompt_tokens_total", "Estimated resume tokens before and after prompt compaction.", ("text",)
+)
+FIRST_FIELDS_SECONDS = metrics.histogram(
+    "resume_llm_first_fields_seconds", "Time from the start of a streamed parse to its first preview fields."
+)
+
+# Fields reported to on_fields callbacks while the rest of a streamed
+# answer is still coming, in the order RESUME_JSON_KEYS asks for them
+PREVIEW_FIELDS = (
+    "name", "email", "mobile", "years_of_experience", "recent_employer",
+    "recent_designation", "current_location", "skills",
+)
+# Minimum seconds between two previews of one parse (the last field always goes out)
+PREVIEW_INTERVAL = 0.25
+
+FieldsCallback = Callable[[Dict[str, Any]], None]
+
+RESUME_JSON_KEYS = """{{
+  "name": "",
+  "email": "",
+  "mobile": "",
+  "years_of_experience": "",
+  "highest_qualification": "",
+  "recent_employer": "",
+  "recent_designation": "",
+  "current_location": "",
+  "skills": [],
+  "experience_timeline": [{{"company": "", "designation": "", "start": "", "end": ""}}],
+  "experience": "",
+  "education": "",
 
-    try:
-        uploaded_file.seek(0)
-    except Exception:
-        pass
+  "professional_summary": "",
+  "ats_score": 0,
+  "ats_improvement_tips": [],
+  "strengths": [],
+  "weaknesses": [],
+  "skill_gaps": []
+}}"""
 
-    if filename.endswith(".pdf"):
-        return extract_text_from_pdf_bytes(file_bytes)
+RESUME_RULES = """RULES:
+- Do not invent details not in resume.
+- Missing fields → empty strings/lists.
+- ats_score must be an integer 0–100.
+- An email or phone found beforehand may have been removed from the text; report any
+  email or phone you still see."""
 
-    if filename.endswith(".docx"):
-        return extract_text_from_docx_bytes(file_bytes)
+RESUME_PROMPT_TEMPLATE = """
+Extract structured information from this resume.
 
-    if filename.endswith((".png", ".jpg", ".jpeg", ".tiff", ".bmp", ".gif")):
-        return extract_text_from_image_bytes(file_bytes)
+Return ONLY valid JSON with keys:
 
-    return ""
+""" + RESUME_JSON_KEYS + """
 
+""" + RESUME_RULES + """
+- JSON only.
 
-def extract_text_from_pdf_bytes(b: bytes) -> str:
-    try:
-        reader = PdfReader(io.BytesIO(b))
-        pages = []
-        for p in reader.pages:
-            try:
-                pages.append(p.extract_text() or "")
-            except Exception:
-                continue
-        return clean_text("\n".join(pages))
-    except Exception as e:
-        logger.exception("PDF extraction error: %s", e)
-        return ""
+Resume text:
+\"\"\"{resume_text}\"\"\""""
 
+# Several resumes per call; {resumes} is a sequence of numbered blocks.
+RESUME_BATCH_PROMPT_TEMPLATE = """
+Extract structured information from each of the resumes below.
 
-def extract_text_from_docx_bytes(b: bytes) -> str:
-    try:
-        doc = docx.Document(io.BytesIO(b))
-        lines = [p.text.strip() for p in doc.paragraphs if p.text.strip()]
-        return clean_text("\n".join(lines))
-    except Exception as e:
-        logger.exception("DOCX extraction error: %s", e)
-        return ""
+Return ONLY a valid JSON array with exactly one object per resume, in the
+same order. Each object must have an "index" key with the resume number,
+plus these keys:
+
+""" + RESUME_JSON_KEYS + """
+
+""" + RESUME_RULES + """
+- Never mix details between resumes.
+- JSON array only.
+
+{resumes}"""
+
+RESUME_BATCH_ITEM_TEMPLATE = """Resume {index}:
+\"\"\"{resume_text}\"\"\""""
+
+
+def parser_version() -> str:
+    """Fingerprint of the parser revision, prompts and model list used for LLM parsing."""
+    stamp = "|".join([PARSER_REVISION, RESUME_PROMPT_TEMPLATE, RESUME_BATCH_PROMPT_TEMPLATE] + GROQ_MODELS)
+    return hashlib.sha256(stamp.encode("utf-8")).hexdigest()[:16]
+
+
+def result_version(data: Dict[str, Any]) -> str:
+    """Version to stamp on a resume parsed into `data`."""
+    if data.get("parser_version"):
+        # Copied from an earlier parse (near-duplicates): keeps its version
+        return data["parser_version"]
+    return parser_version() if data.get("source") == "llm" else LOCAL_PARSER_VERSION
+
+
+# -----------------------------
+# FILE TEXT EXTRACTION
+# -----------------------------
+def extract_text_from_uploaded_file(uploaded_file) -> str:
+    filename = getattr(uploaded_file, "name", "")
+    if hasattr(uploaded_file, "temporary_file_path"):
+        # Streamed to disk by the upload handler: read it from there
+        return extract_text_from_bytes(uploaded_file.temporary_file_path(), filename)
 
+    file_bytes = uploaded_file.read()
 
-def extract_text_from_image_bytes(b: bytes) -> str:
     try:
-        img = Image.open(io.BytesIO(b))
-        text = pytesseract.image_to_string(img)
-        return clean_text(text)
-    except Exception as e:
-        logger.exception("OCR error: %s", e)
-        return ""
+        uploaded_file.seek(0)
+    except Exception:
+        pass
+
+    return extract_text_from_bytes(file_bytes, filename)
 
 
-def clean_text(text: str) -> str:
-    if not text:
-        return ""
-    text = text.replace("\r", "\n").replace("\t", " ")
-    text = text.replace("•", "\n- ")
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    return "\n".join(lines)
+def extract_text_from_bytes(source: Union[bytes, str], filename: str) -> str:
+    """
+    Cleaned text of a resume file given as raw bytes or a path (see
+    extractors for type sniffing and backends).
+    """
+    return extractors.extract_text(source, filename)
 
 # -----------------------------
 # LOCAL FALLBACK PARSER
 # -----------------------------
 
-EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_RE = re.compile(r"(\+?\d[\d\-\s]{6,}\d)")
-
 def quick_local_parse(resume_text: str) -> Dict[str, Any]:
 
     data = {
@@ -115,67 +178,25 @@ def quick_local_parse(resume_text: str) -> Dict[str, Any]:
         "email": "",
         "mobile": "",
         "skills": [],
-        "experience": "",          # ✅ ADD
-        "education": "",           # ✅ ADD
+        "experience": "",
+        "education": "",
         "professional_summary": "",
+        "experience_timeline": [],
         "ats_score": 0,
         "ats_improvement_tips": [],
         "strengths": [],
         "weaknesses": [],
         "skill_gaps": [],
+        "source": "local",
     }
 
-
     if not resume_text:
         return data
 
-    # EMAIL
-    e = EMAIL_RE.search(resume_text)
-    if e:
-        data["email"] = e.group(0)
-
-    # PHONE
-    p = PHONE_RE.search(resume_text)
-    if p:
-        data["mobile"] = re.sub(r"\s+", " ", p.group(0))
-
-    # SKILLS
-    lower = resume_text.lower()
-    if "skills" in lower:
-        idx = lower.find("skills")
-        snippet = resume_text[idx:idx + 350]
-        words = re.findall(r"[A-Za-z+#\.\-]{3,}", snippet)
-        data["skills"] = list(dict.fromkeys(words))[:20]
-
-    # EXPERIENCE TIMELINE
-    ranges = re.findall(r"(\b(?:19|20)\d{2}\b)[^\d]{0,5}(\b(?:19|20)\d{2}\b)", resume_text)
-    for s, e in ranges:
-        data["experience_timeline"].append({
-            "company": "",
-            "designation": "",
-            "start": s,
-            "end": e,
-        })
-
-    # Simple ATS score
-    def calculate_ats_score(resume):
-        score = 0
-        total = 6
-
-        if resume.name:
-            score += 1
-        if resume.email:
-            score += 1
-        if resume.mobile:
-            score += 1
-        if resume.skills:
-            score += 1
-        if resume.experience:
-            score += 1
-        if resume.education:
-            score += 1
-
-        return int((score / total) * 100)
+    # Single pass over the text (see local_extractor)
+    fields = extract_fields(resume_text)
+    data["professional_summary"] = fields.pop("summary")
+    data.update(fields)
 
     if data["ats_score"] < 50:
         data["ats_improvement_tips"] = [
@@ -194,102 +215,335 @@ def quick_local_parse(resume_text: str) -> Dict[str, Any]:
 # LLM CALL + FALLBACK LOGIC
 # -----------------------------
 
-def call_model_with_fallback(prompt: str, models: List[str]) -> str:
-    if client is None:
-        raise RuntimeError("GROQ_API_KEY missing; cannot call LLM.")
+def call_model_with_fallback(
+    prompt: str, models: List[str], validate: Optional[Callable[[str], Any]] = None,
+    stream_to: Optional[StreamConsumer] = None,
+) -> str:
+    """
+    First valid completion across `models`. Slow models are hedged and
+    failing ones are skipped by their circuit breakers (see llm_client).
+    With stream_to, answers are streamed into it as they arrive.
+    """
+    return hedged_completion(prompt, models, validate=validate, stream_to=stream_to)
 
-    last_error = None
 
-    for model in models:
+def loads_json_object(raw: str) -> Dict[str, Any]:
+    """Parse model output as a JSON object, tolerating text around it."""
+    try:
+        parsed = json.loads(raw)
+    except Exception:
+        stream = JsonObjectStream()
+        stream.feed(raw)
+        parsed = stream.result()
+
+    if not isinstance(parsed, dict):
+        raise ValueError("Model output is not a JSON object")
+    return parsed
+
+
+def fallback_reason(error: Exception) -> str:
+    """Short label for why an LLM call produced no usable result."""
+    if isinstance(error, ModelsUnavailable):
+        return "breaker_open"
+    if is_timeout(error):
+        return "timeout"
+    if isinstance(error, ValueError):
+        return "invalid_output"
+    return "error"
+
+
+def compact_for_prompt(resume_text: str) -> Compacted:
+    """compact() the text for a prompt, recording the tokens it saved."""
+    with metrics.stage("compact"):
+        compacted = compact(resume_text)
+    PROMPT_TOKENS.inc(compacted.tokens_before, text="original")
+    PROMPT_TOKENS.inc(compacted.tokens_after, text="compacted")
+    metrics.note(prompt_tokens=compacted.tokens_after, tokens_saved=compacted.tokens_saved)
+    return compacted
+
+
+def with_contacts(parsed: Dict[str, Any], compacted: Compacted) -> Dict[str, Any]:
+    """Put back the email and phone compaction took out; the model's are the fallback."""
+    parsed["email"] = compacted.email or parsed.get("email") or ""
+    parsed["mobile"] = compacted.mobile or parsed.get("mobile") or ""
+    return parsed
+
+
+class StreamedParse:
+    """
+    stream_to consumer for one resume parse. Each model attempt is fed into
+    its own JsonObjectStream, so malformed output fails that attempt at the
+    first bad character. Preview fields go to `on_fields` from one attempt
+    only: the first to produce some, or the next one if it turns out bad.
+    """
+
+    def __init__(self, compacted: Compacted, on_fields: Optional[FieldsCallback] = None):
+        self.compacted = compacted
+        self.on_fields = on_fields
+        self.started = time.perf_counter()
+        self.first_fields_after: Optional[float] = None
+        self._leader: Optional[str] = None
+        self._sent_at = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, model: str) -> Callable[[str], None]:
+        stream = JsonObjectStream()
+
+        def consume(piece: str) -> None:
+            try:
+                completed = stream.feed(piece)
+            except MalformedJSON:
+                with self._lock:
+                    if self._leader == model:
+                        self._leader = None
+                raise
+            if self.on_fields is not None and any(k in PREVIEW_FIELDS for k in completed):
+                self._preview(model, stream.fields, PREVIEW_FIELDS[-1] in completed)
+
+        return consume
+
+    def _preview(self, model: str, fields: Dict[str, Any], last: bool) -> None:
+        with self._lock:
+            if self._leader not in (None, model):
+                return
+            self._leader = model
+            now = time.perf_counter()
+            if not last and now - self._sent_at < PREVIEW_INTERVAL:
+                return
+            self._sent_at = now
+            if self.first_fields_after is None:
+                self.first_fields_after = now - self.started
+        preview = {k: fields[k] for k in PREVIEW_FIELDS if k in fields}
+        if not isinstance(preview.get("skills", []), list):
+            del preview["skills"]
         try:
-            logger.info(f"Trying Groq model: {model}")
-            res = client.chat.completions.create(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0
-            )
-
-            if hasattr(res, "choices") and res.choices:
-                content = res.choices[0].message.content.strip()
-                if content:
-                    return content
+            self.on_fields(with_contacts(preview, self.compacted))
         except Exception as e:
-            logger.error(f"Model {model} failed: {e}")
-            last_error = e
-            continue
+            # A preview that cannot be shown must not fail the parse
+            logger.warning("Preview callback failed: %s", e)
+
+    def record(self) -> None:
+        if self.first_fields_after is not None:
+            FIRST_FIELDS_SECONDS.observe(self.first_fields_after)
+            metrics.note(first_fields_seconds=round(self.first_fields_after, 3))
 
-    raise last_error if last_error else RuntimeError("No model succeeded.")
 
-def parse_resume_with_llm(resume_text: str) -> Dict[str, Any]:
+def _stream_consumer(compacted: Compacted,
+                     on_fields: Optional[FieldsCallback]) -> Optional[StreamedParse]:
+    return StreamedParse(compacted, on_fields) if GROQ_STREAM else None
 
+
+def parse_resume_with_llm(resume_text: str,
+                          on_fields: Optional[FieldsCallback] = None) -> Dict[str, Any]:
+    """
+    Parse one resume with the LLM, falling back to the local parser. With
+    streaming on (GROQ_STREAM), on_fields is called with the PREVIEW_FIELDS
+    that are complete while the rest of the answer is still streaming.
+    """
     if not resume_text.strip():
-        return quick_local_parse(resume_text)
+        return _local_fallback(resume_text, "empty_text")
+    if get_client() is None:
+        return _local_fallback(resume_text, "no_api_key")
 
-    prompt = f"""
-Extract structured information from this resume.
+    compacted = compact_for_prompt(resume_text)
+    prompt = RESUME_PROMPT_TEMPLATE.format(resume_text=compacted.text)
+    streamed = _stream_consumer(compacted, on_fields)
 
-Return ONLY valid JSON with keys:
+    try:
+        with metrics.stage("llm"):
+            raw = call_model_with_fallback(
+                prompt, GROQ_MODELS, validate=loads_json_object, stream_to=streamed
+            )
+            parsed = with_contacts(normalize_parsed(loads_json_object(raw)), compacted)
+        if streamed is not None:
+            streamed.record()
+        PARSES.inc(source="llm")
+        return parsed
 
-{{
-  "name": "",
-  "email": "",
-  "mobile": "",
-  "years_of_experience": "",
-  "highest_qualification": "",
-  "recent_employer": "",
-  "recent_designation": "",
-  "current_location": "",
-  "skills": [],
-  "experience_timeline": [{{"company": "", "designation": "", "start": "", "end": ""}}],
-  "experience": "",
-  "education": "",
+    except Exception as e:
+        logger.error("LLM failed. Using local parser. Error: %s", e)
+        return _local_fallback(resume_text, fallback_reason(e))
 
-  "professional_summary": "",
-  "ats_score": 0,
-  "ats_improvement_tips": [],
-  "strengths": [],
-  "weaknesses": [],
-  "skill_gaps": []
-}}
 
-RULES:
-- Do not invent details not in resume.
-- Missing fields → empty strings/lists.
-- ats_score must be an integer 0–100.
-- JSON only.
+async def aparse_resume_with_llm(resume_text: str,
+                                 on_fields: Optional[FieldsCallback] = None) -> Dict[str, Any]:
+    """parse_resume_with_llm for async callers: the Groq call is awaited, not run on a thread."""
+    if not resume_text.strip():
+        return _local_fallback(resume_text, "empty_text")
+    if get_client() is None:
+        return _local_fallback(resume_text, "no_api_key")
+
+    compacted = compact_for_prompt(resume_text)
+    prompt = RESUME_PROMPT_TEMPLATE.format(resume_text=compacted.text)
+    streamed = _stream_consumer(compacted, on_fields)
+
+    try:
+        with metrics.stage("llm"):
+            raw = await ahedged_completion(
+                prompt, GROQ_MODELS, validate=loads_json_object, stream_to=streamed
+            )
+            parsed = with_contacts(normalize_parsed(loads_json_object(raw)), compacted)
+        if streamed is not None:
+            streamed.record()
+        PARSES.inc(source="llm")
+        return parsed
+
+    except Exception as e:
+        logger.error("LLM failed. Using local parser. Error: %s", e)
+        return _local_fallback(resume_text, fallback_reason(e))
+
+
+def _local_fallback(resume_text: str, reason: str) -> Dict[str, Any]:
+    LLM_FALLBACKS.inc(reason=reason)
+    PARSES.inc(source="local")
+    metrics.note(fallback_reason=reason)
+    with metrics.stage("local_parse"):
+        return quick_local_parse(resume_text)
 
-Resume text:
-\"\"\"{resume_text}\"\"\""""
+
+def normalize_parsed(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill defaults and coerce types on a parsed LLM result."""
+    defaults = quick_local_parse("")
+
+    for k, v in defaults.items():
+        parsed.setdefault(k, v)
+
+    if not isinstance(parsed.get("skills"), list):
+        parsed["skills"] = []
+
+    if not isinstance(parsed.get("experience_timeline"), list):
+        parsed["experience_timeline"] = []
 
     try:
-        raw = call_model_with_fallback(prompt, GROQ_MODELS)
+        parsed["ats_score"] = int(parsed.get("ats_score") or 0)
+    except:
+        parsed["ats_score"] = 0
 
-        try:
-            parsed = json.loads(raw)
-        except Exception:
-            match = re.search(r"\{.*\}", raw, re.DOTALL)
-            parsed = json.loads(match.group(0)) if match else {}
+    parsed["source"] = "llm"
+    return parsed
+
+
+# -----------------------------
+# BATCHED LLM PARSING
+# -----------------------------
 
-        defaults = quick_local_parse("")
-        if not isinstance(parsed, dict):
-            parsed = {}
+# Rough budget for the resume text packed into one batch prompt
+GROQ_BATCH_TOKEN_BUDGET = int(os.environ.get("GROQ_BATCH_TOKEN_BUDGET", 6000))
+GROQ_BATCH_MAX_ITEMS = int(os.environ.get("GROQ_BATCH_MAX_ITEMS", 8))
 
-        for k, v in defaults.items():
-            parsed.setdefault(k, v)
 
-        if not isinstance(parsed.get("skills"), list):
-            parsed["skills"] = []
+def pack_batches(texts: List[str], token_budget: int = GROQ_BATCH_TOKEN_BUDGET,
+                 max_items: int = GROQ_BATCH_MAX_ITEMS) -> List[List[int]]:
+    """Group text indices into batches that fit the token budget, keeping order."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
 
-        if not isinstance(parsed.get("experience_timeline"), list):
-            parsed["experience_timeline"] = []
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if current and (used + cost > token_budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += cost
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def loads_json_array(raw: str) -> List[Any]:
+    """Parse model output as a JSON array, tolerating text around it."""
+    try:
+        parsed = json.loads(raw)
+    except Exception:
+        match = re.search(r"\[.*\]", raw, re.DOTALL)
+        if not match:
+            raise ValueError("No JSON array in model output")
+        parsed = json.loads(match.group(0))
+
+    if not isinstance(parsed, list):
+        raise ValueError("Model output is not a JSON array")
+    return parsed
+
+
+def _belongs_to(item: Dict[str, Any], resume_text: str, compacted: Compacted) -> bool:
+    # Guard against results shifted onto the wrong resume: every email,
+    # phone and name the result reports must match that resume, and it
+    # must report at least one of them
+    text = resume_text.lower()
+    email = str(item.get("email") or "").strip().lower()
+    mobile = re.sub(r"\D", "", str(item.get("mobile") or ""))
+    name = str(item.get("name") or "").lower().split()
+    if not (email or mobile or name):
+        return False
+    if email and email != compacted.email.lower() and email not in text:
+        return False
+    # Only the last 7 digits are compared, so a country code or trunk 0 the
+    # model added or dropped does not count as a mismatch
+    if mobile and mobile[-7:] not in re.sub(r"\D", "", compacted.mobile + " " + resume_text):
+        return False
+    return all(word in text for word in name)
+
+
+def parse_resumes_with_llm(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Parse many resumes with as few LLM calls as possible.
+
+    Compacted texts (see compaction.py) are packed into batch prompts up
+    to GROQ_BATCH_TOKEN_BUDGET and the returned JSON array is mapped back
+    by "index". Any resume whose result is missing or fails validation is
+    re-parsed on its own with parse_resume_with_llm (which still falls back to the local parser).
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+    compacted: List[Optional[Compacted]] = [None] * len(texts)
+    batches: List[List[int]] = []
+    if get_client() is not None:
+        compacted = [compact_for_prompt(text) if text.strip() else None for text in texts]
+        batches = pack_batches([c.text if c else "" for c in compacted])
+
+    for batch in batches:
+        batch = [i for i in batch if compacted[i] is not None]
+        if len(batch) < 2:
+            continue
+
+        resumes = "\n\n".join(
+            RESUME_BATCH_ITEM_TEMPLATE.format(index=n, resume_text=compacted[i].text)
+            for n, i in enumerate(batch, start=1)
+        )
+        prompt = RESUME_BATCH_PROMPT_TEMPLATE.format(resumes=resumes)
 
         try:
-            parsed["ats_score"] = int(parsed.get("ats_score") or 0)
-        except:
-            parsed["ats_score"] = 0
+            with metrics.stage("llm_batch"):
+                raw = call_model_with_fallback(prompt, GROQ_MODELS, validate=loads_json_array)
+                items = loads_json_array(raw)
+        except Exception as e:
+            logger.error("Batch LLM call failed for %s resumes: %s", len(batch), e)
+            LLM_BATCH_FAILURES.inc(reason=fallback_reason(e))
+            continue
 
-        return parsed
+        positional = len(items) == len(batch)
+        for pos, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            try:
+                n = int(item.pop("index"))
+            except (KeyError, TypeError, ValueError):
+                if not positional:
+                    continue
+                n = pos + 1
+            if not 1 <= n <= len(batch):
+                continue
 
-    except Exception as e:
-        logger.error("LLM failed. Using local parser. Error: %s", e)
-        return quick_local_parse(resume_text)
+            i = batch[n - 1]
+            if results[i] is None and _belongs_to(item, texts[i], compacted[i]):
+                results[i] = with_contacts(normalize_parsed(item), compacted[i])
+                PARSES.inc(source="llm_batch")
+
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        logger.info("Re-parsing %s of %s resumes individually", len(missing), len(texts))
+    for i in missing:
+        results[i] = parse_resume_with_llm(texts[i])
+
+    return results
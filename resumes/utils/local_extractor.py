@@ -0,0 +1,280 @@
+# resumes/utils/local_extractor.py
+"""
+Single-pass local field extractor, used whenever the LLM is unavailable.
+
+Email and phone are found with one regex scan each; a single pass over the
+lines then tokenizes each line once, classifies section headers, picks the
+name and collects year ranges for the timeline. Skills
+are matched against a precompiled token trie: whole tokens only, longest
+match wins, so "java" never fires inside "javascript" and multi-word skills
+like "machine learning" are found in the same scan.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Ambiguous words ("go", "rest", "spring", "c") are left out on purpose;
+# they are still picked up when listed in a Skills section.
+SKILLS = (
+    # languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "golang",
+    "rust", "ruby", "php", "perl", "scala", "kotlin", "swift", "objective-c",
+    "matlab", "julia", "dart", "elixir", "haskell", "lua", "bash", "shell scripting",
+    "powershell", "sql", "pl/sql", "t-sql", "html", "css", "sass", "vba", "cobol",
+    # web / frameworks
+    "django", "flask", "fastapi", "spring boot", "hibernate", "rails",
+    "ruby on rails", "laravel", "express.js", "node.js", "nodejs", "react", "react native",
+    "angular", "vue", "vue.js", "next.js", "svelte", "jquery", "bootstrap", "tailwind",
+    "asp.net", ".net", "graphql", "rest api", "grpc", "redux", "webpack",
+    # data / ml
+    "machine learning", "deep learning", "data analysis", "data science",
+    "data engineering", "data visualization", "nlp", "natural language processing",
+    "computer vision", "pandas", "numpy", "scipy", "scikit-learn", "tensorflow",
+    "pytorch", "keras", "spark", "pyspark", "hadoop", "airflow", "kafka", "dbt",
+    "tableau", "power bi", "excel", "statistics", "llm", "opencv", "spacy",
+    # databases
+    "mysql", "postgresql", "postgres", "sqlite", "oracle", "sql server", "mongodb",
+    "redis", "cassandra", "elasticsearch", "dynamodb", "snowflake", "bigquery",
+    # cloud / devops
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "terraform",
+    "ansible", "jenkins", "github actions", "gitlab ci", "ci/cd", "linux", "unix",
+    "nginx", "git", "prometheus", "grafana", "microservices", "serverless",
+    # testing / practices
+    "unit testing", "pytest", "junit", "selenium", "cypress", "tdd", "agile",
+    "scrum", "kanban", "jira", "devops", "oop", "design patterns", "system design",
+    # mobile / other
+    "android", "ios", "flutter", "xamarin", "unity3d", "figma", "photoshop",
+    "autocad", "sap", "salesforce", "seo", "blockchain", "networking", "security",
+    # business / soft skills
+    "project management", "product management", "communication", "leadership",
+    "teamwork", "problem solving", "stakeholder management", "customer service",
+    "sales", "marketing", "digital marketing", "accounting", "financial analysis",
+    "business analysis", "negotiation", "public speaking", "time management",
+)
+
+SECTION_HEADERS = {
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools", "tools and technologies",
+    ),
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "internships",
+        "internship", "relevant experience",
+    ),
+    "education": (
+        "education", "academic background", "academics", "academic qualifications",
+        "qualifications", "education and training", "educational qualifications",
+    ),
+    "summary": (
+        "summary", "professional summary", "profile", "professional profile",
+        "objective", "career objective", "about me", "about",
+    ),
+    "projects": ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses", "training"),
+    "other": (
+        "achievements", "awards", "publications", "interests", "hobbies",
+        "references", "volunteer", "volunteering", "activities", "declaration",
+    ),
+}
+
+# Words that mark a line as education-related when no Education header exists
+EDUCATION_HINTS = frozenset((
+    "university", "college", "institute", "school", "bachelor", "bachelors", "master",
+    "masters", "degree", "diploma", "phd", "b.tech", "m.tech", "b.e", "b.sc", "m.sc",
+    "mba", "bca", "mca", "b.com", "gpa", "cgpa",
+))
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"\+?\(?\d[\d\-\s().]{6,}\d")
+SHORT_NUMBER_PREFIX_RE = re.compile(r"^\d{1,2}\s+")
+YEAR_RANGE_RE = re.compile(
+    r"\b((?:19|20)\d{2})\b[^\d\n]{0,5}?\b((?:19|20)\d{2}|present|current|now|till date)\b",
+    re.IGNORECASE,
+)
+# Tokens may contain + # . / - inside ("c++", "node.js", "ci/cd") but never
+# end in . / - so sentence punctuation is not part of the token.
+TOKEN_RE = re.compile(r"\.?[a-z0-9](?:[a-z0-9+#./\-]*[a-z0-9+#])?")
+HEADER_CLEAN_RE = re.compile(r"[^a-z& ]+")
+NAME_RE = re.compile(r"^[A-Za-z][A-Za-z.'\-]*(?: [A-Za-z][A-Za-z.'\-]*){1,3}$")
+
+# Title lines that look like a name but never are
+NOT_NAMES = frozenset(("curriculum vitae", "resume", "cv", "bio data", "biodata"))
+
+_END = "\0"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase tokens; trailing sentence punctuation is dropped."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def build_trie(phrases) -> Dict[str, Any]:
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for token in tokenize(phrase):
+            node = node.setdefault(token, {})
+        node[_END] = phrase
+    return trie
+
+
+SKILL_TRIE = build_trie(SKILLS)
+
+_HEADER_LOOKUP = {
+    phrase: section for section, phrases in SECTION_HEADERS.items() for phrase in phrases
+}
+_MAX_HEADER_LEN = 40
+
+
+def match_phrases(tokens: List[str], trie: Dict[str, Any] = SKILL_TRIE) -> List[str]:
+    """Longest-match scan of a token list against a phrase trie."""
+    found = []
+    n = len(tokens)
+    resume_at = 0
+    # Only tokens that can start a phrase are walked in Python
+    for i in [i for i, token in enumerate(tokens) if token in trie]:
+        if i < resume_at:
+            continue
+        node = trie
+        j = i
+        match: Optional[Tuple[str, int]] = None
+        while j < n and tokens[j] in node:
+            node = node[tokens[j]]
+            j += 1
+            if _END in node:
+                match = (node[_END], j)
+        if match:
+            found.append(match[0])
+            resume_at = match[1]
+    return found
+
+
+def detect_header(line: str) -> Tuple[Optional[str], str]:
+    """
+    (section, rest) if the line is a section header such as "EDUCATION" or
+    "Skills: Python, SQL"; (None, line) otherwise.
+    """
+    if len(line) > _MAX_HEADER_LEN and ":" not in line[:_MAX_HEADER_LEN + 1]:
+        return None, line
+    head, sep, rest = line.partition(":")
+    if len(head) > _MAX_HEADER_LEN:
+        return None, line
+    key = " ".join(HEADER_CLEAN_RE.sub(" ", head.lower()).split()).replace("&", "and")
+    section = _HEADER_LOOKUP.get(key)
+    if section is None:
+        return None, line
+    return section, rest.strip() if sep else ""
+
+
+def _clean_phone(match: str) -> Optional[str]:
+    """
+    >>> _clean_phone("020 1998 2004")
+    '020 1998 2004'
+    >>> _clean_phone("20 2010 - 2012") is None
+    True
+    """
+    digits = re.sub(r"\D", "", match)
+    if not 7 <= len(digits) <= 15:
+        return None
+    # "2018 - 2024", possibly run into a short number before it ("Company 20 2018 - 2024")
+    if YEAR_RANGE_RE.fullmatch(SHORT_NUMBER_PREFIX_RE.sub("", match.strip())):
+        return None
+    return re.sub(r"\s+", " ", match.strip())
+
+
+def extract_contacts(text: str) -> Tuple[str, str]:
+    """(first email, first phone number) found in the text, "" where none."""
+    m = EMAIL_RE.search(text)
+    email = m.group(0) if m else ""
+    for m in PHONE_RE.finditer(text):
+        phone = _clean_phone(m.group(0))
+        if phone:
+            return email, phone
+    return email, ""
+
+
+def _split_skill_items(line: str) -> List[str]:
+    # "Languages: Python, Java" → the items after the label
+    if ":" in line:
+        line = line.split(":", 1)[1]
+    items = []
+    for item in re.split(r"[,;|•·]|\s-\s", line):
+        item = item.strip(" -*\t.")
+        if item and len(item.split()) <= 4 and len(item) <= 40:
+            items.append(item)
+    return items
+
+
+def extract_fields(text: str, max_skills: int = 30) -> Dict[str, Any]:
+    """All locally extractable fields from resume text, in one pass."""
+    result: Dict[str, Any] = {
+        "name": "",
+        "email": "",
+        "mobile": "",
+        "skills": [],
+        "experience": "",
+        "education": "",
+        "summary": "",
+        "experience_timeline": [],
+    }
+    if not text:
+        return result
+
+    result["email"], result["mobile"] = extract_contacts(text)
+
+    sections: Dict[str, List[str]] = {}
+    education_hint_lines: List[str] = []
+    section_skills: List[str] = []
+    current: Optional[str] = None
+    content_lines_seen = 0
+    # Tokens never span a line break, so the lines' tokens add up to the text's
+    text_tokens: List[str] = []
+
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        line_tokens = tokenize(line)
+        text_tokens.extend(line_tokens)
+
+        section, rest = detect_header(line)
+        if section is not None:
+            current = section
+            if not rest:
+                continue
+            line = rest
+
+        if not result["name"] and current is None and content_lines_seen < 5:
+            if NAME_RE.match(line) and line.lower() not in NOT_NAMES:
+                result["name"] = line
+        content_lines_seen += 1
+
+        if current != "education":
+            for m in YEAR_RANGE_RE.finditer(line):
+                result["experience_timeline"].append({
+                    "company": "",
+                    "designation": "",
+                    "start": m.group(1),
+                    "end": m.group(2),
+                })
+
+        if current is not None:
+            sections.setdefault(current, []).append(line)
+            if current == "skills":
+                section_skills.extend(_split_skill_items(line))
+        elif EDUCATION_HINTS.intersection(line_tokens):
+            education_hint_lines.append(line)
+
+    # The dictionary is matched once over the whole token stream
+    skills, seen = [], set()
+    for skill in section_skills + match_phrases(text_tokens):
+        key = skill.lower()
+        if key not in seen:
+            seen.add(key)
+            skills.append(skill)
+    result["skills"] = skills[:max_skills]
+
+    result["experience"] = "\n".join(sections.get("experience", []))
+    result["education"] = "\n".join(sections.get("education", []) or education_hint_lines)
+    result["summary"] = "\n".join(sections.get("summary", []))
+    return result
@@ -0,0 +1,222 @@
+# resumes/utils/metrics.py
+"""
+In-process metrics for the parse pipeline.
+
+- counters, gauges and latency histograms kept in a process-wide registry
+  and rendered in the Prometheus text format (see views.metrics)
+- stage(name): times one pipeline stage into resume_stage_seconds
+- trace(**fields): collects the stage timings of one job or request and,
+  with RESUME_TIMING_LOG=1, logs them as a single JSON line on the
+  "resumes.timing" logger
+
+Values are per process: each web process and each `parse_worker` exposes
+its own.
+"""
+import json
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+timing_logger = logging.getLogger("resumes.timing")
+
+TIMING_LOG = os.environ.get("RESUME_TIMING_LOG", "0") == "1"
+
+# Seconds; spans a cache hit (ms) up to a slow LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+_registry: Dict[str, "Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[l]) for l in self.labels)
+
+    def _format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{l}="{_escape(v)}"' for l, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[i] += 1
+            row[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = []
+        for key, row in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), row):
+                cumulative += n
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {int(cumulative)}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(row[-1])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {int(cumulative)}")
+        return lines
+
+
+def _register(cls, name: str, help: str, labels: Sequence[str], **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, labels, **kwargs)
+        return metric
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    return _register(Counter, name, help, labels)
+
+
+def gauge(name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge, name, help, labels)
+
+
+def histogram(name: str, help: str, labels: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram, name, help, labels, buckets=buckets)
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    return "\n".join(m.render() for m in metrics) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+# -----------------------------
+# STAGE TIMING + PER-JOB TRACES
+# -----------------------------
+
+STAGE_SECONDS = histogram(
+    "resume_stage_seconds", "Time spent in each parse pipeline stage.", ("stage",)
+)
+
+_trace: ContextVar[Optional[dict]] = ContextVar("resume_trace", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage; nested stages are each recorded in full."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        current = _trace.get()
+        if current is not None:
+            stages = current["stages"]
+            stages[name] = round(stages.get(name, 0) + elapsed * 1000, 2)
+
+
+def note(**fields) -> None:
+    """Attach fields (model used, fallback reason, ...) to the current trace."""
+    current = _trace.get()
+    if current is not None:
+        current.update(fields)
+
+
+@contextmanager
+def trace(**fields) -> Iterator[dict]:
+    """
+    Collect stage timings (in ms) for the enclosed work. Traces follow the
+    current thread/task; work handed to pool threads is not included.
+    """
+    current = dict(fields, stages={})
+    token = _trace.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    finally:
+        _trace.reset(token)
+        current["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if TIMING_LOG:
+            timing_logger.info(json.dumps(current, default=str, sort_keys=True))
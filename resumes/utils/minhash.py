@@ -0,0 +1,88 @@
+# resumes/utils/minhash.py
+"""
+MinHash signatures and LSH band keys for near-duplicate resume text.
+
+A text is reduced to its set of word shingles (runs of SHINGLE_WORDS
+tokens). Its signature holds, for each of NUM_PERM hash functions, the
+smallest hash over that set. The share of positions where two signatures
+agree estimates the Jaccard similarity of the two shingle sets, so a
+lightly edited resume scores close to 1 and an unrelated one close to 0.
+
+For lookup, the signature is cut into BANDS bands of ROWS values and each
+band is hashed to one key. Two texts share at least one key with
+probability 1 - (1 - s^ROWS)^BANDS for similarity s: about 1% at
+s = 0.4, 95% at s = 0.8 and over 99.9% from s = 0.9. Only texts sharing a
+key are compared, so a lookup never scans the whole collection.
+"""
+import hashlib
+import zlib
+from typing import List, Optional
+
+import numpy as np
+
+from .local_extractor import tokenize
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+
+# Mersenne prime 2^31 - 1: (a * x + b) stays below 2^64 for 32-bit x
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, int(_PRIME), NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), NUM_PERM, dtype=np.uint64)
+
+SIGNATURE_BYTES = NUM_PERM * 4
+
+
+def shingles(text: str) -> np.ndarray:
+    """32-bit hashes of the distinct word shingles of a text."""
+    tokens = tokenize(text or "")
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    width = min(SHINGLE_WORDS, len(tokens))
+    hashes = {
+        zlib.crc32(" ".join(tokens[i:i + width]).encode("utf-8"))
+        for i in range(len(tokens) - width + 1)
+    }
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """uint32 MinHash signature of a text; None when it has no words."""
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    # One row per hash function; chunked so long texts stay small in memory
+    result = np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    for start in range(0, len(hashes), 4096):
+        block = hashes[start:start + 4096]
+        values = (_A[:, None] * block[None, :] + _B[:, None]) % _PRIME
+        np.minimum(result, values.min(axis=1), out=result)
+    return result.astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One signed 64-bit key per band; equal keys mean an identical band."""
+    keys = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(rows, digest_size=8, person=band.to_bytes(2, "big")).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def pack(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def unpack(blob: bytes) -> Optional[np.ndarray]:
+    if not blob or len(blob) != SIGNATURE_BYTES:
+        return None
+    return np.frombuffer(bytes(blob), dtype="<u4").astype(np.uint32)
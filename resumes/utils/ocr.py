@@ -0,0 +1,160 @@
+# resumes/utils/ocr.py
+"""
+OCR for image resumes and scanned PDFs.
+
+Every page is normalized before it reaches tesseract: EXIF orientation is
+applied, the image is converted to grayscale and resampled to about
+OCR_TARGET_DPI, never exceeding OCR_MAX_SIDE pixels. Multi-frame TIFF/GIF
+files are OCR'd page by page. Tesseract runs as one subprocess per page;
+at most OCR_WORKERS run at once and each is killed after OCR_TIMEOUT
+seconds.
+"""
+import io
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Optional Tesseract path
+TESSERACT_CMD = os.environ.get("TESSERACT_CMD")
+
+OCR_TARGET_DPI = int(os.environ.get("RESUME_OCR_DPI", 300))
+OCR_MAX_SIDE = int(os.environ.get("RESUME_OCR_MAX_SIDE", 3500))
+OCR_MAX_PAGES = int(os.environ.get("RESUME_OCR_MAX_PAGES", 10))
+OCR_WORKERS = int(os.environ.get("RESUME_OCR_WORKERS", min(4, os.cpu_count() or 1)))
+OCR_TIMEOUT = int(os.environ.get("RESUME_OCR_TIMEOUT", 30))
+# Larger images are refused before decoding (a page scan at 600 dpi is ~35M)
+OCR_MAX_PIXELS = int(os.environ.get("RESUME_OCR_MAX_PIXELS", 60_000_000))
+
+# A PDF yielding less text than this is treated as scanned
+OCR_PDF_MIN_CHARS = int(os.environ.get("RESUME_OCR_PDF_MIN_CHARS", 50))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pytesseract():
+    import pytesseract
+
+    if TESSERACT_CMD:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Threads are enough here: each task just waits on a tesseract process.
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, OCR_WORKERS), thread_name_prefix="ocr")
+        return _executor
+
+
+def preprocess(img):
+    """Upright, grayscale, ~OCR_TARGET_DPI and at most OCR_MAX_SIDE px."""
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(img)
+    dpi = img.info.get("dpi")
+    if img.mode != "L":
+        img = img.convert("L")
+
+    scale = 1.0
+    try:
+        if dpi and float(dpi[0]) > 0:
+            scale = min(OCR_TARGET_DPI / float(dpi[0]), 2.0)
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    longest = max(img.size)
+    if longest * scale > OCR_MAX_SIDE:
+        scale = OCR_MAX_SIDE / float(longest)
+
+    if abs(scale - 1.0) > 0.05:
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.LANCZOS)
+    return img
+
+
+def iter_frames(img, max_pages: Optional[int] = OCR_MAX_PAGES) -> Iterator:
+    """Each page of a (possibly multi-frame) image."""
+    from PIL import ImageSequence
+
+    for i, frame in enumerate(ImageSequence.Iterator(img)):
+        if max_pages is not None and i >= max_pages:
+            break
+        page = frame.copy()
+        page.info.setdefault("dpi", img.info.get("dpi"))
+        yield page
+
+
+def _ocr_page(img) -> str:
+    pytesseract = _pytesseract()
+    try:
+        return pytesseract.image_to_string(preprocess(img), timeout=OCR_TIMEOUT)
+    except RuntimeError as e:
+        # pytesseract raises RuntimeError when the timeout kills tesseract
+        logger.warning("OCR page skipped: %s", e)
+        return ""
+
+
+def ocr_images(images: Iterable) -> List[str]:
+    """
+    OCR pages concurrently on the bounded pool, returning texts in order.
+    Only a few pages are decoded ahead of the workers to bound memory.
+    """
+    executor = _get_executor()
+    window = max(1, OCR_WORKERS) * 2
+    futures, texts = [], []
+
+    for img in images:
+        futures.append(executor.submit(_ocr_page, img))
+        if len(futures) >= window:
+            texts.append(futures.pop(0).result())
+
+    texts.extend(f.result() for f in futures)
+    return texts
+
+
+def ocr_image(source) -> str:
+    """OCR an image file given as a path or raw bytes."""
+    from PIL import Image
+
+    # Only the header is read here; pixels are decoded page by page later
+    with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as img:
+        if img.width * img.height > OCR_MAX_PIXELS:
+            raise ValueError(f"Image too large to OCR: {img.width}x{img.height} px")
+        with metrics.stage("ocr"):
+            return "\n".join(ocr_images(iter_frames(img)))
+
+
+def ocr_image_bytes(b: bytes) -> str:
+    return ocr_image(b)
+
+
+def ocr_pdf(source, max_pages: Optional[int] = OCR_MAX_PAGES) -> str:
+    """Render the pages of a scanned PDF and OCR them. Needs PyMuPDF."""
+    from PIL import Image
+    from .pdf_text import _fitz, _open_fitz
+
+    fitz = _fitz()
+    doc = _open_fitz(source)
+    if doc is None:
+        return ""
+
+    def pages():
+        with doc:
+            stop = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+            for i in range(stop):
+                pix = doc.load_page(i).get_pixmap(dpi=OCR_TARGET_DPI, colorspace=fitz.csGRAY)
+                img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+                img.info["dpi"] = (OCR_TARGET_DPI, OCR_TARGET_DPI)
+                yield img
+
+    with metrics.stage("ocr"):
+        return "\n".join(ocr_images(pages()))
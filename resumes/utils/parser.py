@@ -1,11 +1,74 @@
 
+import os
 import re
-from docx import Document
-import PyPDF2
-import pdfplumber
+import logging
+import threading
+from typing import Iterable, List
+
+from .extractors import extract_text
+from .local_extractor import extract_fields, match_phrases, tokenize
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL = os.environ.get("RESUME_SPACY_MODEL", "en_core_web_sm")
+SPACY_BATCH_SIZE = int(os.environ.get("RESUME_SPACY_BATCH_SIZE", 64))
+
+# Names are looked for in the first part of the resume only
+NAME_WINDOW_CHARS = 1000
+
+# Pipeline components name extraction never needs (only "ner" is kept)
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "morphologizer", "senter"]
+
+_nlp = None
+_nlp_failed = False
+_nlp_lock = threading.Lock()
+
+
+def get_nlp():
+    """
+    The process-wide spaCy pipeline with only NER enabled, loaded on first
+    use. Returns None when spaCy or the model is not installed.
+    """
+    global _nlp, _nlp_failed
+    if _nlp is not None or _nlp_failed:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None and not _nlp_failed:
+            try:
+                import spacy
+
+                nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+            except (ImportError, OSError) as e:
+                logger.warning("spaCy model %s unavailable, using the local name extractor: %s", SPACY_MODEL, e)
+                _nlp_failed = True
+                return None
+
+            # In the small/medium models only the tagger and parser listen to
+            # the shared tok2vec; with those gone it is dead weight per doc.
+            if "tok2vec" in nlp.pipe_names:
+                listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", ["ner"])
+                if "ner" not in listeners:
+                    nlp.disable_pipe("tok2vec")
+            _nlp = nlp
+    return _nlp
+
+
+def extract_names(texts: Iterable[str], batch_size: int = SPACY_BATCH_SIZE) -> List[str]:
+    """
+    First PERSON entity of each text, in one streaming nlp.pipe pass.
+    Falls back to the local extractor's name line when spaCy is missing.
+    """
+    texts = list(texts)
+    nlp = get_nlp()
+    if nlp is None:
+        return [extract_fields(text)["name"] for text in texts]
+
+    names = []
+    windows = (text[:NAME_WINDOW_CHARS] for text in texts)
+    for doc in nlp.pipe(windows, batch_size=batch_size):
+        names.append(next((ent.text for ent in doc.ents if ent.label_ == "PERSON"), ""))
+    return names
 
-# Load spaCy model
-nlp = spacy.load('en_core_web_sm')
 
 class ResumeParser:
     
@@ -14,47 +77,14 @@ class ResumeParser:
         self.text = ""
         
     def extract_text(self):
-        """Extract text from different file formats"""
-        if self.file_path.endswith('.pdf'):
-            self.text = self._extract_from_pdf()
-        elif self.file_path.endswith('.docx'):
-            self.text = self._extract_from_docx()
-        elif self.file_path.endswith('.txt'):
-            self.text = self._extract_from_txt()
+        """Extract text from PDF, DOCX, image or plain-text files"""
+        # A path lets each backend read the file itself instead of a copy in memory
+        self.text = extract_text(os.fspath(self.file_path))
         return self.text
     
-    def _extract_from_pdf(self):
-        """Extract text from PDF"""
-        text = ""
-        try:
-            with pdfplumber.open(self.file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() + "\n"
-        except:
-            # Fallback to PyPDF2
-            with open(self.file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-        return text
-    
-    def _extract_from_docx(self):
-        """Extract text from DOCX"""
-        doc = Document(self.file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
-    
-    def _extract_from_txt(self):
-        """Extract text from TXT"""
-        with open(self.file_path, 'r', encoding='utf-8') as file:
-            return file.read()
-    
     def extract_name(self):
-        """Extract name using NLP"""
-        doc = nlp(self.text[:1000])  # Check first 1000 chars
-        for ent in doc.ents:
-            if ent.label_ == 'PERSON':
-                return ent.text
-        return ""
+        """Extract name using NLP (see extract_names for many resumes)"""
+        return extract_names([self.text])[0]
     
     def extract_email(self):
         """Extract email using regex"""
@@ -69,35 +99,15 @@ class ResumeParser:
         return match.group(0) if match else ""
     
     def extract_skills(self):
-        """Extract skills - basic keyword matching"""
-        skills_keywords = [
-            'python', 'java', 'javascript', 'c++', 'sql', 'react', 
-            'django', 'flask', 'nodejs', 'aws', 'docker', 'kubernetes',
-            'machine learning', 'data analysis', 'project management'
-        ]
-        found_skills = []
-        text_lower = self.text.lower()
-        for skill in skills_keywords:
-            if skill in text_lower:
-                found_skills.append(skill)
+        """Extract skills - dictionary match on whole tokens"""
+        tokens = tokenize(self.text)
+        found_skills = list(dict.fromkeys(match_phrases(tokens)))
         return ", ".join(found_skills)
     
     def extract_education(self):
         """Extract education section"""
-        education_keywords = ['education', 'academic', 'university', 'college', 'degree']
-        lines = self.text.split('\n')
-        education_lines = []
-        capture = False
-        
-        for line in lines:
-            if any(keyword in line.lower() for keyword in education_keywords):
-                capture = True
-            if capture:
-                education_lines.append(line)
-                if len(education_lines) > 10:  # Limit to 10 lines
-                    break
-        
-        return "\n".join(education_lines[:10])
+        education = extract_fields(self.text)["education"]
+        return "\n".join(education.split("\n")[:10])
     
     def generate_summary(self):
         """Generate a simple summary"""
@@ -0,0 +1,206 @@
+# resumes/utils/pdf_text.py
+"""
+Page-streaming PDF text extraction.
+
+PyMuPDF is the fast path; PyPDF2 is used when PyMuPDF is missing or cannot
+open the file. Text is produced page by page and extraction stops at the
+page/char caps, since the LLM prompt only needs the start of a resume.
+Long documents are split into page ranges extracted in a process pool.
+"""
+import io
+import os
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Union
+
+from .ocr import OCR_MAX_PAGES, OCR_PDF_MIN_CHARS, ocr_pdf
+
+logger = logging.getLogger(__name__)
+
+PdfSource = Union[bytes, str]   # raw bytes or a file path
+
+PDF_MAX_PAGES = int(os.environ.get("RESUME_PDF_MAX_PAGES", 30))
+TEXT_MAX_CHARS = int(os.environ.get("RESUME_TEXT_MAX_CHARS", 30000))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("RESUME_PDF_PARALLEL_MIN_PAGES", 16))
+PDF_WORKERS = int(os.environ.get("RESUME_PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _fitz():
+    try:
+        import pymupdf as fitz
+    except ImportError:
+        try:
+            import fitz  # PyMuPDF < 1.24
+        except ImportError:
+            return None
+    return fitz
+
+
+def _open_fitz(source: PdfSource):
+    fitz = _fitz()
+    if fitz is None:
+        return None
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return fitz.open(stream=bytes(source), filetype="pdf")
+        return fitz.open(source)
+    except Exception as e:
+        logger.warning("PyMuPDF could not open PDF, falling back to PyPDF2: %s", e)
+        return None
+
+
+def _iter_pypdf2_pages(source: PdfSource, max_pages: Optional[int]) -> Iterator[str]:
+    from PyPDF2 import PdfReader
+
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    reader = PdfReader(stream)
+    for i, page in enumerate(reader.pages):
+        if max_pages is not None and i >= max_pages:
+            break
+        try:
+            yield page.extract_text() or ""
+        except Exception:
+            continue
+
+
+def iter_pdf_pages(source: PdfSource, max_pages: Optional[int] = None,
+                   start: int = 0, engine: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text of each page, starting at page `start`. `engine` forces
+    "pymupdf" or "pypdf2"; by default PyMuPDF is used when it can open the file.
+    """
+    doc = None if engine == "pypdf2" else _open_fitz(source)
+    if doc is None and engine == "pymupdf":
+        raise ValueError("PyMuPDF is not installed or cannot open this PDF")
+    if doc is None:
+        pages = _iter_pypdf2_pages(source, max_pages)
+        for _ in range(start):
+            next(pages, None)
+        yield from pages
+        return
+
+    with doc:
+        stop = doc.page_count if max_pages is None else min(doc.page_count, max_pages)
+        for i in range(start, stop):
+            try:
+                yield doc.load_page(i).get_text()
+            except Exception:
+                continue
+
+
+def page_count(source: PdfSource) -> int:
+    doc = _open_fitz(source)
+    if doc is None:
+        from PyPDF2 import PdfReader
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        return len(PdfReader(stream).pages)
+    with doc:
+        return doc.page_count
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Process-pool task: text of pages [start, stop)."""
+    return list(iter_pdf_pages(path, max_pages=stop, start=start))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+@contextmanager
+def _as_path(source: PdfSource) -> Iterator[str]:
+    """A file path for the source; bytes are written to a temporary file for the duration."""
+    if isinstance(source, str):
+        yield source
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(source)
+    try:
+        yield tmp.name
+    finally:
+        os.unlink(tmp.name)
+
+
+def _iter_parallel(source: PdfSource, pages: int, workers: int) -> Iterator[str]:
+    """
+    Yield pages in order while up to `workers` page ranges run ahead. Tasks
+    get a file path rather than the PDF bytes, so the document is not
+    pickled once per range.
+    """
+    step = max(1, -(-pages // (workers * 2)))
+    ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+    pool = _get_pool(workers)
+
+    futures = []
+    with _as_path(source) as path:
+        try:
+            for start, stop in ranges[:workers]:
+                futures.append(pool.submit(extract_page_range, path, start, stop))
+            queued = ranges[workers:]
+            while futures:
+                texts = futures.pop(0).result()
+                if queued:
+                    start, stop = queued.pop(0)
+                    futures.append(pool.submit(extract_page_range, path, start, stop))
+                yield from texts
+        finally:
+            for f in futures:
+                f.cancel()
+
+
+def extract_pdf_text(source: PdfSource, max_pages: Optional[int] = PDF_MAX_PAGES,
+                     max_chars: Optional[int] = TEXT_MAX_CHARS,
+                     workers: Optional[int] = None, ocr_fallback: bool = True,
+                     engine: Optional[str] = None) -> str:
+    """
+    Text of a PDF, reading no more pages than needed to reach `max_chars`
+    (and never more than `max_pages`). Scanned PDFs without a usable text
+    layer are OCR'd unless `ocr_fallback` is False. Returns raw, uncleaned
+    text. See iter_pdf_pages for `engine`.
+    """
+    if workers is None:
+        workers = PDF_WORKERS
+
+    page_texts = None
+    if workers > 1 and engine != "pypdf2" and _fitz() is not None:
+        pages = page_count(source)
+        if max_pages is not None:
+            pages = min(pages, max_pages)
+        if pages >= PDF_PARALLEL_MIN_PAGES:
+            page_texts = _iter_parallel(source, pages, workers)
+    if page_texts is None:
+        page_texts = iter_pdf_pages(source, max_pages=max_pages, engine=engine)
+
+    parts = []
+    total = 0
+    try:
+        for text in page_texts:
+            parts.append(text)
+            total += len(text) + 1
+            if max_chars is not None and total >= max_chars:
+                break
+    finally:
+        page_texts.close()
+
+    text = "\n".join(parts)
+
+    if ocr_fallback and len(text.strip()) < OCR_PDF_MIN_CHARS:
+        try:
+            ocr_text = ocr_pdf(source, max_pages=min(max_pages or OCR_MAX_PAGES, OCR_MAX_PAGES))
+        except Exception as e:
+            logger.warning("OCR fallback for scanned PDF failed: %s", e)
+            ocr_text = ""
+        if len(ocr_text.strip()) > len(text.strip()):
+            text = ocr_text
+
+    return text[:max_chars] if max_chars is not None else text
@@ -1,13 +1,23 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db.models import Q
-
-from .models import Resume
-from .utils.llm_parser import (
-    extract_text_from_uploaded_file,
-    parse_resume_with_llm
-)
+from django.http import Http404, HttpResponse, JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from . import jobs
+from .matching import match_resumes
+from .models import Resume, ParseJob
+from .pagination import keyset_page
+from .search import search_resumes
+from .semantic import semantic_search
+from .uploads import ResumeUploadHandler
+from .skills import find_skill_ids
+from .utils import metrics as pipeline_metrics
 from .utils.ats import calculate_ats_score
+from .utils.llm_client import update_breaker_metrics
 
 
 # =========================
@@ -15,65 +25,177 @@ from .utils.ats import calculate_ats_score
 # =========================
 def resume_list(request):
     query = request.GET.get("q", "").strip()
-
-    resumes = Resume.objects.all()
-
-    if query:
-        resumes = resumes.filter(
-            Q(name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(skills__icontains=query)
+    semantic = request.GET.get("mode") == "semantic"
+    skills = [
+        s.strip() for value in request.GET.getlist("skill") for s in value.split(",") if s.strip()
+    ]
+    page_size = getattr(settings, "RESUME_LIST_PAGE_SIZE", 25)
+    lean = Resume.objects.only(*Resume.LIST_FIELDS)
+
+    # Exact skill filter: joins on the (skill, resume) index, no LIKE scans
+    skill_ids = find_skill_ids(skills) if skills else []
+    for skill_id in skill_ids:
+        lean = lean.filter(skill_links__skill_id=skill_id)
+    base_params = [("q", query)] if query else []
+    base_params += [("skill", s) for s in skills]
+    if semantic:
+        base_params.append(("mode", "semantic"))
+
+    next_url = prev_url = None
+
+    if None in skill_ids:
+        # A skill no resume has
+        resumes = []
+    elif query:
+        # Ranked full-text or semantic search (see resumes/search.py and
+        # resumes/semantic.py), paged by rank
+        page = _page_number(request)
+        if semantic:
+            ids = [m.resume_id for m in semantic_search(
+                query, limit=page_size + 1, offset=(page - 1) * page_size, skill_ids=skill_ids
+            )]
+        else:
+            ids = search_resumes(
+                query, limit=page_size + 1, offset=(page - 1) * page_size, skill_ids=skill_ids
+            )
+        found = lean.in_bulk(ids[:page_size])
+        resumes = [found[i] for i in ids[:page_size] if i in found]
+
+        if len(ids) > page_size:
+            next_url = "?" + urlencode(base_params + [("page", page + 1)])
+        if page > 1:
+            prev_url = "?" + urlencode(base_params + [("page", page - 1)])
+    else:
+        # Keyset pagination on (created_at, id)
+        page = keyset_page(
+            lean,
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+            page_size=page_size,
         )
+        resumes = page.items
 
-    resumes = resumes.order_by("-created_at")
+        if page.next_cursor:
+            next_url = "?" + urlencode(base_params + [("after", page.next_cursor)])
+        if page.prev_cursor:
+            prev_url = "?" + urlencode(base_params + [("before", page.prev_cursor)])
 
     return render(request, "resume_list.html", {
         "resumes": resumes,
-        "query": query
+        "query": query,
+        "skills": skills,
+        "semantic": semantic,
+        "next_url": next_url,
+        "prev_url": prev_url,
+    })
+
+
+def _page_number(request):
+    try:
+        return max(1, int(request.GET.get("page", 1)))
+    except ValueError:
+        return 1
+
+
+# =========================
+# MATCH AGAINST JOB DESCRIPTION
+# =========================
+def job_match(request):
+    job_description = request.POST.get("job_description", "").strip()
+    results = []
+
+    if request.method == "POST" and job_description:
+        limit = getattr(settings, "RESUME_MATCH_RESULTS", 25)
+        matches = match_resumes(job_description, limit=limit)
+        found = Resume.objects.only(*Resume.LIST_FIELDS).in_bulk([m.resume_id for m in matches])
+        results = [(found[m.resume_id], m) for m in matches if m.resume_id in found]
+
+    return render(request, "job_match.html", {
+        "job_description": job_description,
+        "results": results,
+        "searched": request.method == "POST",
     })
 
 
 # =========================
 # UPLOAD RESUME
 # =========================
-def upload_resume(request):
+@csrf_exempt
+async def upload_resume(request):
+    # Upload handlers must be replaced before anything reads request.POST,
+    # which the CSRF check would do; the inner view is CSRF-protected instead
+    handler = ResumeUploadHandler(request)
+    request.upload_handlers = [handler]
+    return await _upload_resume(request, handler)
+
+
+@csrf_protect
+async def _upload_resume(request, handler):
+    # Async: under ASGI the request holds no thread while the upload is
+    # stored and queued. The body was fully received before the view ran.
+    context = {"max_upload_mb": handler.max_bytes // (1024 * 1024)}
+
     if request.method == "POST":
         uploaded = request.FILES.get("resume_file")
 
         if not uploaded:
-            messages.error(request, "Please upload a valid resume file.")
-            return render(request, "upload.html")
-
-        # Extract text
-        resume_text = extract_text_from_uploaded_file(uploaded)
-
-        if not resume_text:
-            messages.error(request, "Unable to extract text from file.")
-            return render(request, "upload.html")
-
-        # Parse using LLM / logic
-        data = parse_resume_with_llm(resume_text)
-
-        # Create resume object
-        resume = Resume.objects.create(
-            name=data.get("name", ""),
-            email=data.get("email", ""),
-            mobile=data.get("mobile", ""),
-            skills=", ".join(data.get("skills", [])),
-            experience=data.get("experience", ""),
-            education=data.get("education", ""),
-            summary=data.get("professional_summary", ""),
-        )
+            messages.error(request, handler.error or "Please upload a valid resume file.")
+            status = 413 if handler.too_large else 400
+            return render(request, "upload.html", context, status=status)
 
-        # Calculate ATS score
-        resume.ats_score = calculate_ats_score(resume)
-        resume.save()
+        # Persist the file and parse it in the background
+        with pipeline_metrics.trace(request="upload", file=uploaded.name, size=uploaded.size):
+            with pipeline_metrics.stage("upload_enqueue"):
+                job = await jobs.aenqueue(uploaded)
 
+        return redirect("resumes:job_status", job_id=job.id)
+
+    return render(request, "upload.html", context)
+
+
+# =========================
+# PARSE JOB STATUS
+# =========================
+def job_status(request, job_id):
+    job = get_object_or_404(ParseJob, id=job_id)
+
+    if job.status == ParseJob.STATUS_DONE and job.resume_id:
         messages.success(request, "Resume uploaded successfully.")
+        return redirect("resumes:view_resume", resume_id=job.resume_id)
 
-        return redirect("resumes:view_resume", resume_id=resume.id)
+    return render(request, "job_status.html", {"job": job})
+
+
+def job_status_json(request, job_id):
+    job = get_object_or_404(ParseJob, id=job_id)
+
+    resume_url = ""
+    if job.resume_id:
+        resume_url = reverse("resumes:view_resume", args=[job.resume_id])
+
+    return JsonResponse({
+        "id": job.id,
+        "status": job.status,
+        "resume_id": job.resume_id,
+        "resume_url": resume_url,
+        "error": job.error,
+        # Fields known while a streamed parse is still running
+        "preview": job.preview,
+    })
+
+
+# =========================
+# METRICS (Prometheus text format)
+# =========================
+def metrics(request):
+    if not getattr(settings, "RESUME_METRICS_ENABLED", True):
+        raise Http404
 
-    return render(request, "upload.html")
+    jobs.update_queue_metrics()
+    update_breaker_metrics()
+    return HttpResponse(
+        pipeline_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 # =========================
@@ -84,11 +206,13 @@ def view_resume(request, resume_id):
     from .utils.ats import ats_breakdown
 
     breakdown, suggestions = ats_breakdown(resume)
+    duplicates = resume.duplicates.only("id").order_by("id")[:20]
 
     return render(request, "view_resume.html", {
         "resume": resume,
         "breakdown": breakdown,
-        "suggestions": suggestions
+        "suggestions": suggestions,
+        "duplicates": duplicates,
     })
 
 